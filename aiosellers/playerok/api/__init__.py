@@ -1,16 +1,26 @@
 """High-level API modules."""
 
 from .account import AccountAPI
+from .chat_queue import ChatSendQueue, SendQueueStats
 from .chats import ChatAPI, ChatMessagesAPI
 from .deals import DealAPI
 from .games import GameAPI
+from .inventory import InventoryAPI, InventoryRefresh
 from .items import ItemAPI
+from .market import MarketAPI
+from .search import SearchAPI
 
 __all__ = [
     "AccountAPI",
     "ChatAPI",
     "ChatMessagesAPI",
+    "ChatSendQueue",
     "DealAPI",
     "GameAPI",
+    "InventoryAPI",
+    "InventoryRefresh",
     "ItemAPI",
+    "MarketAPI",
+    "SearchAPI",
+    "SendQueueStats",
 ]
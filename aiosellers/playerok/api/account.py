@@ -1,47 +1,61 @@
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING
 
+from ..core.dataloader import DataLoader
 from ..entities.user import User
-from ..schemas import Account, AccountProfile
+from ..schemas import Account, AccountProfile, UserProfile
 
 if TYPE_CHECKING:
     from ..playerok import Playerok
 
+# Fields of `User` that partial payloads may carry.
+_USER_FIELDS = (
+    "username",
+    "avatar_url",
+    "role",
+    "is_online",
+    "is_blocked",
+    "rating",
+    "reviews_count",
+)
+
 
 class AccountAPI:
     def __init__(self, client: Playerok) -> None:
         self._client = client
+        self._loader: DataLoader[str, User] = DataLoader(
+            self._load_users,
+            cache_lookup=self._get_cached,
+            max_batch_size=client._config.loader_batch_size,
+        )
 
-    async def me(self) -> Account:
-        return await self._client._raw.account.get_me()
-
-    async def profile(self) -> AccountProfile:
-        me = await self.me()
-        return await self._client._raw.account.get_account(me.username)
+    def _get_cached(self, user_id: str) -> User | None:
+        if self._client._use_identity_map:
+            return self._client._identity_maps.users.get(user_id)
+        return None
 
-    async def get_user(
-        self,
-        user_id: str | None = None,
-        *,
-        username: str | None = None,
-        force_refresh: bool = False,
-    ) -> User:
-        if user_id is None and username is None:
-            raise ValueError("Either user_id or username must be provided")
+    def _create_user(self, profile: UserProfile | None, user_id: str | None = None) -> User:
+        """Build a user, or update the cached instance so holders of it see the profile.
 
-        if user_id and not force_refresh and self._client._use_identity_map:
-            cached = self._client._identity_maps.users.get(user_id)
-            if cached:
-                return cached
+        Only fields present in the payload and not None are copied onto a cached
+        instance, so a partial payload doesn't erase what is already known.
+        """
+        cached = self._get_cached(profile.id if profile is not None else user_id)
+        if cached is not None:
+            if profile is not None:
+                present = profile.model_fields_set
+                for name in _USER_FIELDS:
+                    if name in present:
+                        value = getattr(profile, name)
+                        if value is not None:
+                            setattr(cached, name, value)
+            return cached
 
-        profile = await self._client._raw.account.get_user(id=user_id, username=username)
         if profile is None:
-            if user_id:
-                # Create stub user with just ID
-                user = User(id=user_id)
-            else:
-                raise ValueError(f"User with username '{username}' not found")
+            # Create stub user with just ID
+            user = User(id=user_id)
         else:
             user = User(
                 id=profile.id,
@@ -60,3 +74,57 @@ class AccountAPI:
             self._client._identity_maps.users.set(user.id, user)
 
         return user
+
+    def _hydrate_user(self, profile: UserProfile) -> User:
+        """Put a user from a nested payload into the identity map.
+
+        A cached instance is kept and updated with the fields present in the payload,
+        so messages and chats of the same user share one entity.
+        """
+        return self._create_user(profile)
+
+    async def _load_users(self, user_ids: list[str]) -> dict[str, User | BaseException]:
+        # A failed lookup fails only its own key, see `DataLoader`.
+        profiles = await asyncio.gather(
+            *(self._client._raw.account.get_user(id=user_id) for user_id in user_ids),
+            return_exceptions=True,
+        )
+        return {
+            user_id: (
+                profile
+                if isinstance(profile, BaseException)
+                else self._create_user(profile, user_id)
+            )
+            for user_id, profile in zip(user_ids, profiles)
+        }
+
+    async def me(self) -> Account:
+        return await self._client._raw.account.get_me()
+
+    async def profile(self) -> AccountProfile:
+        me = await self.me()
+        return await self._client._raw.account.get_account(me.username)
+
+    async def get_user(
+        self,
+        user_id: str | None = None,
+        *,
+        username: str | None = None,
+        force_refresh: bool = False,
+    ) -> User:
+        if user_id is None and username is None:
+            raise ValueError("Either user_id or username must be provided")
+
+        if user_id and not force_refresh:
+            # Lookups issued in the same loop iteration are merged into one batch.
+            return await self._loader.load(user_id)
+
+        profile = await self._client._raw.account.get_user(id=user_id, username=username)
+        if profile is None and not user_id:
+            raise ValueError(f"User with username '{username}' not found")
+
+        return self._create_user(profile, user_id)
+
+    async def get_users(self, user_ids: list[str]) -> list[User]:
+        """Get several users at once, cached ones are not requested again."""
+        return await self._loader.load_many(user_ids)
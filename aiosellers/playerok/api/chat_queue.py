@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from ..core.types import ImageInput
+
+if TYPE_CHECKING:
+    from ..entities.chat import ChatMessage
+    from ..playerok import Playerok
+
+
+@dataclass(slots=True)
+class _OutgoingMessage:
+    text: str | None
+    photo: ImageInput | None
+    mark_as_read: bool
+    future: asyncio.Future
+
+
+@dataclass(slots=True)
+class SendQueueStats:
+    """Snapshot of the outbound queue state.
+
+    Attributes:
+        pending: Messages waiting to be sent
+        in_flight: Messages currently being sent
+        active_chats: Chats that have queued or in-flight messages
+        sent: Messages sent since the queue was created
+        failed: Messages that failed to send
+        read_marks_coalesced: `mark_as_read` requests merged into an earlier one
+        per_chat: Pending messages per chat id
+    """
+
+    pending: int
+    in_flight: int
+    active_chats: int
+    sent: int
+    failed: int
+    read_marks_coalesced: int
+    per_chat: dict[str, int] = field(default_factory=dict)
+
+
+class ChatSendQueue:
+    """Outbound message queue.
+
+    Messages to the same chat are sent strictly in the order they were queued,
+    while different chats are served in parallel, up to `concurrency` chats at once.
+    `mark_as_read` requests of messages sent in one batch are merged into a single
+    mutation.
+    """
+
+    def __init__(self, client: Playerok, *, concurrency: int = 8, max_pending: int = 0) -> None:
+        """Initialize send queue.
+
+        Args:
+            client: Playerok client used to send messages
+            concurrency: Maximum number of chats served at the same time
+            max_pending: Maximum number of queued messages, `put()` waits while the queue
+                is full. 0 means unbounded.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self._client = client
+        self._max_pending = max_pending
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._not_full = asyncio.Condition()
+
+        self._queues: dict[str, deque[_OutgoingMessage]] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+
+        self._pending = 0
+        self._in_flight = 0
+        self._sent = 0
+        self._failed = 0
+        self._read_marks_coalesced = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of messages waiting to be sent."""
+        return self._pending
+
+    def depth_for(self, chat_id: str) -> int:
+        """Number of messages waiting to be sent to the given chat."""
+        queue = self._queues.get(chat_id)
+        return len(queue) if queue else 0
+
+    def stats(self) -> SendQueueStats:
+        return SendQueueStats(
+            pending=self._pending,
+            in_flight=self._in_flight,
+            active_chats=len(self._workers),
+            sent=self._sent,
+            failed=self._failed,
+            read_marks_coalesced=self._read_marks_coalesced,
+            per_chat={chat_id: len(queue) for chat_id, queue in self._queues.items() if queue},
+        )
+
+    async def put(
+        self,
+        chat_id: str,
+        *,
+        text: str | None = None,
+        photo: ImageInput | None = None,
+        mark_as_read: bool = False,
+    ) -> asyncio.Future[ChatMessage]:
+        """Queue a message and return a future resolved with the sent message."""
+        if text is None and photo is None:
+            raise ValueError("Either text or photo must be provided")
+
+        if self._max_pending:
+            async with self._not_full:
+                await self._not_full.wait_for(lambda: self._pending < self._max_pending)
+
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queues.setdefault(chat_id, deque())
+        queue.append(_OutgoingMessage(text, photo, mark_as_read, future))
+        self._pending += 1
+
+        if chat_id not in self._workers:
+            self._workers[chat_id] = asyncio.create_task(self._drain(chat_id))
+
+        return future
+
+    async def send(
+        self,
+        chat_id: str,
+        *,
+        text: str | None = None,
+        photo: ImageInput | None = None,
+        mark_as_read: bool = False,
+    ) -> ChatMessage:
+        """Queue a message and wait until it is sent."""
+        future = await self.put(chat_id, text=text, photo=photo, mark_as_read=mark_as_read)
+        return await future
+
+    async def join(self) -> None:
+        """Wait until every queued message is sent."""
+        while self._workers:
+            await asyncio.gather(*self._workers.values(), return_exceptions=True)
+
+    async def close(self, *, cancel: bool = False) -> None:
+        """Stop the queue.
+
+        Args:
+            cancel: Drop pending messages instead of sending them.
+        """
+        if cancel:
+            for task in self._workers.values():
+                task.cancel()
+        await self.join()
+
+    async def _drain(self, chat_id: str) -> None:
+        queue = self._queues[chat_id]
+        try:
+            while queue:
+                async with self._semaphore:
+                    batch = list(queue)
+                    queue.clear()
+                    await self._send_batch(chat_id, batch)
+        finally:
+            for message in queue:
+                message.future.cancel()
+            self._pending -= len(queue)
+            del self._queues[chat_id]
+            del self._workers[chat_id]
+            await self._notify_not_full()
+
+    async def _send_batch(self, chat_id: str, batch: list[_OutgoingMessage]) -> None:
+        self._pending -= len(batch)
+        self._in_flight += len(batch)
+        await self._notify_not_full()
+
+        marks = sum(1 for message in batch if message.mark_as_read)
+        read_marked = False
+        remaining = deque(batch)
+        try:
+            while remaining:
+                message = remaining.popleft()
+                try:
+                    if message.future.done():  # cancelled by the caller
+                        continue
+                    if message.mark_as_read and not read_marked:
+                        await self._client.chats.mark_as_read(chat_id)
+                        read_marked = True
+                        self._read_marks_coalesced += marks - 1
+                    result = await self._client.chats.send_message(
+                        chat_id, text=message.text, photo=message.photo
+                    )
+                except asyncio.CancelledError:
+                    # The queue was closed mid-send, don't leave the caller waiting.
+                    message.future.cancel()
+                    raise
+                except Exception as exc:
+                    self._failed += 1
+                    if not message.future.done():
+                        message.future.set_exception(exc)
+                else:
+                    self._sent += 1
+                    if not message.future.done():
+                        message.future.set_result(result)
+                finally:
+                    self._in_flight -= 1
+        finally:
+            # Only non-empty when the worker was cancelled mid-batch.
+            for message in remaining:
+                message.future.cancel()
+            self._in_flight -= len(remaining)
+
+    async def _notify_not_full(self) -> None:
+        if self._max_pending:
+            async with self._not_full:
+                self._not_full.notify_all()
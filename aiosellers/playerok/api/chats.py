@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from collections.abc import Iterable
 from typing import TYPE_CHECKING, AsyncIterator
 
+from ..core.dataloader import DataLoader
+from ..core.read_state import ReadStateTracker
 from ..core.types import ImageInput
+from ..core.utils import _check_include
 from ..entities.chat import Chat, ChatMessage
 from ..entities.file import File
-from ..entities.user import User
 from ..schemas import ChatMessageDirection, ChatStatuses, ChatTypes
+from .chat_queue import ChatSendQueue
 
 if TYPE_CHECKING:
+    from ..entities.deal import Deal
     from ..playerok import Playerok
 
 
+CHAT_INCLUDES = frozenset({"user", "deals"})
+
+
 class ChatMessagesAPI:
     def __init__(self, client: Playerok) -> None:
         self._client = client
@@ -21,11 +31,17 @@ class ChatMessagesAPI:
         direction = ChatMessageDirection.SYSTEM
         if msg_schema.user:
             # Some fields can be empty. Use *.get_user() to fetch all fields.
-            user = User.from_schema(msg_schema.user, self._client)
+            user = self._client.account._hydrate_user(msg_schema.user)
             if self._client._me_id and msg_schema.user.id == self._client._me_id:
                 direction = ChatMessageDirection.OUT
             else:
                 direction = ChatMessageDirection.IN
+                if not msg_schema.is_read:
+                    self._client.chats._read_state.mark_unread(chat_id)
+
+        index = self._client._search_index
+        if index is not None and msg_schema.text:
+            index.add_message(msg_schema.id, chat_id, msg_schema.text)
 
         return ChatMessage(
             id=msg_schema.id,
@@ -81,11 +97,119 @@ class ChatMessagesAPI:
                 break
             current_cursor = response.page_info.end_cursor
 
+    async def sync(
+        self, chat_id: str, *, page_size: int = 10, initial_limit: int = 50
+    ) -> list[ChatMessage]:
+        """Fetch messages received since the previous sync and save them to the message store.
+
+        Paging stops at the first message already present in the store, so a chat without
+        news costs a single small request.
+
+        Args:
+            chat_id: Chat ID
+            page_size: Size of the first requested page
+            initial_limit: Maximum number of messages fetched for a chat that was never synced
+
+        Returns:
+            New messages, newest first.
+        """
+        store = self._client._message_store
+        first_sync = await store.get_last_message_id(chat_id) is None
+
+        result = []
+        count = min(50, initial_limit) if first_sync else page_size
+        current_cursor = None
+
+        while True:
+            response = await self._client._raw.chats.get_chat_messages(
+                chat_id=chat_id, count=count, after_cursor=current_cursor
+            )
+            if response is None or not response.messages:
+                break
+
+            known = await store.filter_known(chat_id, (msg.id for msg in response.messages))
+            reached_known = False
+            for msg in response.messages:
+                if msg.id in known:
+                    reached_known = True
+                    break
+                result.append(self._create_message(msg, chat_id))
+
+            if reached_known or not response.page_info.has_next_page:
+                break
+            if first_sync and len(result) >= initial_limit:
+                break
+
+            current_cursor = response.page_info.end_cursor
+            count = min(50, initial_limit - len(result)) if first_sync else 50
+
+        if first_sync:
+            result = result[:initial_limit]
+
+        await store.add_messages(chat_id, result)
+        return result
+
+    async def history(self, chat_id: str, *, limit: int | None = None) -> list[ChatMessage]:
+        """Return messages saved in the message store by `sync()`, newest first."""
+        return await self._client._message_store.get_messages(chat_id, limit=limit)
+
 
 class ChatAPI:
     def __init__(self, client: Playerok) -> None:
         self._client = client
         self.messages = ChatMessagesAPI(client)
+        self.queue = ChatSendQueue(
+            client,
+            concurrency=client._config.send_queue_concurrency,
+            max_pending=client._config.send_queue_max_pending,
+        )
+        self._read_state = ReadStateTracker(ttl=client._config.read_state_ttl)
+        self._loader: DataLoader[str, Chat] = DataLoader(
+            self._load_chats,
+            cache_lookup=self._get_cached,
+            max_batch_size=client._config.loader_batch_size,
+        )
+
+    def _get_cached(self, chat_id: str) -> Chat | None:
+        if self._client._use_identity_map:
+            return self._client._identity_maps.chats.get(chat_id)
+        return None
+
+    async def _load_chats(self, chat_ids: list[str]) -> dict[str, Chat | BaseException]:
+        # A failed lookup fails only its own key, see `DataLoader`.
+        schemas = await asyncio.gather(
+            *(self._client._raw.chats.get_chat(chat_id) for chat_id in chat_ids),
+            return_exceptions=True,
+        )
+        result = {}
+        for chat_id, schema in zip(chat_ids, schemas):
+            if schema is None:
+                continue
+            if isinstance(schema, BaseException):
+                result[chat_id] = schema
+                continue
+            chat = self._create_chat(schema)
+            if self._client._use_identity_map:
+                self._client._identity_maps.chats.set(chat_id, chat)
+            result[chat_id] = chat
+        return result
+
+    def _hydrate_chat(self, schema) -> Chat:
+        """Put a chat from a nested payload into the identity map, keeping a cached instance."""
+        cached = self._get_cached(schema.id)
+        if cached is not None:
+            return cached
+        chat = self._create_chat(schema)
+        if self._client._use_identity_map:
+            self._client._identity_maps.chats.set(chat.id, chat)
+        return chat
+
+    def _hydrate(self, schema, chat: Chat, include: frozenset[str]) -> None:
+        """Put related entities from the chat payload into the identity maps."""
+        if not include or not self._client._use_identity_map:
+            return
+        if "deals" in include:
+            self._retained_deals(chat, max_age=None)
 
     def _create_chat(self, schema) -> Chat:
         user_id = None
@@ -97,15 +221,20 @@ class ChatAPI:
             for u in schema.users:
                 if me_id and u.id != me_id:
                     user_id = u.id
-                    user = User.from_schema(u, self._client)
+                    user = self._client.account._hydrate_user(u)
                     name = u.username
                     break
             if user_id is None:
                 u = schema.users[0]
                 user_id = u.id
-                user = User.from_schema(u, self._client)
+                user = self._client.account._hydrate_user(u)
                 name = u.username
 
+        if schema.unread_messages_counter:
+            self._read_state.mark_unread(schema.id)
+        elif schema.unread_messages_counter == 0:
+            self._read_state.mark_read(schema.id)
+
         chat = Chat(
             id=schema.id,
             type=schema.type,
@@ -116,13 +245,80 @@ class ChatAPI:
         )
 
         chat._client = self._client
+        self._client._indexes.chats_by_user.add(user_id, chat.id)
+        chat._deal_schemas = schema.deals
+        chat._deals_fetched_at = time.monotonic()
         return chat
 
+    def _retained_deals(self, chat: Chat, max_age: float | None) -> list[Deal] | None:
+        """Deals of the chat taken from the payload it was built from, None if unknown or stale."""
+        if chat._deals is None and chat._deal_schemas is None:
+            return None
+        if max_age is not None and time.monotonic() - chat._deals_fetched_at > max_age:
+            return None
+
+        if chat._deals is None:
+            chat._deals = []
+            for deal_schema in chat._deal_schemas:
+                deal = self._client.deals._create_deal(deal_schema)
+                deal.chat_id = deal.chat_id or chat.id
+                self._client._indexes.deals_by_chat.add(chat.id, deal.id)
+                chat._deals.append(deal)
+            chat._deal_schemas = None
+            self._client._indexes.deals_by_chat.mark_complete(chat.id)
+        return chat._deals
+
+    async def get_deals_for(
+        self, chats: Iterable[str | Chat], *, max_age: float | None = None
+    ) -> dict[str, list[Deal]]:
+        """Get deals of several chats.
+
+        Deals that came with the chat payload are reused while they are younger than
+        `max_age` seconds, the rest of the chats are re-fetched concurrently.
+
+        Args:
+            chats: Chat entities or chat ids
+            max_age: Maximum age of reused deals in seconds, defaults to
+                `PlayerokClientConfig.chat_deals_max_age`
+
+        Returns:
+            Mapping chat id -> deals.
+        """
+        if max_age is None:
+            max_age = self._client._config.chat_deals_max_age
+
+        result: dict[str, list[Deal]] = {}
+        missing: dict[str, Chat | None] = {}
+        for chat in chats:
+            if isinstance(chat, str):
+                chat = self._get_cached(chat) or chat
+            if isinstance(chat, str):
+                missing[chat] = None
+                continue
+
+            deals = self._retained_deals(chat, max_age)
+            if deals is None:
+                missing[chat.id] = chat
+            else:
+                result[chat.id] = deals
+
+        refreshed = await asyncio.gather(
+            *(self.get(chat_id, force_refresh=True) for chat_id in missing)
+        )
+        for (chat_id, stale), chat in zip(missing.items(), refreshed):
+            deals = (self._retained_deals(chat, None) or []) if chat else []
+            if stale is not None and stale is not chat:
+                stale._deals = deals
+                stale._deal_schemas = None
+                stale._deals_fetched_at = time.monotonic()
+            result[chat_id] = deals
+
+        return result
+
     async def get(self, chat_id: str, *, force_refresh: bool = False) -> Chat | None:
-        if not force_refresh and self._client._use_identity_map:
-            cached = self._client._identity_maps.chats.get(chat_id)
-            if cached:
-                return cached
+        if not force_refresh:
+            # Lookups issued in the same loop iteration are merged into one batch.
+            return await self._loader.load(chat_id)
 
         schema = await self._client._raw.chats.get_chat(chat_id)
         if schema is None:
@@ -135,6 +331,34 @@ class ChatAPI:
 
         return chat
 
+    async def get_by_user(self, user_id: str, *, force_refresh: bool = False) -> Chat | None:
+        """Get the chat with a user.
+
+        Chats are indexed by user as they are decoded. On a miss the chats are
+        scanned until the chat is found, filling the index on the way.
+
+        Args:
+            user_id: Other participant id
+            force_refresh: Ignore the index and scan the chats again
+        """
+        index = self._client._indexes.chats_by_user
+        if force_refresh:
+            index.invalidate(user_id)
+        else:
+            chat_ids = index.get(user_id)
+            if chat_ids:
+                return await self.get(chat_ids[0])
+            if index.is_complete(user_id):
+                return None
+
+        async for chat in self.iter(user_id=user_id):
+            return chat
+        return None
+
+    async def get_many(self, chat_ids: list[str]) -> list[Chat | None]:
+        """Get several chats at once, cached ones are not requested again."""
+        return await self._loader.load_many(chat_ids)
+
     async def list(
         self,
         *,
@@ -144,7 +368,17 @@ class ChatAPI:
         status: ChatStatuses | None = None,
         user_id: str | None = None,
         unread_only: bool = False,
+        include: Iterable[str] = (),
     ) -> list[Chat]:
+        """List chats.
+
+        Args:
+            include: Related entities to take from the same payload and put into
+                the identity maps: "deals". The other participant is always put
+                into the identity map, "user" is accepted for compatibility.
+                Hydrated entities only have the fields present in the chats list.
+        """
+        include = _check_include(include, CHAT_INCLUDES)
         result = []
         remain = limit
         current_cursor = cursor
@@ -162,6 +396,9 @@ class ChatAPI:
 
             for schema in response.chats:
                 chat = self._create_chat(schema)
+                # Chats skipped by the filters still fill the identity map and indexes.
+                if self._client._use_identity_map:
+                    self._client._identity_maps.chats.set(chat.id, chat)
 
                 # Filter by user_id if specified
                 if user_id is not None and chat.user_id != user_id:
@@ -169,8 +406,7 @@ class ChatAPI:
                 if unread_only and (chat.unread_messages_counter or 0) == 0:
                     continue
 
-                if self._client._use_identity_map:
-                    self._client._identity_maps.chats.set(chat.id, chat)
+                self._hydrate(schema, chat, include)
 
                 result.append(chat)
                 if len(result) >= limit:
@@ -195,8 +431,12 @@ class ChatAPI:
         status: ChatStatuses | None = None,
         user_id: str | None = None,
         unread_only: bool = False,
+        include: Iterable[str] = (),
     ) -> AsyncIterator[Chat]:
+        """Iterate over chats, see `list()` for `include`."""
+        include = _check_include(include, CHAT_INCLUDES)
         current_cursor = cursor
+        full_scan = cursor is None and type is None and status is None
 
         while True:
             response = await self._client._raw.chats.get_chats(
@@ -206,10 +446,13 @@ class ChatAPI:
                 status=status,
             )
             if response is None or not response.chats:
-                return
+                break
 
             for schema in response.chats:
                 chat = self._create_chat(schema)
+                # Chats skipped by the filters still fill the identity map and indexes.
+                if self._client._use_identity_map:
+                    self._client._identity_maps.chats.set(chat.id, chat)
 
                 # Filter by user_id if specified
                 if user_id is not None and chat.user_id != user_id:
@@ -217,8 +460,7 @@ class ChatAPI:
                 if unread_only and (chat.unread_messages_counter or 0) == 0:
                     continue
 
-                if self._client._use_identity_map:
-                    self._client._identity_maps.chats.set(chat.id, chat)
+                self._hydrate(schema, chat, include)
 
                 yield chat
 
@@ -226,6 +468,10 @@ class ChatAPI:
                 break
             current_cursor = response.page_info.end_cursor
 
+        if full_scan:
+            # Every chat went through `_create_chat`, so the user index is complete.
+            self._client._indexes.chats_by_user.mark_all_complete()
+
     async def send_message(
         self,
         chat_id: str,
@@ -237,14 +483,64 @@ class ChatAPI:
         if text is None and photo is None:
             raise ValueError("Either text or photo must be provided")
 
+        if mark_as_read:
+            await self.mark_as_read(chat_id)
+
         msg = await self._client._raw.chats.send_message(
             chat_id=chat_id,
             text=text,
             photo=photo,
-            mark_as_read=mark_as_read,
         )
 
         return self.messages._create_message(msg, chat_id)
 
-    async def mark_as_read(self, chat_id: str) -> None:
+    async def mark_as_read(self, chat_id: str, *, force: bool = False, defer: bool = False) -> None:
+        """Mark chat as read.
+
+        The mutation is skipped if the chat is already known to be read.
+
+        Args:
+            chat_id: Chat ID
+            force: Send the mutation even if the chat is known to be read
+            defer: Don't send the mutation now, only remember the chat for `flush_read_marks()`
+        """
+        if not force and self._read_state.is_read(chat_id):
+            return
+        if defer:
+            self._read_state.defer(chat_id)
+            return
+
         await self._client._raw.chats.mark_chat_as_read(chat_id)
+        self._read_state.mark_read(chat_id)
+
+        if self._client._use_identity_map:
+            cached = self._client._identity_maps.chats.get(chat_id)
+            if cached:
+                cached.unread_messages_counter = 0
+
+    async def flush_read_marks(self) -> int:
+        """Send deferred `mark_as_read` mutations.
+
+        Chats whose mutation failed stay deferred, the first error is raised once
+        every chat was tried.
+
+        Returns:
+            Number of chats marked as read.
+        """
+        chat_ids = [
+            chat_id
+            for chat_id in self._read_state.take_deferred()
+            if not self._read_state.is_read(chat_id)
+        ]
+        results = await asyncio.gather(
+            *(self.mark_as_read(chat_id, force=True) for chat_id in chat_ids),
+            return_exceptions=True,
+        )
+        errors = []
+        for chat_id, result in zip(chat_ids, results):
+            if isinstance(result, BaseException):
+                self._read_state.defer(chat_id)
+                errors.append(result)
+        if errors:
+            raise errors[0]
+        return len(chat_ids)
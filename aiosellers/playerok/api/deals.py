@@ -1,39 +1,133 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, AsyncIterator
 
+from ..core.dataloader import DataLoader
+from ..core.utils import _check_include
 from ..entities.deal import Deal
 from ..schemas.enums import ItemDealDirections, ItemDealStatuses
+from ..storage.checkpoints import DealCheckpoint
 
 if TYPE_CHECKING:
     from ..entities.item import Item
     from ..playerok import Playerok
 
 
+DEAL_INCLUDES = frozenset({"user", "item", "chat"})
+
+OPEN_DEAL_STATUSES = (ItemDealStatuses.PAID, ItemDealStatuses.PENDING, ItemDealStatuses.SENT)
+
+
+@dataclass(slots=True)
+class DealSyncResult:
+    """Result of `DealAPI.sync()`.
+
+    Attributes:
+        new: Deals created since the previous sync
+        changed: Previously known deals whose status changed
+        key: Checkpoint name
+        checkpoint: Checkpoint reached by this sync, saved unless `save=False` was passed
+    """
+
+    new: list[Deal]
+    changed: list[Deal]
+    key: str | None = None
+    checkpoint: DealCheckpoint | None = None
+
+
+def _newest_first(deal: Deal) -> float:
+    # Deals without a creation date were just made by us.
+    return -deal.created_at.timestamp() if deal.created_at else float("-inf")
+
+
 class DealAPI:
     def __init__(self, client: Playerok) -> None:
         self._client = client
-
-    def _create_deal(self, schema) -> Deal:
-        deal = Deal(
-            id=schema.id,
-            status=schema.status,
-            user_id=schema.user.id if schema.user else None,
-            chat_id=schema.chat.id if schema.chat else None,
-            item_id=schema.item.id if schema.item else None,
+        self._loader: DataLoader[str, Deal] = DataLoader(
+            self._load_deals,
+            cache_lookup=self._get_loaded,
+            max_batch_size=client._config.loader_batch_size,
         )
-        deal._client = self._client
 
+    def _get_cached(self, deal_id: str) -> Deal | None:
         if self._client._use_identity_map:
-            self._client._identity_maps.deals.set(schema.id, deal)
+            return self._client._identity_maps.deals.get(deal_id)
+        return None
 
+    def _get_loaded(self, deal_id: str) -> Deal | None:
+        # Deals built from a mutation result are fetched in full when asked for.
+        deal = self._get_cached(deal_id)
+        return None if deal is None or deal._partial else deal
+
+    async def _load_deals(self, deal_ids: list[str]) -> dict[str, Deal | BaseException]:
+        # A failed lookup fails only its own key, see `DataLoader`.
+        schemas = await asyncio.gather(
+            *(self._client._raw.deals.get_deal(deal_id) for deal_id in deal_ids),
+            return_exceptions=True,
+        )
+        return {
+            deal_id: schema if isinstance(schema, BaseException) else self._create_deal(schema)
+            for deal_id, schema in zip(deal_ids, schemas)
+            if schema is not None
+        }
+
+    def _hydrate(self, schema, include: frozenset[str]) -> None:
+        """Put related entities from the deal payload into the identity maps."""
+        if not include or not self._client._use_identity_map:
+            return
+        if "user" in include and schema.user:
+            self._client.account._hydrate_user(schema.user)
+        if "item" in include and schema.item:
+            self._client.items._create_item(schema.item)
+        if "chat" in include and schema.chat:
+            self._client.chats._hydrate_chat(schema.chat)
+
+    def _create_deal(self, schema) -> Deal:
+        deal = self._get_cached(schema.id)
+        if deal is None:
+            deal = Deal(id=schema.id)
+            deal._client = self._client
+            if self._client._use_identity_map:
+                self._client._identity_maps.deals.set(schema.id, deal)
+
+        # The cached instance is updated in place, so holders of it see the change.
+        deal.status = schema.status
+        deal.status_expiration_date = schema.status_expiration_date
+        if schema.created_at is not None:
+            deal.created_at = schema.created_at
+        if schema.user:
+            deal.user_id = schema.user.id
+        if schema.chat:
+            deal.chat_id = schema.chat.id
+        if schema.item:
+            deal.item_id = schema.item.id
+        deal._partial = False
+
+        self._client._indexes.deals_by_item.add(deal.item_id, deal.id)
+        self._client._indexes.deals_by_chat.add(deal.chat_id, deal.id)
+        return deal
+
+    def _set_status(self, deal_id: str, status: ItemDealStatuses) -> Deal:
+        """Apply a status change the server confirmed without returning the deal."""
+        deal = self._get_cached(deal_id)
+        if deal is None:
+            deal = Deal(id=deal_id)
+            deal._client = self._client
+            deal._partial = True
+            if self._client._use_identity_map:
+                self._client._identity_maps.deals.set(deal_id, deal)
+        deal.status = status
+        # The expiration belonged to the previous status.
+        deal.status_expiration_date = None
         return deal
 
     async def get(self, deal_id: str, *, force_refresh: bool = False) -> Deal | None:
-        if not force_refresh and self._client._use_identity_map:
-            cached = self._client._identity_maps.deals.get(deal_id)
-            if cached:
-                return cached
+        if not force_refresh:
+            # Lookups issued in the same loop iteration are merged into one batch.
+            return await self._loader.load(deal_id)
 
         schema = await self._client._raw.deals.get_deal(deal_id)
         if schema is None:
@@ -41,6 +135,50 @@ class DealAPI:
 
         return self._create_deal(schema)
 
+    async def get_by_item(
+        self, item_id: str, *, limit: int = 24, force_refresh: bool = False
+    ) -> list[Deal]:
+        """Get deals of an item, newest first.
+
+        Deals are indexed by item as they are decoded. Until a scan saw every deal of
+        the item, the deals are scanned again, filling the index on the way.
+
+        Args:
+            item_id: Item id
+            limit: Maximum number of deals
+            force_refresh: Ignore the index and scan the deals again
+        """
+        index = self._client._indexes.deals_by_item
+        if force_refresh:
+            index.invalidate(item_id)
+        elif index.is_complete(item_id):
+            # Ids are in the order they were seen, not the order deals were created.
+            deals = [deal for deal in await self.get_many(index.get(item_id)) if deal]
+            deals.sort(key=_newest_first)
+            return deals[:limit]
+
+        result = []
+        if limit > 0:
+            async for deal in self.iter(item_id=item_id):
+                result.append(deal)
+                if len(result) >= limit:
+                    break
+        return result
+
+    async def get_by_chat(self, chat_id: str) -> list[Deal]:
+        """Get deals of a chat, from the index when the chat payload was already seen."""
+        index = self._client._indexes.deals_by_chat
+        if index.is_complete(chat_id):
+            deals = await self.get_many(index.get(chat_id))
+            return [deal for deal in deals if deal is not None]
+
+        deals = await self._client.chats.get_deals_for([chat_id])
+        return deals[chat_id]
+
+    async def get_many(self, deal_ids: list[str]) -> list[Deal | None]:
+        """Get several deals at once, cached ones are not requested again."""
+        return await self._loader.load_many(deal_ids)
+
     async def list(
         self,
         *,
@@ -50,7 +188,17 @@ class DealAPI:
         direction: ItemDealDirections | None = None,
         user_id: str | None = None,
         item_id: str | None = None,
+        include: Iterable[str] = (),
     ) -> list[Deal]:
+        """List deals.
+
+        Args:
+            include: Related entities to take from the same payload and put into
+                the identity maps: "user", "item", "chat". `Deal.get_user()` and friends
+                then don't make requests. Hydrated entities only have the fields
+                present in the deals list.
+        """
+        include = _check_include(include, DEAL_INCLUDES)
         result = []
         remain = limit
         current_cursor = cursor
@@ -67,18 +215,19 @@ class DealAPI:
                 break
 
             for schema in response.deals:
-                deal_user_id = schema.user.id if schema.user else None
-                deal_item_id = schema.item.id if schema.item else None
+                # Deals skipped by the filters still fill the identity map and indexes.
+                deal = self._create_deal(schema)
 
                 # Filter by user_id if specified
-                if user_id is not None and deal_user_id != user_id:
+                if user_id is not None and deal.user_id != user_id:
                     continue
 
                 # Filter by item_id if specified
-                if item_id is not None and deal_item_id != item_id:
+                if item_id is not None and deal.item_id != item_id:
                     continue
 
-                result.append(self._create_deal(schema))
+                self._hydrate(schema, include)
+                result.append(deal)
                 if len(result) >= limit:
                     break
 
@@ -101,8 +250,12 @@ class DealAPI:
         direction: ItemDealDirections | None = None,
         user_id: str | None = None,
         item_id: str | None = None,
+        include: Iterable[str] = (),
     ) -> AsyncIterator[Deal]:
+        """Iterate over deals, see `list()` for `include`."""
+        include = _check_include(include, DEAL_INCLUDES)
         current_cursor = cursor
+        full_scan = cursor is None and statuses is None and direction is None
 
         while True:
             response = await self._client._raw.deals.get_deals(
@@ -112,46 +265,171 @@ class DealAPI:
                 direction=direction,
             )
             if response is None or not response.deals:
-                return
+                break
 
             for schema in response.deals:
-                deal_user_id = schema.user.id if schema.user else None
-                deal_item_id = schema.item.id if schema.item else None
+                # Deals skipped by the filters still fill the identity map and indexes.
+                deal = self._create_deal(schema)
 
                 # Filter by user_id if specified
-                if user_id is not None and deal_user_id != user_id:
+                if user_id is not None and deal.user_id != user_id:
                     continue
 
                 # Filter by item_id if specified
-                if item_id is not None and deal_item_id != item_id:
+                if item_id is not None and deal.item_id != item_id:
                     continue
 
-                yield self._create_deal(schema)
+                self._hydrate(schema, include)
+                yield deal
 
             if not response.page_info.has_next_page:
                 break
             current_cursor = response.page_info.end_cursor
 
-    async def confirm(self, deal_id: str) -> Deal:
-        """Confirm DONE work (for buyer)"""
-        updated = await self._client._raw.deals.update_deal(deal_id, ItemDealStatuses.CONFIRMED)
+        if full_scan:
+            # Every deal went through `_create_deal`, so the item index is complete.
+            self._client._indexes.deals_by_item.mark_all_complete()
+
+    async def sync(
+        self,
+        *,
+        direction: ItemDealDirections | None = None,
+        key: str | None = None,
+        full_history: bool = False,
+        save: bool = True,
+    ) -> DealSyncResult:
+        """Fetch deals created or changed since the previous sync.
+
+        New deals are paged only until the stored watermark is reached, and status
+        changes are detected by re-fetching deals in open statuses (PAID, PENDING, SENT)
+        only, so finished history is never downloaded again.
+
+        Args:
+            direction: Only sync deals of this direction
+            key: Checkpoint name, defaults to the direction name. Use different keys
+                for independent consumers.
+            full_history: On the first sync, return the whole deal history as new.
+                Otherwise only the latest page and currently open deals are returned.
+            save: Save the checkpoint right away. Pass False to save it with
+                `save_sync()` once the returned deals are processed, so a crash in
+                between returns them again on the next sync.
+
+        Returns:
+            New and changed deals.
+        """
+        store = self._client._deal_checkpoint_store
+        key = key or (direction.value if direction else "ALL")
+        checkpoint = await store.load(key)
+        first_sync = checkpoint is None
+        checkpoint = checkpoint or DealCheckpoint()
+
+        result = DealSyncResult(new=[], changed=[], key=key, checkpoint=checkpoint)
+        seen: set[str] = set()
+        newest = None
+
+        current_cursor = None
+        while True:
+            response = await self._client._raw.deals.get_deals(
+                user_id=self._client._me_id,
+                after_cursor=current_cursor,
+                direction=direction,
+            )
+            if response is None or not response.deals:
+                break
+
+            reached_watermark = False
+            for schema in response.deals:
+                if schema.id == checkpoint.last_deal_id or (
+                    checkpoint.watermark is not None
+                    and schema.created_at is not None
+                    and schema.created_at <= checkpoint.watermark
+                ):
+                    reached_watermark = True
+                    break
+
+                newest = newest or schema
+                seen.add(schema.id)
+                result.new.append(self._create_deal(schema))
+
+            if reached_watermark or not response.page_info.has_next_page:
+                break
+            if first_sync and not full_history:
+                break
+            current_cursor = response.page_info.end_cursor
+
+        open_deals: dict[str, ItemDealStatuses] = {}
+        current_cursor = None
+        while True:
+            response = await self._client._raw.deals.get_deals(
+                user_id=self._client._me_id,
+                after_cursor=current_cursor,
+                statuses=list(OPEN_DEAL_STATUSES),
+                direction=direction,
+            )
+            if response is None or not response.deals:
+                break
+
+            for schema in response.deals:
+                open_deals[schema.id] = schema.status
+                if schema.id in seen:
+                    continue
+                seen.add(schema.id)
+
+                previous_status = checkpoint.open_deals.get(schema.id)
+                if previous_status is None:
+                    result.new.append(self._create_deal(schema))
+                elif previous_status != schema.status:
+                    result.changed.append(self._create_deal(schema))
+
+            if not response.page_info.has_next_page:
+                break
+            current_cursor = response.page_info.end_cursor
+
+        # Deals that left the open statuses since the previous sync got finished.
+        # They are fetched again, never from the cache, a loader batch at a time.
+        finished_ids = [deal_id for deal_id in checkpoint.open_deals if deal_id not in seen]
+        batch_size = self._client._config.loader_batch_size
+        for start in range(0, len(finished_ids), batch_size):
+            chunk = finished_ids[start : start + batch_size]
+            loaded = await self._load_deals(chunk)
+            for deal_id in chunk:
+                deal = loaded.get(deal_id)
+                if isinstance(deal, BaseException):
+                    raise deal
+                if deal is not None:
+                    result.changed.append(deal)
+
+        if newest is not None:
+            checkpoint.last_deal_id = newest.id
+            if newest.created_at is not None:
+                checkpoint.watermark = newest.created_at
+        checkpoint.open_deals = open_deals
+        if save:
+            await store.save(key, checkpoint)
+
+        return result
+
+    async def save_sync(self, result: DealSyncResult) -> None:
+        """Save the checkpoint of a sync made with `save=False`."""
+        await self._client._deal_checkpoint_store.save(result.key, result.checkpoint)
+
+    async def _update_status(self, deal_id: str, status: ItemDealStatuses) -> Deal:
+        updated = await self._client._raw.deals.update_deal(deal_id, status)
         if updated is None:
-            return await self.get(deal_id, force_refresh=True)
+            return self._set_status(deal_id, status)
         return self._create_deal(updated)
 
+    async def confirm(self, deal_id: str) -> Deal:
+        """Confirm DONE work (for buyer)"""
+        return await self._update_status(deal_id, ItemDealStatuses.CONFIRMED)
+
     async def complete(self, deal_id: str) -> Deal:
         """Mark PAID work as COMPLETED (sent), ask for confirmation (for seller)"""
-        updated = await self._client._raw.deals.update_deal(deal_id, ItemDealStatuses.SENT)
-        if updated is None:
-            return await self.get(deal_id, force_refresh=True)
-        return self._create_deal(updated)
+        return await self._update_status(deal_id, ItemDealStatuses.SENT)
 
     async def cancel(self, deal_id: str) -> Deal:
         """Reject PAID work and refund money (for seller)"""
-        updated = await self._client._raw.deals.update_deal(deal_id, ItemDealStatuses.ROLLED_BACK)
-        if updated is None:
-            return await self.get(deal_id, force_refresh=True)
-        return self._create_deal(updated)
+        return await self._update_status(deal_id, ItemDealStatuses.ROLLED_BACK)
 
     def _extract_obtaining_fields(
         self, fields: dict[str, str] | list | None
@@ -182,12 +460,14 @@ class DealAPI:
             comment: Optional comment from buyer
 
         Returns:
-            Created Deal entity or None if creation failed
+            Created Deal entity or None if creation failed, built from the
+            transaction without fetching the deal: `chat_id` and `user_id` are None
+            until `refresh()`, `get_chat()` or `get_user()`, and `get()` fetches it
         """
         from ..schemas.enums import TransactionProviderIds
 
         # Extract item_id
-        item_id = item.id if isinstance(item, Item) else item
+        item_id = item if isinstance(item, str) else item.id
 
         # Extract obtaining fields
         fields_dict = self._extract_obtaining_fields(obtaining_fields)
@@ -208,7 +488,12 @@ class DealAPI:
         if transaction.props and isinstance(transaction.props, dict):
             deal_id = transaction.props.get("dealId")
 
-        if deal_id:
-            return await self.get(deal_id)
+        if not deal_id:
+            return None
 
-        return None
+        # The deal is paid from the balance, so it starts as PAID. Its chat and
+        # counterparty aren't in the transaction, they are loaded on first access.
+        deal = self._set_status(deal_id, ItemDealStatuses.PAID)
+        deal.item_id = deal.item_id or item_id
+        self._client._indexes.deals_by_item.add(item_id, deal_id)
+        return deal
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import bisect
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from ..entities.item import EDITABLE_FIELDS, Item, MyItem
+from ..schemas.enums import ItemStatuses
+
+if TYPE_CHECKING:
+    from ..playerok import Playerok
+    from ..schemas.items import Item as ItemSchema
+    from ..schemas.items import MyItem as MyItemSchema
+
+# Page size used by `ItemAPI.iter_self()`.
+_PAGE_SIZE = 24
+
+# Entity field -> payload field copied when a listing changes.
+_ITEM_FIELDS = {
+    "slug": "slug",
+    "name": "name",
+    "description": "description",
+    "price": "price",
+    "status": "status",
+    "priority": "priority",
+    "priority_position": "priority_position",
+    "priority_price": "priority_price",
+    "prev_price": "prev_price",
+    "is_editable": "is_editable",
+    "game_id": "game_id",
+    "category_id": "category_id",
+    "obtaining_type_id": "obtaining_type_id",
+}
+
+
+def _merge(item: Item, schema: ItemSchema | MyItemSchema) -> bool:
+    """Copy the non-None fields present in the payload, returns whether any changed.
+
+    Unsaved local edits of a `MyItem` are kept, the payload only replaces the saved
+    values they are compared against, so `save()` still sends them.
+    """
+    changed = False
+    present = schema.model_fields_set
+    edited = item.changes() if isinstance(item, MyItem) else {}
+    for name, source in _ITEM_FIELDS.items():
+        if not hasattr(item, name) or not hasattr(schema, source):
+            continue
+        if source not in present:
+            continue
+        value = getattr(schema, source)
+        if value is None:
+            continue
+        if name in edited:
+            item._saved[name] = value
+        elif getattr(item, name) != value:
+            setattr(item, name, value)
+            changed = True
+
+    if isinstance(item, MyItem):
+        item._mark_saved(name for name in EDITABLE_FIELDS if name in present and name not in edited)
+        if "attributes" in present and schema.attributes is not None:
+            item._saved_options = {
+                slug: str(value).lower() if isinstance(value, bool) else str(value)
+                for slug, value in schema.attributes.items()
+            }
+    return changed
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+@dataclass(slots=True)
+class InventoryRefresh:
+    """Outcome of an inventory refresh.
+
+    Attributes:
+        added: Ids of listings that appeared
+        changed: Ids of listings whose fields changed
+        removed: Ids of listings that are gone
+        requests: `get_items` requests made
+        full: Whether every page was walked
+    """
+
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    requests: int = 0
+    full: bool = False
+
+
+class InventoryAPI:
+    """In-memory mirror of own listings.
+
+    `load()` downloads the listings once, after that the mirror is kept current by
+    the results of `client.items` mutations (create, update, publish, priority
+    purchases, remove) and by `refresh()`, which stops at the first page without
+    changes when the total count still matches. Queries are answered from indexes
+    by status, category, price and name without requests.
+    """
+
+    def __init__(self, client: Playerok) -> None:
+        self._client = client
+        self._full_refresh_interval = client._config.inventory_full_refresh_interval
+        self._full_at = 0.0
+        self._items: dict[str, MyItem] = {}
+        self._loaded = False
+        self._by_status: dict[ItemStatuses | None, dict[str, None]] = {}
+        self._by_category: dict[str | None, dict[str, None]] = {}
+        self._prices: list[tuple[int, str]] = []
+        self._by_trigram: dict[str, set[str]] = {}
+        # id -> indexed (status, category_id, price, folded name)
+        self._keys: dict[str, tuple[ItemStatuses | None, str | None, int | None, str]] = {}
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._items
+
+    def __iter__(self) -> Iterator[MyItem]:
+        return iter(list(self._items.values()))
+
+    def get(self, item_id: str) -> MyItem | None:
+        return self._items.get(item_id)
+
+    def _index(self, item: MyItem) -> None:
+        name = (item.name or "").casefold()
+        key = (item.status, item.category_id, item.price, name)
+        previous = self._keys.get(item.id)
+        if previous == key:
+            return
+        if previous is not None:
+            self._unindex(item.id)
+
+        self._keys[item.id] = key
+        self._by_status.setdefault(item.status, {})[item.id] = None
+        self._by_category.setdefault(item.category_id, {})[item.id] = None
+        if item.price is not None:
+            bisect.insort(self._prices, (item.price, item.id))
+        for trigram in _trigrams(name):
+            self._by_trigram.setdefault(trigram, set()).add(item.id)
+
+    def _unindex(self, item_id: str) -> None:
+        key = self._keys.pop(item_id, None)
+        if key is None:
+            return
+        status, category_id, price, name = key
+        self._by_status[status].pop(item_id, None)
+        self._by_category[category_id].pop(item_id, None)
+        if price is not None:
+            row = bisect.bisect_left(self._prices, (price, item_id))
+            if row < len(self._prices) and self._prices[row] == (price, item_id):
+                del self._prices[row]
+        for trigram in _trigrams(name):
+            ids = self._by_trigram.get(trigram)
+            if ids is not None:
+                ids.discard(item_id)
+                if not ids:
+                    del self._by_trigram[trigram]
+
+    def _apply(self, schema: ItemSchema | MyItemSchema) -> tuple[MyItem, bool]:
+        """Put a listing payload into the mirror, returns the entity and whether it changed.
+
+        The cached entity is updated with the non-None fields of the payload, so
+        holders of the instance see the new values too.
+        """
+        item, changed = self._client.items._upsert_my_item(schema, self._items.get(schema.id))
+        is_new = item.id not in self._items
+        self._items[item.id] = item
+        self._index(item)
+        return item, changed or is_new
+
+    def _discard(self, item_id: str) -> None:
+        self._items.pop(item_id, None)
+        self._unindex(item_id)
+
+    def _track(self, item: MyItem) -> None:
+        """Reindex a listing changed by an own mutation while the mirror is loaded."""
+        if self._loaded:
+            self._items[item.id] = item
+            self._index(item)
+
+    async def load(self, *, force: bool = False) -> list[MyItem]:
+        """Download own listings into the mirror, once unless `force` is set."""
+        if force or not self._loaded:
+            await self.refresh(full=True)
+        return list(self._items.values())
+
+    async def refresh(self, *, full: bool = False) -> InventoryRefresh:
+        """Bring the mirror up to date.
+
+        Pages of own listings are walked from the first one. Unless `full` is set
+        the walk stops at a page without added or changed listings once the total
+        count matches the mirror, so an idle inventory costs one request. Removed
+        listings change the count, which makes the walk go through every page.
+
+        Changes behind an unchanged page (edits elsewhere, e.g. on the website, or a
+        removal offset by a new listing) are only seen by a full walk, which happens
+        when `full` is set or `PlayerokClientConfig.inventory_full_refresh_interval`
+        seconds passed since the last one.
+        """
+        result = InventoryRefresh()
+        full = (
+            full
+            or not self._loaded
+            or (
+                self._full_refresh_interval is not None
+                and time.monotonic() - self._full_at >= self._full_refresh_interval
+            )
+        )
+        seen: set[str] = set()
+        cursor = None
+
+        while True:
+            response = await self._client._raw.items.get_items(
+                count=_PAGE_SIZE, cursor=cursor, user_id=self._client._me_id
+            )
+            result.requests += 1
+            if response is None or not response.items:
+                break
+
+            page_changed = False
+            for schema in response.items:
+                is_new = schema.id not in self._items
+                _, changed = self._apply(schema)
+                seen.add(schema.id)
+                if is_new:
+                    result.added.append(schema.id)
+                elif changed:
+                    result.changed.append(schema.id)
+                page_changed = page_changed or changed
+
+            if not response.page_info.has_next_page:
+                break
+            if not full and not page_changed and response.total_count == len(self._items):
+                return result
+            cursor = response.page_info.end_cursor
+
+        # Every page was walked, listings that were not seen are gone.
+        result.full = True
+        result.removed = [item_id for item_id in self._items if item_id not in seen]
+        for item_id in result.removed:
+            self._discard(item_id)
+        self._loaded = True
+        self._full_at = time.monotonic()
+        return result
+
+    def find(
+        self,
+        *,
+        status: ItemStatuses | Iterable[ItemStatuses] | None = None,
+        category_id: str | None = None,
+        min_price: int | None = None,
+        max_price: int | None = None,
+        name: str | None = None,
+    ) -> list[MyItem]:
+        """Listings matching every given condition, sorted by price when a range is given.
+
+        Args:
+            status: Status or statuses
+            category_id: Category id
+            min_price: Lowest price, inclusive
+            max_price: Highest price, inclusive
+            name: Case-insensitive substring of the name
+        """
+        candidates: list[Iterable[str]] = []
+        if status is not None:
+            statuses = [status] if isinstance(status, ItemStatuses) else list(status)
+            ids: dict[str, None] = {}
+            for value in statuses:
+                ids.update(self._by_status.get(value, {}))
+            candidates.append(ids)
+        if category_id is not None:
+            candidates.append(self._by_category.get(category_id, {}))
+        if name is not None:
+            candidates.append(self._name_candidates(name.casefold()))
+        if min_price is not None or max_price is not None:
+            low = bisect.bisect_left(self._prices, (min_price,)) if min_price is not None else 0
+            high = (
+                bisect.bisect_left(self._prices, (max_price + 1,))
+                if max_price is not None
+                else len(self._prices)
+            )
+            # The price range goes first so results come out sorted by price.
+            candidates.insert(0, [item_id for _, item_id in self._prices[low:high]])
+
+        if not candidates:
+            return list(self._items.values())
+
+        rest = [c if isinstance(c, (dict, set)) else set(c) for c in candidates[1:]]
+        rest.sort(key=len)
+        return [
+            self._items[item_id]
+            for item_id in candidates[0]
+            if all(item_id in other for other in rest)
+        ]
+
+    def _name_candidates(self, text: str) -> Iterable[str]:
+        if len(text) < 3:
+            return {item_id for item_id, key in self._keys.items() if text in key[3]}
+        # Trigrams narrow the candidates, the substring check drops false positives.
+        sets = sorted((self._by_trigram.get(t, set()) for t in _trigrams(text)), key=len)
+        ids = set.intersection(*sets) if sets else set()
+        return {item_id for item_id in ids if text in self._keys[item_id][3]}
+
+    def clear(self) -> None:
+        """Forget every listing, the next `load()` downloads them again."""
+        self._items.clear()
+        self._keys.clear()
+        self._by_status.clear()
+        self._by_category.clear()
+        self._prices.clear()
+        self._by_trigram.clear()
+        self._loaded = False
@@ -1,20 +1,61 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Iterable
 from typing import TYPE_CHECKING, AsyncIterator
 
+from ..core.dataloader import DataLoader
+from ..core.price_tiers import PriceTierCache
 from ..core.types import ImageInput
+from ..core.utils import _check_include
 from ..entities.game import GameCategoryDataField, GameCategoryOption
 from ..entities.item import Item, MyItem
 from ..schemas.items import Item as ItemSchema
+from ..schemas.items import ItemPriorityStatus
 from ..schemas.items import MyItem as MyItemSchema
+from ..storage.search import DocumentKind
+from .inventory import _merge
 
 if TYPE_CHECKING:
     from ..playerok import Playerok
 
 
+ITEM_INCLUDES = frozenset({"user"})
+
+
 class ItemAPI:
     def __init__(self, client: Playerok) -> None:
         self._client = client
+        self._loader: DataLoader[str, Item] = DataLoader(
+            self._load_items,
+            cache_lookup=self._get_cached,
+            max_batch_size=client._config.loader_batch_size,
+        )
+        self._priority_tiers = PriceTierCache(ttl=client._config.priority_status_ttl)
+
+    def _get_cached(self, item_id: str) -> Item | None:
+        if self._client._use_identity_map:
+            return self._client._identity_maps.items.get(item_id)
+        return None
+
+    async def _load_items(self, item_ids: list[str]) -> dict[str, Item | BaseException]:
+        # A failed lookup fails only its own key, see `DataLoader`.
+        schemas = await asyncio.gather(
+            *(self._client._raw.items.get_item(item_id) for item_id in item_ids),
+            return_exceptions=True,
+        )
+        return {
+            item_id: schema if isinstance(schema, BaseException) else self._create_item(schema)
+            for item_id, schema in zip(item_ids, schemas)
+            if schema is not None
+        }
+
+    def _hydrate(self, schema, include: frozenset[str]) -> None:
+        """Put related entities from the item payload into the identity maps."""
+        if not include or not self._client._use_identity_map:
+            return
+        if "user" in include and schema.user:
+            self._client.account._hydrate_user(schema.user)
 
     def _create_item(self, schema) -> Item:
         if self._client._use_identity_map and hasattr(schema, "id"):
@@ -42,11 +83,29 @@ class ItemAPI:
 
         return item
 
+    def _feed_search(self, schema) -> None:
+        index = self._client._search_index
+        if index is not None and "name" in schema.model_fields_set:
+            index.add_item(schema.id, schema.name, schema.description)
+
     def _create_my_item(self, schema) -> MyItem:
-        if self._client._use_identity_map and hasattr(schema, "id"):
+        return self._upsert_my_item(schema)[0]
+
+    def _upsert_my_item(self, schema, existing: MyItem | None = None) -> tuple[MyItem, bool]:
+        """Build a listing, or merge the payload into the cached one (or `existing`).
+
+        Returns the entity and whether the payload changed it, new entities count
+        as changed.
+        """
+        self._feed_search(schema)
+        item = existing
+        if item is None and self._client._use_identity_map and hasattr(schema, "id"):
             cached = self._client._identity_maps.items.get(schema.id)
-            if cached:
-                return cached
+            # A plain Item cached by get() is replaced, own listings carry more fields.
+            if isinstance(cached, MyItem):
+                item = cached
+        if item is not None:
+            return item, _merge(item, schema)
 
         if type(schema) is ItemSchema:
             item = MyItem(
@@ -55,7 +114,6 @@ class ItemAPI:
                 name=schema.name,
                 description=schema.description,
                 price=schema.price,
-                prev_price=schema.raw_price,
                 status=schema.status,
                 priority=schema.priority,
                 priority_position=schema.priority_position,
@@ -84,11 +142,13 @@ class ItemAPI:
                 buyer=schema.buyer,
             )
 
-            if self._client._use_identity_map:
-                self._client._identity_maps.items.set(item.id, item)
+        if self._client._use_identity_map:
+            self._client._identity_maps.items.set(item.id, item)
 
         item._client = self._client
-        return item
+        # Records the server state `save()` compares against.
+        _merge(item, schema)
+        return item, True
 
     def _extract_options(
         self, options: dict[str, str] | list[GameCategoryOption] | None
@@ -116,16 +176,30 @@ class ItemAPI:
                 result[field.id] = field._input_value
         return result if result else None
 
-    async def _get_priority_statuses(self, item_id: str, price: int):
-        return await self._client._raw.items.get_item_priority_statuses(item_id, price)
+    async def _get_priority_statuses(
+        self, item_id: str, price: int, category_id: str | None = None
+    ) -> list[ItemPriorityStatus]:
+        # Statuses differ between categories, items of unknown category get their own scope.
+        scope = category_id or item_id
+        statuses = self._priority_tiers.get(scope, price)
+        if statuses is None:
+            statuses = await self._client._raw.items.get_item_priority_statuses(item_id, price)
+            self._priority_tiers.put(scope, price, statuses)
+        return statuses
+
+    async def _buy_priority(self, item_id: str, status: ItemPriorityStatus) -> MyItem | None:
+        schema = await self._client._raw.items.increase_item_priority_status(
+            item_id=item_id,
+            priority_status_id=status.id,
+        )
+        return self._apply(item_id, schema, priority=status.type)
 
     async def get(
         self, id: str | None = None, *, slug: str | None = None, force_refresh: bool = False
     ) -> Item | None:
-        if id and not force_refresh and self._client._use_identity_map:
-            cached = self._client._identity_maps.items.get(id)
-            if cached:
-                return cached
+        if id and not force_refresh:
+            # Lookups issued in the same loop iteration are merged into one batch.
+            return await self._loader.load(id)
 
         schema = await self._client._raw.items.get_item(id, slug)
         if schema is None:
@@ -133,6 +207,10 @@ class ItemAPI:
 
         return self._create_item(schema)
 
+    async def get_many(self, item_ids: list[str]) -> list[Item | None]:
+        """Get several items at once, cached ones are not requested again."""
+        return await self._loader.load_many(item_ids)
+
     async def list(
         self,
         *,
@@ -147,7 +225,16 @@ class ItemAPI:
         has_reviews: bool | None = None,
         attributes: list[dict[str, str]] | None = None,
         search: str | None = None,
+        include: Iterable[str] = (),
     ) -> list[Item]:
+        """List items.
+
+        Args:
+            include: Related entities to take from the same payload and put into
+                the identity maps: "user" (the seller). Hydrated entities only have
+                the fields present in the items list.
+        """
+        include = _check_include(include, ITEM_INCLUDES)
         result = []
         remain = limit
         current_cursor = cursor
@@ -170,6 +257,7 @@ class ItemAPI:
                 break
 
             for schema in response.items:
+                self._hydrate(schema, include)
                 result.append(self._create_item(schema))
 
             remain -= len(response.items)
@@ -193,27 +281,38 @@ class ItemAPI:
         has_reviews: bool | None = None,
         attributes: list[dict[str, str]] | None = None,
         search: str | None = None,
+        include: Iterable[str] = (),
     ) -> AsyncIterator[Item]:
+        """Iterate over items, see `list()` for `include`."""
+        include = _check_include(include, ITEM_INCLUDES)
+        async for schema in self._iter_schemas(
+            cursor=cursor,
+            game_id=game_id,
+            category_id=category_id,
+            user_id=user_id,
+            minimal_price=minimal_price,
+            maximal_price=maximal_price,
+            has_discount=has_discount,
+            has_reviews=has_reviews,
+            attributes=attributes,
+            search=search,
+        ):
+            self._hydrate(schema, include)
+            yield self._create_item(schema)
+
+    async def _iter_schemas(
+        self, *, cursor: str | None = None, **filters
+    ) -> AsyncIterator[ItemSchema]:
+        """Iterate over raw item payloads, `filters` are passed to `get_items`."""
         current_cursor = cursor
 
         while True:
-            response = await self._client._raw.items.get_items(
-                cursor=current_cursor,
-                game_id=game_id,
-                user_id=user_id,
-                category_id=category_id,
-                minimal_price=minimal_price,
-                maximal_price=maximal_price,
-                has_discount=has_discount,
-                has_reviews=has_reviews,
-                attributes=attributes,
-                search=search,
-            )
+            response = await self._client._raw.items.get_items(cursor=current_cursor, **filters)
             if response is None or not response.items:
                 return
 
             for schema in response.items:
-                yield self._create_item(schema)
+                yield schema
 
             if not response.page_info.has_next_page:
                 break
@@ -262,6 +361,26 @@ class ItemAPI:
                 break
             current_cursor = response.page_info.end_cursor
 
+    def _apply(self, item_id: str, schema, **known) -> MyItem | None:
+        """Apply the result of an own mutation to the cached listing.
+
+        The fields of the returned payload are copied onto the cached instance. When
+        the server returned no payload, the values the mutation set (`known`) are
+        applied instead, without fetching the listing again.
+        """
+        if schema is not None:
+            item = self._create_my_item(schema)
+        else:
+            item = self._get_cached(item_id)
+            if not isinstance(item, MyItem):
+                return None
+            applied = {name: value for name, value in known.items() if value is not None}
+            for name, value in applied.items():
+                setattr(item, name, value)
+            item._mark_saved(applied)
+        self._client.inventory._track(item)
+        return item
+
     async def create(
         self,
         *,
@@ -294,7 +413,7 @@ class ItemAPI:
         if schema is None:
             return None
 
-        return self._create_my_item(schema)
+        return self._apply(schema.id, schema)
 
     async def update(
         self,
@@ -321,20 +440,56 @@ class ItemAPI:
             remove_attachments=remove_attachments,
             add_attachments=add_attachments,
         )
-        if schema is None:
-            return None
+        return self._apply(item_id, schema, name=name, price=price, description=description)
+
+    async def save(
+        self,
+        item: MyItem,
+        *,
+        options: dict[str, str] | list[GameCategoryOption] | None = None,
+        data_fields: dict[str, str] | list[GameCategoryDataField] | None = None,
+    ) -> MyItem:
+        """Send the local changes of a listing, see `MyItem.save()`."""
+        changes = item.changes()
+        options_dict = {
+            slug: value
+            for slug, value in (self._extract_options(options) or {}).items()
+            if item._saved_options.get(slug) != value
+        }
+        data_fields_dict = {
+            field_id: value
+            for field_id, value in (self._extract_data_fields(data_fields) or {}).items()
+            if item._saved_data_fields.get(field_id) != value
+        }
+        if not changes and not options_dict and not data_fields_dict:
+            return item
 
-        return self._create_my_item(schema)
+        schema = await self._client._raw.items.update_item(
+            id=item.id,
+            options=options_dict or None,
+            data_fields=data_fields_dict or None,
+            **changes,
+        )
+        # The sent values, edits made while the request was in flight stay unsaved.
+        item._saved.update(changes)
+        item._saved_options.update(options_dict)
+        item._saved_data_fields.update(data_fields_dict)
+        return self._apply(item.id, schema, **changes) or item
 
     async def remove(self, item_id: str) -> bool:
-        return await self._client._raw.items.remove_item(item_id)
+        removed = await self._client._raw.items.remove_item(item_id)
+        if removed:
+            self._client.inventory._discard(item_id)
+            if self._client._search_index is not None:
+                self._client._search_index.remove(DocumentKind.ITEM, item_id)
+        return removed
 
     async def publish(self, item_id: str, *, premium: bool = False) -> MyItem | None:
         item = await self.get(item_id)
         if item is None or item.price is None:
             raise ValueError(f"Item {item_id} not found or price is missing")
 
-        statuses = await self._get_priority_statuses(item_id, item.price)
+        statuses = await self._get_priority_statuses(item_id, item.price, item.category_id)
 
         if premium:
             if not statuses:
@@ -349,47 +504,26 @@ class ItemAPI:
             item_id=item_id,
             priority_status_id=priority_status.id,
         )
-        if schema is None:
-            return None
-
-        return self._create_my_item(schema)
+        return self._apply(item_id, schema, priority=priority_status.type)
 
     async def set_normal_priority(self, item_id: str) -> MyItem | None:
         item = await self.get(item_id)
         if item is None or item.price is None:
             raise ValueError(f"Item {item_id} not found or price is missing")
 
-        statuses = await self._get_priority_statuses(item_id, item.price)
+        statuses = await self._get_priority_statuses(item_id, item.price, item.category_id)
 
         if not statuses:
             raise ValueError("No normal priority available for this item")
-        priority_status = statuses[-1]
-
-        schema = await self._client._raw.items.increase_item_priority_status(
-            item_id=item_id,
-            priority_status_id=priority_status.id,
-        )
-        if schema is None:
-            return None
-
-        return self._create_my_item(schema)
+        return await self._buy_priority(item_id, statuses[-1])
 
     async def set_premium_priority(self, item_id: str) -> MyItem | None:
         item = await self.get(item_id)
         if item is None or item.price is None:
             raise ValueError(f"Item {item_id} not found or price is missing")
 
-        statuses = await self._get_priority_statuses(item_id, item.price)
+        statuses = await self._get_priority_statuses(item_id, item.price, item.category_id)
 
         if not statuses:
             raise ValueError("No premium priority available for this item")
-        priority_status = statuses[0]
-
-        schema = await self._client._raw.items.increase_item_priority_status(
-            item_id=item_id,
-            priority_status_id=priority_status.id,
-        )
-        if schema is None:
-            return None
-
-        return self._create_my_item(schema)
+        return await self._buy_priority(item_id, statuses[0])
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
+
+from ..entities.item import Item
+from ..market import ItemChange, MarketDiffer, MarketSnapshot, ShardedScanner, SnapshotBuilder
+
+if TYPE_CHECKING:
+    from ..playerok import Playerok
+    from ..schemas.items import Item as ItemSchema
+
+
+class MarketAPI:
+    def __init__(self, client: Playerok) -> None:
+        self._client = client
+
+    def _iter_schemas(self, concurrency: int | None, **filters) -> AsyncIterator[ItemSchema]:
+        if concurrency is None:
+            return self._client.items._iter_schemas(**filters)
+        return ShardedScanner(self._client, concurrency=concurrency, **filters).scan()
+
+    async def snapshot(
+        self,
+        *,
+        category_id: str | None = None,
+        game_id: str | None = None,
+        minimal_price: int | None = None,
+        maximal_price: int | None = None,
+        attributes: list[dict[str, str]] | None = None,
+        search: str | None = None,
+        limit: int | None = None,
+        concurrency: int | None = None,
+    ) -> MarketSnapshot:
+        """Capture listings of a category into a `MarketSnapshot`.
+
+        Pages are streamed straight into the snapshot columns, no `Item` entities
+        are created. Requires NumPy (`pip install aiosellers[market]`).
+
+        Args:
+            category_id: Category id
+            game_id: Game id, when the whole game should be captured
+            minimal_price: Lowest price to capture
+            maximal_price: Highest price to capture
+            attributes: Category attribute filters
+            search: Search query
+            limit: Maximum number of listings, None for all
+            concurrency: Scan price windows in parallel with this many requests in
+                flight, see `scan()`. None walks the category with a single cursor.
+        """
+        filters = dict(
+            category_id=category_id,
+            game_id=game_id,
+            minimal_price=minimal_price,
+            maximal_price=maximal_price,
+            attributes=attributes,
+            search=search,
+        )
+        schemas = self._iter_schemas(concurrency, **filters)
+
+        builder = SnapshotBuilder()
+        try:
+            async for schema in schemas:
+                if limit is not None and len(builder) >= limit:
+                    break
+                builder.add(schema)
+        finally:
+            await schemas.aclose()
+        return builder.build()
+
+    async def scan(
+        self,
+        *,
+        category_id: str | None = None,
+        game_id: str | None = None,
+        minimal_price: int | None = None,
+        maximal_price: int | None = None,
+        attributes: list[dict[str, str]] | None = None,
+        search: str | None = None,
+        concurrency: int = 4,
+        shard_size: int = 240,
+    ) -> AsyncIterator[Item]:
+        """Iterate over listings of a category, walking price windows in parallel.
+
+        Unlike `client.items.iter()`, which follows one cursor page by page, the price
+        range is split into windows of about `shard_size` listings that are walked
+        concurrently. Items are yielded as they arrive, not in any particular order.
+
+        Args:
+            concurrency: Maximum number of requests in flight
+            shard_size: Target number of listings per window
+        """
+        scanner = ShardedScanner(
+            self._client,
+            concurrency=concurrency,
+            shard_size=shard_size,
+            category_id=category_id,
+            game_id=game_id,
+            minimal_price=minimal_price,
+            maximal_price=maximal_price,
+            attributes=attributes,
+            search=search,
+        )
+        async for schema in scanner.scan():
+            yield self._client.items._create_item(schema)
+
+    async def diff(
+        self,
+        differ: MarketDiffer,
+        *,
+        category_id: str | None = None,
+        game_id: str | None = None,
+        minimal_price: int | None = None,
+        maximal_price: int | None = None,
+        attributes: list[dict[str, str]] | None = None,
+        search: str | None = None,
+        concurrency: int | None = None,
+    ) -> AsyncIterator[ItemChange]:
+        """Scan listings and yield changes since the previous scan of `differ`.
+
+        Added and changed listings are yielded while the scan is still running,
+        removed ones after it has finished. Keep the same `differ` between calls
+        (or persist `differ.fingerprints`) to compare successive scans.
+
+        Args:
+            differ: Differ holding fingerprints of the previous scan
+            concurrency: Scan price windows in parallel, see `scan()`
+        """
+        filters = dict(
+            category_id=category_id,
+            game_id=game_id,
+            minimal_price=minimal_price,
+            maximal_price=maximal_price,
+            attributes=attributes,
+            search=search,
+        )
+        schemas = self._iter_schemas(concurrency, **filters)
+
+        finished = False
+        try:
+            async for schema in schemas:
+                change = differ.update(schema)
+                if change is not None:
+                    yield change
+            finished = True
+        finally:
+            await schemas.aclose()
+            if not finished:
+                differ.reset()
+
+        for change in differ.finish():
+            yield change
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ..storage.search import DocumentKind, SearchHit
+
+if TYPE_CHECKING:
+    from ..entities.item import Item
+    from ..playerok import Playerok
+    from ..storage.search import SearchIndex
+
+
+class SearchAPI:
+    """Queries over the local full-text index (`PlayerokClientConfig.search_index`).
+
+    Own listings and chat messages are indexed as they are decoded by the other
+    APIs, so only what the client has already seen can be found, without requests.
+    """
+
+    def __init__(self, client: Playerok) -> None:
+        self._client = client
+
+    @property
+    def enabled(self) -> bool:
+        return self._client._search_index is not None
+
+    def _index(self) -> SearchIndex:
+        index = self._client._search_index
+        if index is None:
+            raise RuntimeError(
+                "Search index is not configured, set PlayerokClientConfig.search_index"
+            )
+        return index
+
+    async def query(
+        self,
+        text: str,
+        *,
+        kind: DocumentKind | None = None,
+        chat_id: str | None = None,
+        limit: int = 20,
+    ) -> list[SearchHit]:
+        """Documents containing every word of `text`, most relevant first."""
+        return await self._index().search(text, kind=kind, chat_id=chat_id, limit=limit)
+
+    async def items(self, text: str, *, limit: int = 20) -> list[Item]:
+        """Own listings matching `text`, cached entities are used when available."""
+        hits = await self.query(text, kind=DocumentKind.ITEM, limit=limit)
+        items = await self._client.items.get_many([hit.id for hit in hits])
+        return [item for item in items if item is not None]
+
+    async def messages(
+        self, text: str, *, chat_id: str | None = None, limit: int = 20
+    ) -> list[SearchHit]:
+        """Chat messages matching `text`, optionally within one chat."""
+        return await self.query(text, kind=DocumentKind.MESSAGE, chat_id=chat_id, limit=limit)
@@ -0,0 +1,19 @@
+"""Automation on top of chats and deals."""
+
+from .deadlines import DeadlineScheduler, TimerAction
+from .keywords import KeywordAutomaton
+from .responder import AutoResponder, ReplyRule, ResponderStats, RuleSet
+from .workflow import DealHandler, DealWorkflow, WorkflowStats
+
+__all__ = [
+    "AutoResponder",
+    "DealHandler",
+    "DealWorkflow",
+    "DeadlineScheduler",
+    "KeywordAutomaton",
+    "ReplyRule",
+    "ResponderStats",
+    "RuleSet",
+    "TimerAction",
+    "WorkflowStats",
+]
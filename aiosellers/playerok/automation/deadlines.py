@@ -0,0 +1,265 @@
+"""Deadline timers for deals and other delayed actions."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import math
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from ..storage.timers import InMemoryTimerStore, StoredTimer, TimerStore
+
+if TYPE_CHECKING:
+    from ..entities.deal import Deal
+
+logger = logging.getLogger(__name__)
+
+TimerAction = Callable[[str | None], Awaitable[None]]
+
+
+class DeadlineScheduler:
+    """Runs named actions at given times from a single task.
+
+    Timers are grouped into slots of `resolution` seconds: adding a timer to an
+    existing slot is a dict insert, and only new slots go into a heap, so tens of
+    thousands of deadlines cost one sleeping task instead of one sleep per timer.
+    A timer fires at most `resolution` seconds late.
+
+    Actions are registered by name, timers keep the name and a string payload,
+    so pending timers survive restarts when a persistent `store` is used. A due
+    timer whose action isn't registered yet stays in the store and fires once the
+    action is registered.
+
+    Example:
+        scheduler = DeadlineScheduler(store=SQLiteTimerStore("timers.db"))
+
+        @scheduler.action("remind")
+        async def remind(deal_id):
+            deal = await client.deals.get(deal_id)
+            await client.chats.send_message(deal.chat_id, text="Please confirm the order")
+
+        await scheduler.start()
+        scheduler.schedule_deal(deal, "remind", before=3600)
+    """
+
+    def __init__(
+        self,
+        *,
+        resolution: float = 1.0,
+        store: TimerStore | None = None,
+        concurrency: int = 8,
+    ) -> None:
+        """Initialize scheduler.
+
+        Args:
+            resolution: Width of a slot in seconds
+            store: Store for pending timers (in-memory by default)
+            concurrency: Maximum number of actions running at once
+        """
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self._resolution = resolution
+        self._store = store or InMemoryTimerStore()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._actions: dict[str, TimerAction] = {}
+
+        self._timers: dict[str, StoredTimer] = {}
+        self._slots: dict[int, dict[str, None]] = {}
+        self._ticks: list[int] = []
+        # Due timers waiting for their action to be registered, by action name.
+        self._parked: dict[str, dict[str, StoredTimer]] = {}
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._running: set[asyncio.Task] = set()
+
+        # Store writes are coalesced, one runs at a time.
+        self._to_save: dict[str, StoredTimer] = {}
+        self._to_remove: set[str] = set()
+        self._save_task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._timers
+
+    def action(self, name: str) -> Callable[[TimerAction], TimerAction]:
+        """Decorator registering an action under `name`."""
+
+        def register(func: TimerAction) -> TimerAction:
+            self.register(name, func)
+            return func
+
+        return register
+
+    def register(self, name: str, func: TimerAction) -> None:
+        self._actions[name] = func
+        if self._task is None:
+            return
+        for timer in self._parked.pop(name, {}).values():
+            self._timers.pop(timer.key, None)
+            self._fire(timer)
+
+    def due(self, key: str) -> float | None:
+        """Unix time the timer fires at, None if there is no such timer."""
+        timer = self._timers.get(key)
+        return timer.due if timer is not None else None
+
+    def _tick(self, due: float) -> int:
+        return math.ceil(due / self._resolution)
+
+    def _add(self, timer: StoredTimer) -> None:
+        self._timers[timer.key] = timer
+        tick = self._tick(timer.due)
+        slot = self._slots.get(tick)
+        if slot is None:
+            slot = self._slots[tick] = {}
+            heapq.heappush(self._ticks, tick)
+            if self._ticks[0] == tick:
+                self._wake.set()
+        slot[timer.key] = None
+
+    def _remove(self, key: str) -> StoredTimer | None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            slot = self._slots.get(self._tick(timer.due))
+            if slot is not None:
+                slot.pop(key, None)
+            self._parked.get(timer.action, {}).pop(key, None)
+        return timer
+
+    def schedule(
+        self, key: str, when: datetime | float, action: str, payload: str | None = None
+    ) -> None:
+        """Run `action(payload)` at `when`, replacing a timer with the same key.
+
+        Args:
+            key: Unique timer key
+            when: Datetime or unix time, times in the past fire on the next wake-up
+            action: Name of a registered action
+            payload: Argument of the action
+        """
+        if action not in self._actions:
+            raise ValueError(f"Unknown action {action!r}")
+        due = when.timestamp() if isinstance(when, datetime) else float(when)
+        self._remove(key)
+        timer = StoredTimer(key, due, action, payload)
+        self._add(timer)
+        self._to_remove.discard(key)
+        self._to_save[key] = timer
+        self._schedule_save()
+
+    def schedule_deal(self, deal: Deal, action: str, *, before: float = 0.0) -> bool:
+        """Run `action(deal.id)` `before` seconds ahead of the deal's status expiration.
+
+        The timer key is `"<action>:<deal id>"`, so scheduling again after the deal
+        changed moves the timer. Returns False if the deal has no expiration date.
+        """
+        key = f"{action}:{deal.id}"
+        if deal.status_expiration_date is None:
+            self.cancel(key)
+            return False
+        self.schedule(key, deal.status_expiration_date.timestamp() - before, action, deal.id)
+        return True
+
+    def cancel(self, key: str) -> bool:
+        """Cancel a pending timer, returns False if there was none."""
+        if self._remove(key) is None:
+            return False
+        self._to_save.pop(key, None)
+        self._to_remove.add(key)
+        self._schedule_save()
+        return True
+
+    def _schedule_save(self) -> None:
+        if self._save_task is None and self._task is not None:
+            self._save_task = asyncio.create_task(self._save())
+
+    async def _save(self) -> None:
+        try:
+            while self._to_save or self._to_remove:
+                timers, self._to_save = list(self._to_save.values()), {}
+                removed, self._to_remove = list(self._to_remove), set()
+                await self._store.save(timers, removed)
+        finally:
+            self._save_task = None
+
+    async def start(self) -> None:
+        """Load saved timers and start firing them."""
+        if self._task is not None:
+            return
+        for timer in await self._store.load():
+            if timer.key not in self._timers:
+                self._add(timer)
+        # Left from before `close()`, they are checked again on the first wake-up.
+        parked, self._parked = self._parked, {}
+        for timers in parked.values():
+            for timer in timers.values():
+                self._add(timer)
+        self._task = asyncio.create_task(self._loop())
+        self._schedule_save()
+
+    async def close(self) -> None:
+        """Stop firing timers, pending ones stay in the store."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        if self._save_task is not None:
+            await self._save_task
+        await self._save()
+        await self._store.close()
+
+    async def _loop(self) -> None:
+        while True:
+            self._wake.clear()
+            now_tick = time.time() / self._resolution
+            while self._ticks and self._ticks[0] <= now_tick:
+                tick = heapq.heappop(self._ticks)
+                for key in self._slots.pop(tick, {}):
+                    timer = self._timers[key]
+                    if timer.action in self._actions:
+                        del self._timers[key]
+                        self._fire(timer)
+                    else:
+                        logger.warning(
+                            "Timer %s waits for action %r to be registered", key, timer.action
+                        )
+                        self._parked.setdefault(timer.action, {})[key] = timer
+
+            timeout = None
+            if self._ticks:
+                timeout = self._ticks[0] * self._resolution - time.time()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except TimeoutError:
+                pass
+
+    def _fire(self, timer: StoredTimer) -> None:
+        task = asyncio.create_task(self._run(timer))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, timer: StoredTimer) -> None:
+        try:
+            async with self._semaphore:
+                await self._actions[timer.action](timer.payload)
+        except Exception:
+            logger.exception("Action of timer %s failed", timer.key)
+        finally:
+            # Removed from the store only once the action ran, so a crash mid-way
+            # fires the timer again on the next start.
+            if timer.key not in self._timers:
+                self._to_save.pop(timer.key, None)
+                self._to_remove.add(timer.key)
+                self._schedule_save()
@@ -0,0 +1,84 @@
+"""Multi-keyword matching with an Aho-Corasick automaton."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+
+class KeywordAutomaton:
+    """Finds every occurrence of many keywords in one pass over the text.
+
+    Matching is case-insensitive and takes time proportional to the text length
+    plus the number of matches, whatever the number of keywords. Each keyword
+    carries a value returned with its matches, e.g. the index of a rule.
+    """
+
+    def __init__(self, keywords: Iterable[tuple[str, int]] = ()) -> None:
+        """Initialize automaton.
+
+        Args:
+            keywords: `(keyword, value)` pairs, empty keywords are ignored
+        """
+        # Node 0 is the root. Per node: transitions, failure link, (length, value) of
+        # keywords ending at the node, and of every keyword reachable by failure links.
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._own: list[list[tuple[int, int]]] = [[]]
+        self._output: list[list[tuple[int, int]]] = [[]]
+        self._built = True
+        for keyword, value in keywords:
+            self.add(keyword, value)
+
+    def add(self, keyword: str, value: int) -> None:
+        keyword = keyword.casefold()
+        if not keyword:
+            return
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append([])
+                self._output.append([])
+                self._goto[node][char] = next_node
+            node = next_node
+        self._own[node].append((len(keyword), value))
+        self._built = False
+
+    def _build(self) -> None:
+        # Breadth-first, so the failure link of a node's parent is final before the node.
+        queue = deque(self._goto[0].values())
+        for node in queue:
+            self._fail[node] = 0
+            self._output[node] = self._own[node]
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._own[child] + self._output[self._fail[child]]
+        self._built = True
+
+    def finditer(self, text: str) -> Iterator[tuple[int, int, int]]:
+        """Yield `(start, end, value)` of every keyword occurrence, by end position.
+
+        Positions refer to `text.casefold()`, which differs from `text` in length only
+        for a few characters such as "ß".
+        """
+        if not self._built:
+            self._build()
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for end, char in enumerate(text.casefold(), 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, value in output[node]:
+                yield end - length, end, value
@@ -0,0 +1,325 @@
+"""Rule-based automatic replies to incoming chat messages."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from ..schemas.enums import ChatMessageDirection
+from .keywords import KeywordAutomaton
+
+if TYPE_CHECKING:
+    from ..entities.chat import ChatMessage
+    from ..playerok import Playerok
+
+
+@dataclass(slots=True)
+class ReplyRule:
+    """Reply sent when an incoming message matches.
+
+    A rule matches when the message contains any of its keywords or matches its
+    pattern. When several rules match, the one with the highest `priority` wins,
+    then the one declared first.
+
+    Attributes:
+        reply: Reply text, or a callable building it from the message (None - no reply)
+        keywords: Case-insensitive keywords
+        pattern: Case-insensitive regular expression, searched anywhere in the text
+        whole_word: Keywords only match between non-word characters
+        priority: Rules with a higher priority are preferred
+        name: Name reported in the stats, the reply text by default
+    """
+
+    reply: str | Callable[[ChatMessage], str | None]
+    keywords: Sequence[str] = ()
+    pattern: str | None = None
+    whole_word: bool = True
+    priority: int = 0
+    name: str | None = None
+
+    def __post_init__(self) -> None:
+        if not self.keywords and self.pattern is None:
+            raise ValueError("Rule needs keywords or a pattern")
+        if self.name is None:
+            self.name = self.reply if isinstance(self.reply, str) else self.reply.__name__
+
+
+@dataclass(slots=True)
+class ResponderStats:
+    """Counters of an auto-responder.
+
+    Attributes:
+        messages: Incoming messages evaluated
+        matched: Messages that matched a rule
+        replied: Replies sent
+        cooldown_skipped: Matches not answered because the chat was cooling down
+        failed: Replies that could not be sent
+        match_seconds: Time spent evaluating rules
+        per_rule: Matches per rule name
+    """
+
+    messages: int = 0
+    matched: int = 0
+    replied: int = 0
+    cooldown_skipped: int = 0
+    failed: int = 0
+    match_seconds: float = 0.0
+    per_rule: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def messages_per_second(self) -> float:
+        """Rule evaluation throughput, sending excluded."""
+        return self.messages / self.match_seconds if self.match_seconds else 0.0
+
+
+def _required_literal(pattern: str) -> str | None:
+    """Longest plain text outside groups that every match of the pattern contains.
+
+    Conservative: None when the pattern has a top-level alternation, or when there
+    is no such text of at least 3 characters.
+    """
+    runs = [""]
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        i += 1
+        literal = None
+        if char == "\\":
+            escaped = pattern[i : i + 1]
+            i += 1
+            if escaped and not escaped.isalnum():  # \d, \b, \1... aren't literal
+                literal = escaped
+            elif escaped in ("x", "u", "U"):
+                i += {"x": 2, "u": 4, "U": 8}[escaped]
+            elif escaped == "N":
+                i = pattern.find("}", i) + 1 or len(pattern)
+            elif escaped.isdigit():
+                while pattern[i : i + 1].isdigit():
+                    i += 1
+        elif char == "[":
+            # A leading "]", after an optional "^", is part of the class.
+            i += pattern.startswith("^", i)
+            i += pattern.startswith("]", i)
+            while i < len(pattern) and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+        elif char == "{":
+            i = pattern.find("}", i) + 1 or len(pattern)
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return None
+        elif char not in ".^$*+?|":
+            literal = char
+
+        following = pattern[i : i + 1]
+        # Text inside groups and characters a quantifier may drop aren't required.
+        if literal is None or depth or following in ("*", "?", "{"):
+            runs.append("")
+            continue
+        runs[-1] += literal
+        if following == "+":
+            # What comes after the repeats isn't adjacent to this run.
+            runs.append("")
+    best = max(runs, key=len)
+    return best if len(best) >= 3 else None
+
+
+class RuleSet:
+    """Rules compiled for matching incoming messages.
+
+    Keywords of every rule go into one Aho-Corasick automaton, so keyword
+    matching costs about the same for ten rules as for thousands. So does a
+    literal that every match of a pattern must contain: the same pass over the
+    text finds the patterns that can match, and only those (plus patterns without
+    such a literal) are searched, in priority order until a better rule matched.
+    Patterns are compiled one per rule, so their own groups and backreferences
+    keep working.
+    """
+
+    def __init__(self, rules: Iterable[ReplyRule]) -> None:
+        # Stable sort: declaration order breaks priority ties.
+        self.rules = sorted(rules, key=lambda rule: -rule.priority)
+        self._automaton = KeywordAutomaton(
+            (keyword, index) for index, rule in enumerate(self.rules) for keyword in rule.keywords
+        )
+        self._patterns: dict[int, re.Pattern] = {}
+        # Patterns without a required literal, searched whenever they could win.
+        self._unfiltered: list[int] = []
+        for index, rule in enumerate(self.rules):
+            if rule.pattern is None:
+                continue
+            pattern = self._patterns[index] = re.compile(rule.pattern, re.IGNORECASE)
+            literal = None if pattern.flags & re.VERBOSE else _required_literal(rule.pattern)
+            if literal is None:
+                self._unfiltered.append(index)
+            else:
+                # Negative values tell pattern literals from keywords.
+                self._automaton.add(literal, ~index)
+
+    def match(self, text: str) -> ReplyRule | None:
+        """Best rule matching the text."""
+        best = len(self.rules)
+        folded = None
+        candidates = set()
+        for start, end, index in self._automaton.finditer(text):
+            if index < 0:
+                candidates.add(~index)
+                continue
+            if index >= best:
+                continue
+            rule = self.rules[index]
+            if rule.whole_word:
+                if folded is None:
+                    folded = text.casefold()
+                if (start and folded[start - 1].isalnum()) or (
+                    end < len(folded) and folded[end].isalnum()
+                ):
+                    continue
+            best = index
+            if best == 0:
+                return self.rules[0]
+
+        if candidates:
+            candidates.update(self._unfiltered)
+            ordered = sorted(candidates)
+        else:
+            ordered = self._unfiltered
+        for index in ordered:
+            if index >= best:
+                break
+            if self._patterns[index].search(text):
+                best = index
+                break
+
+        return self.rules[best] if best < len(self.rules) else None
+
+
+class AutoResponder:
+    """Answers incoming messages by keyword and pattern rules.
+
+    Replies are sent through `client.chats.send_message`. After replying to a chat
+    the responder stays silent there for `cooldown` seconds, so a buyer sending
+    several messages gets one answer.
+    """
+
+    def __init__(
+        self,
+        client: Playerok,
+        rules: Iterable[ReplyRule],
+        *,
+        cooldown: float = 60.0,
+        concurrency: int = 4,
+        mark_as_read: bool = False,
+        max_age: float | None = 600.0,
+    ) -> None:
+        """Initialize responder.
+
+        Args:
+            client: Playerok client
+            rules: Reply rules
+            cooldown: Seconds a chat gets no further replies after one was sent
+            concurrency: Maximum number of replies in flight
+            mark_as_read: Mark the chat as read when replying
+            max_age: Messages older than this many seconds are not answered, e.g. the
+                history fetched by the first sync of a chat (None - answer all)
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self._client = client
+        self._rules = RuleSet(rules)
+        self._cooldown = cooldown
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._mark_as_read = mark_as_read
+        self._max_age = max_age
+        # chat id -> time.monotonic() the chat may be answered again
+        self._quiet_until: dict[str, float] = {}
+        self.stats = ResponderStats()
+
+    def set_rules(self, rules: Iterable[ReplyRule]) -> None:
+        """Replace the rules, cooldowns are kept."""
+        self._rules = RuleSet(rules)
+
+    def match(self, message: ChatMessage) -> ReplyRule | None:
+        """Rule answering the message, None for outgoing and system messages."""
+        if message.direction != ChatMessageDirection.IN or not message.text:
+            return None
+        started = time.perf_counter()
+        rule = self._rules.match(message.text)
+        self.stats.match_seconds += time.perf_counter() - started
+        self.stats.messages += 1
+        if rule is not None:
+            self.stats.matched += 1
+            self.stats.per_rule[rule.name] = self.stats.per_rule.get(rule.name, 0) + 1
+        return rule
+
+    def is_cooling_down(self, chat_id: str) -> bool:
+        return self._quiet_until.get(chat_id, 0.0) > time.monotonic()
+
+    async def handle(self, message: ChatMessage) -> ChatMessage | None:
+        """Reply to the message if a rule matches, returns the sent reply."""
+        rule = self.match(message)
+        if rule is None or message.chat_id is None:
+            return None
+        if self._max_age is not None:
+            age = datetime.now(message.sent_at.tzinfo) - message.sent_at
+            if age.total_seconds() > self._max_age:
+                return None
+        if self.is_cooling_down(message.chat_id):
+            self.stats.cooldown_skipped += 1
+            return None
+
+        text = rule.reply if isinstance(rule.reply, str) else rule.reply(message)
+        if not text:
+            return None
+        # Claimed before sending, so concurrent messages of the chat don't reply too.
+        self._quiet_until[message.chat_id] = time.monotonic() + self._cooldown
+        async with self._semaphore:
+            try:
+                sent = await self._client.chats.send_message(
+                    message.chat_id, text=text, mark_as_read=self._mark_as_read
+                )
+            except Exception:
+                self.stats.failed += 1
+                self._quiet_until.pop(message.chat_id, None)
+                raise
+        self.stats.replied += 1
+        return sent
+
+    async def handle_many(self, messages: Iterable[ChatMessage]) -> list[ChatMessage]:
+        """Reply to a batch of messages, oldest first within a chat.
+
+        Failed replies are counted in `stats.failed` and don't stop the batch.
+        """
+        messages = sorted(messages, key=lambda message: message.sent_at)
+        results = await asyncio.gather(
+            *(self.handle(message) for message in messages), return_exceptions=True
+        )
+        return [
+            result
+            for result in results
+            if result is not None and not isinstance(result, BaseException)
+        ]
+
+    async def poll(self, chat_ids: Iterable[str]) -> list[ChatMessage]:
+        """Sync the chats with `client.chats.messages.sync()` and answer new messages."""
+        synced = await asyncio.gather(
+            *(self._client.chats.messages.sync(chat_id) for chat_id in chat_ids)
+        )
+        return await self.handle_many(message for messages in synced for message in messages)
+
+    async def run(self, chat_ids: Iterable[str], *, interval: float = 5.0) -> None:
+        """Poll the chats every `interval` seconds until cancelled."""
+        chat_ids = list(chat_ids)
+        while True:
+            await self.poll(chat_ids)
+            await asyncio.sleep(interval)
@@ -0,0 +1,344 @@
+"""Per-status handlers for deals, run on a bounded worker pool."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from ..schemas.enums import ItemDealDirections, ItemDealStatuses
+from ..storage.checkpoints import DealCheckpoint
+
+if TYPE_CHECKING:
+    from ..api.deals import DealSyncResult
+    from ..entities.deal import Deal
+    from ..playerok import Playerok
+
+DealHandler = Callable[["Deal"], Awaitable[None]]
+
+# Statuses a deal never leaves, their progress is dropped once a saved sync stops
+# returning the deal.
+_FINAL_STATUSES = frozenset({ItemDealStatuses.CONFIRMED, ItemDealStatuses.ROLLED_BACK})
+
+
+@dataclass(slots=True)
+class _Poll:
+    """Sync whose checkpoint is saved once every deal it queued is finished."""
+
+    result: DealSyncResult
+    remaining: int = 0
+    finished: list[tuple[str, ItemDealStatuses]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _DealEvent:
+    deal: Deal
+    status: ItemDealStatuses
+    observed_at: float
+    attempt: int = 1
+    # Handlers before this one already succeeded, retries start here.
+    next_handler: int = 0
+    poll: _Poll | None = None
+
+
+@dataclass(slots=True)
+class WorkflowStats:
+    """Counters of a deal workflow.
+
+    Attributes:
+        pending: Status changes not finished yet, running ones included
+        in_flight: Handlers currently running
+        started: Status changes whose handlers started at least once
+        handled: Handlers that finished
+        failed: Handlers that raised after the last attempt
+        skipped: Status changes dropped because they were already handled
+        lag_last: Seconds between observing the last started change and its first attempt
+        lag_max: Highest lag seen
+        lag_total: Sum of lags of every started change
+        per_status: Finished handlers per deal status
+    """
+
+    pending: int = 0
+    in_flight: int = 0
+    started: int = 0
+    handled: int = 0
+    failed: int = 0
+    skipped: int = 0
+    lag_last: float = 0.0
+    lag_max: float = 0.0
+    lag_total: float = 0.0
+    per_status: dict[ItemDealStatuses, int] = field(default_factory=dict)
+
+    @property
+    def lag_average(self) -> float:
+        return self.lag_total / self.started if self.started else 0.0
+
+
+class DealWorkflow:
+    """Runs handlers on deal status changes.
+
+    Handlers are registered per status and receive the deal. Changes of different
+    deals are handled concurrently, at most `concurrency` at a time, while changes
+    of one deal are handled strictly in the order they were observed. The last
+    handled status of every open deal is saved to `client`'s deal checkpoint store,
+    so after a restart changes that were already handled are skipped. `poll()` saves
+    its sync checkpoint only once every deal it queued is finished, so changes that
+    were queued but not handled before a crash are returned by the next poll again.
+
+    Example:
+        workflow = DealWorkflow(client)
+
+        @workflow.on(ItemDealStatuses.PAID)
+        async def deliver(deal):
+            await client.chats.send_message(deal.chat_id, text="Here you go")
+            await deal.complete()
+
+        await workflow.run(direction=ItemDealDirections.IN)
+    """
+
+    def __init__(
+        self,
+        client: Playerok,
+        *,
+        name: str = "default",
+        concurrency: int = 8,
+        max_attempts: int = 3,
+        retry_delay: float = 5.0,
+    ) -> None:
+        """Initialize workflow.
+
+        Args:
+            client: Playerok client
+            name: Name of the saved progress, use different names for independent workflows
+            concurrency: Maximum number of handlers running at once
+            max_attempts: Attempts of a failing handler before the change is given up
+            retry_delay: Seconds before a failed handler is retried
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self._client = client
+        self._name = name
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._max_attempts = max(max_attempts, 1)
+        self._retry_delay = retry_delay
+        self._handlers: dict[ItemDealStatuses, list[DealHandler]] = {}
+
+        self._queues: dict[str, deque[_DealEvent]] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+        # Progress is kept as a checkpoint whose `open_deals` hold the last handled
+        # status of every deal a saved sync may still return.
+        self._progress: DealCheckpoint | None = None
+        self._save_task: asyncio.Task | None = None
+        self._dirty = False
+        # Polls in the order they were made, checkpoints are saved in that order.
+        self._polls: deque[_Poll] = deque()
+        self._sync_to_save: DealSyncResult | None = None
+        self._final_unsaved: list[tuple[str, ItemDealStatuses]] = []
+        self._final_saved: list[tuple[str, ItemDealStatuses]] = []
+        self.stats = WorkflowStats()
+
+    @property
+    def _progress_key(self) -> str:
+        return f"workflow:{self._name}:progress"
+
+    def on(self, status: ItemDealStatuses) -> Callable[[DealHandler], DealHandler]:
+        """Decorator registering a handler for deals entering `status`."""
+
+        def register(handler: DealHandler) -> DealHandler:
+            self.add_handler(status, handler)
+            return handler
+
+        return register
+
+    def add_handler(self, status: ItemDealStatuses, handler: DealHandler) -> None:
+        self._handlers.setdefault(status, []).append(handler)
+
+    async def _load_progress(self) -> DealCheckpoint:
+        if self._progress is None:
+            store = self._client._deal_checkpoint_store
+            self._progress = await store.load(self._progress_key) or DealCheckpoint()
+        return self._progress
+
+    def _is_handled(self, deal_id: str, status: ItemDealStatuses) -> bool:
+        if self._progress is not None and self._progress.open_deals.get(deal_id) == status:
+            return True
+        queue = self._queues.get(deal_id)
+        return bool(queue) and queue[-1].status == status
+
+    async def submit(self, deals: Iterable[Deal]) -> int:
+        """Queue status changes of the deals, returns the number queued.
+
+        Deals in a status without handlers, or whose status was already handled,
+        are skipped.
+        """
+        return await self._submit(deals, None)
+
+    async def _submit(self, deals: Iterable[Deal], poll: _Poll | None) -> int:
+        await self._load_progress()
+        now = time.monotonic()
+        queued = 0
+        for deal in deals:
+            status = deal.status
+            if status is None or status not in self._handlers:
+                continue
+            if self._is_handled(deal.id, status):
+                self.stats.skipped += 1
+                continue
+            self._enqueue(_DealEvent(deal, status, now, poll=poll))
+            queued += 1
+        if poll is not None:
+            poll.remaining += queued
+        return queued
+
+    def _enqueue(self, event: _DealEvent) -> None:
+        self._queues.setdefault(event.deal.id, deque()).append(event)
+        self.stats.pending += 1
+        self._idle.clear()
+        if event.deal.id not in self._workers:
+            self._workers[event.deal.id] = asyncio.create_task(self._drain(event.deal.id))
+
+    async def _drain(self, deal_id: str) -> None:
+        queue = self._queues[deal_id]
+        try:
+            while queue:
+                # The event stays at the head while it runs and retries, so later
+                # changes of the deal wait for it.
+                event = queue[0]
+                async with self._semaphore:
+                    if event.attempt == 1:
+                        self._record_lag(time.monotonic() - event.observed_at)
+                    self.stats.in_flight += 1
+                    try:
+                        done = await self._run_handlers(event)
+                    finally:
+                        self.stats.in_flight -= 1
+
+                if not done and event.attempt < self._max_attempts:
+                    event.attempt += 1
+                    await asyncio.sleep(self._retry_delay)
+                    continue
+
+                queue.popleft()
+                self.stats.pending -= 1
+                self.stats.per_status[event.status] = self.stats.per_status.get(event.status, 0) + 1
+                if done:
+                    self.stats.handled += 1
+                    self._progress.open_deals[deal_id] = event.status
+                    self._schedule_save()
+                else:
+                    self.stats.failed += 1
+                if event.poll is not None:
+                    event.poll.remaining -= 1
+                    event.poll.finished.append((deal_id, event.status))
+                    self._release_polls()
+        finally:
+            del self._workers[deal_id]
+            if not queue:
+                del self._queues[deal_id]
+            if not self._workers:
+                self._idle.set()
+
+    async def _run_handlers(self, event: _DealEvent) -> bool:
+        handlers = self._handlers.get(event.status, [])
+        try:
+            while event.next_handler < len(handlers):
+                await handlers[event.next_handler](event.deal)
+                event.next_handler += 1
+        except Exception:
+            return False
+        return True
+
+    def _release_polls(self) -> None:
+        # Only a prefix of finished polls may be saved, an earlier unfinished poll
+        # still needs its deals returned by the next sync after a crash.
+        while self._polls and self._polls[0].remaining == 0:
+            poll = self._polls.popleft()
+            self._sync_to_save = poll.result
+            self._final_unsaved.extend(
+                (deal_id, status) for deal_id, status in poll.finished if status in _FINAL_STATUSES
+            )
+            self._schedule_save()
+
+    def _prune_progress(self) -> None:
+        # Called before a sync: it starts from a saved checkpoint that no longer
+        # returns these deals, so their progress isn't needed to skip them.
+        for deal_id, status in self._final_saved:
+            if self._progress.open_deals.get(deal_id) == status:
+                del self._progress.open_deals[deal_id]
+                self._dirty = True
+        self._final_saved.clear()
+        if self._dirty:
+            self._schedule_save()
+
+    def _record_lag(self, lag: float) -> None:
+        self.stats.started += 1
+        self.stats.lag_last = lag
+        self.stats.lag_max = max(self.stats.lag_max, lag)
+        self.stats.lag_total += lag
+
+    def _schedule_save(self) -> None:
+        # Saves are coalesced: while one runs, later progress is written by the next one.
+        self._dirty = True
+        if self._save_task is None:
+            self._save_task = asyncio.create_task(self._save())
+
+    async def _save(self) -> None:
+        try:
+            while self._dirty:
+                self._dirty = False
+                sync, self._sync_to_save = self._sync_to_save, None
+                final, self._final_unsaved = self._final_unsaved, []
+                # Every deal of a released sync is finished, so saving it before the
+                # progress can't lose a change if the process dies in between.
+                if sync is not None:
+                    await self._client.deals.save_sync(sync)
+                    self._final_saved.extend(final)
+                await self._client._deal_checkpoint_store.save(self._progress_key, self._progress)
+        finally:
+            self._save_task = None
+
+    async def join(self) -> None:
+        """Wait until every queued change is handled and the progress is saved."""
+        await self._idle.wait()
+        if self._save_task is not None:
+            await self._save_task
+
+    async def poll(self, *, direction: ItemDealDirections | None = None) -> int:
+        """Queue deals created or changed since the previous poll, see `DealAPI.sync()`.
+
+        The sync checkpoint is saved once the queued deals are finished (handled or
+        given up), until then later polls return them again and they are skipped.
+        """
+        await self._load_progress()
+        self._prune_progress()
+        result = await self._client.deals.sync(
+            direction=direction, key=f"workflow:{self._name}:{direction or 'ALL'}", save=False
+        )
+        poll = _Poll(result)
+        self._polls.append(poll)
+        queued = await self._submit(result.new + result.changed, poll)
+        self._release_polls()
+        return queued
+
+    async def run(
+        self, *, direction: ItemDealDirections | None = None, interval: float = 10.0
+    ) -> None:
+        """Poll deals every `interval` seconds until cancelled."""
+        try:
+            while True:
+                await self.poll(direction=direction)
+                await asyncio.sleep(interval)
+        finally:
+            workers = list(self._workers.values())
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if self._save_task is not None:
+                await self._save_task
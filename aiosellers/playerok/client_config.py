@@ -3,6 +3,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .storage import DealCheckpointStore, MessageStore, Outbox, SearchIndex
 
 
 @dataclass
@@ -15,6 +19,33 @@ class PlayerokClientConfig:
         request_timeout: Request timeout in seconds
         base_url: Base URL for PlayerOK API
         use_identity_map: Enable identity map for maintaining object identity
+        mmap_attachments: Memory-map local attachment files instead of reading them into memory
+        intern_strings: Intern repeated strings of decoded responses (usernames, avatar URLs,
+            category and obtaining type ids, statuses) to save memory on large payloads
+        send_queue_concurrency: Maximum number of chats `client.chats.queue` sends to at once
+        send_queue_max_pending: Maximum number of messages waiting in `client.chats.queue`
+            (0 - unbounded)
+        read_state_ttl: Seconds a chat stays known as read, redundant `mark_as_read`
+            mutations are skipped meanwhile (None - until an unread message is seen)
+        loader_batch_size: Maximum number of entity lookups by id sent concurrently
+            when several are requested in the same event loop iteration
+        priority_status_ttl: Seconds priority statuses of a price tier are reused
+            before they are requested again (None - forever)
+        chat_deals_max_age: Seconds deals received together with a chat are reused
+            by `Chat.get_deals()` before the chat is fetched again
+        inventory_full_refresh_interval: Seconds after which `client.inventory.refresh()`
+            walks every page again instead of stopping at an unchanged one (None - only
+            when asked for)
+        index_ttl: Seconds a full scan is trusted to have found every deal of an item
+            or chat with a user, after that lookups scan again (None - forever)
+        message_store: Store for messages synced by `client.chats.messages.sync()`
+            (in-memory by default)
+        deal_checkpoint_store: Store for checkpoints of `client.deals.sync()`
+            (in-memory by default)
+        search_index: Full-text index fed with own listings and chat messages as they
+            are decoded, queried with `client.search` (disabled by default)
+        outbox: Durable log of idempotent raw mutations, pending ones are sent again
+            on `start()` after a crash (disabled by default)
     """
 
     access_token: str | None = None
@@ -22,3 +53,17 @@ class PlayerokClientConfig:
     request_timeout: float = 10.0
     base_url: str = "https://playerok.com/"
     use_identity_map: bool = True
+    mmap_attachments: bool = False
+    intern_strings: bool = False
+    send_queue_concurrency: int = 8
+    send_queue_max_pending: int = 0
+    read_state_ttl: float | None = 30.0
+    loader_batch_size: int = 16
+    priority_status_ttl: float | None = 300.0
+    chat_deals_max_age: float = 60.0
+    inventory_full_refresh_interval: float | None = 600.0
+    index_ttl: float | None = 300.0
+    message_store: MessageStore | None = None
+    deal_checkpoint_store: DealCheckpointStore | None = None
+    search_index: SearchIndex | None = None
+    outbox: Outbox | None = None
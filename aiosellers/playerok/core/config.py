@@ -11,10 +11,14 @@ class PlayerokConfig:
         user_agent: str | None = None,
         request_timeout: float | None = None,
         base_url: str | None = None,
+        mmap_attachments: bool = False,
+        intern_strings: bool = False,
     ):
         self.user_agent = user_agent or random.choice(EXAMPLE_USER_AGENTS)
         self.request_timeout = request_timeout or 10.0
         self.base_url = base_url or os.getenv("PLAYEROK_BASE_URL", "https://playerok.com/")
+        self.mmap_attachments = mmap_attachments
+        self.intern_strings = intern_strings
 
     @property
     def headers(self):
@@ -0,0 +1,102 @@
+"""Per-tick batching loader for entity lookups by id."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """
+    DataLoader-style batching helper.
+
+    Every `load()` issued during the same event loop iteration is collected,
+    duplicated keys are merged, and the distinct keys are resolved with a single
+    `batch_fn` call (split into chunks of `max_batch_size`). Walking a hundred deals
+    to their buyers with `asyncio.gather` therefore costs one batch instead of
+    a hundred sequential lookups. A key resolved to an exception fails only the
+    callers of that key.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[K]], Awaitable[dict[K, V | BaseException | None]]],
+        *,
+        cache_lookup: Callable[[K], V | None] | None = None,
+        max_batch_size: int = 16,
+    ) -> None:
+        """Initialize loader.
+
+        Args:
+            batch_fn: Resolves a list of keys into a mapping key -> value or the
+                exception the lookup of that key raised. Missing keys resolve to None.
+            cache_lookup: Checked before scheduling a key, e.g. an identity map lookup
+            max_batch_size: Maximum number of keys passed to one `batch_fn` call
+        """
+        self._batch_fn = batch_fn
+        self._cache_lookup = cache_lookup
+        self._max_batch_size = max(1, max_batch_size)
+        self._pending: dict[K, asyncio.Future] = {}
+        self._queue: list[K] = []
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V | None:
+        if self._cache_lookup is not None:
+            cached = self._cache_lookup(key)
+            if cached is not None:
+                return cached
+
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if not self._queue:
+                loop.call_soon(self._dispatch)
+            self._queue.append(key)
+
+        # Shielded so one cancelled caller doesn't cancel the lookup for everyone else.
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[K]) -> list[V | None]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        task = asyncio.ensure_future(self._resolve(keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, keys: list[K]) -> None:
+        for start in range(0, len(keys), self._max_batch_size):
+            chunk = keys[start : start + self._max_batch_size]
+            try:
+                values = await self._batch_fn(chunk)
+            except asyncio.CancelledError:
+                for key in keys[start:]:
+                    self._pending.pop(key).cancel()
+                raise
+            except Exception as exc:
+                for key in chunk:
+                    future = self._pending.pop(key)
+                    if not future.done():
+                        future.set_exception(exc)
+                        future.exception()  # don't warn if every caller went away
+                continue
+
+            for key in chunk:
+                future = self._pending.pop(key)
+                value = values.get(key)
+                if future.done():
+                    continue
+                if isinstance(value, asyncio.CancelledError):
+                    future.cancel()
+                elif isinstance(value, BaseException):
+                    future.set_exception(value)
+                    future.exception()
+                else:
+                    future.set_result(value)
@@ -0,0 +1,73 @@
+"""Secondary indexes between related entities."""
+
+from __future__ import annotations
+
+import time
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=str)
+V = TypeVar("V", bound=str)
+
+
+class SecondaryIndex(Generic[K, V]):
+    """
+    One-to-many index from a related entity id to entity ids.
+
+    The index is filled as entities are decoded, so a key may only know part of
+    its values. A key is complete once a scan has seen every entity, after that
+    a missing key means there are no values at all. Other parties keep creating
+    entities, so completeness expires after `ttl` seconds (None - never).
+    """
+
+    def __init__(self, ttl: float | None = None) -> None:
+        self._ttl = ttl
+        self._items: dict[K, dict[V, None]] = {}
+        # key -> time.monotonic() it was marked complete
+        self._complete: dict[K, float] = {}
+        self._all_complete_at: float | None = None
+
+    def add(self, key: K | None, value: V) -> None:
+        """Add value to the key, None keys are ignored."""
+        if key is not None:
+            self._items.setdefault(key, {})[value] = None
+
+    def get(self, key: K) -> list[V]:
+        """Get known values of the key in the order they were added."""
+        values = self._items.get(key)
+        return list(values) if values else []
+
+    def _is_fresh(self, marked_at: float | None) -> bool:
+        if marked_at is None:
+            return False
+        return self._ttl is None or time.monotonic() - marked_at < self._ttl
+
+    def is_complete(self, key: K) -> bool:
+        """Whether every value of the key is known."""
+        return self._is_fresh(self._all_complete_at) or self._is_fresh(self._complete.get(key))
+
+    def mark_complete(self, key: K) -> None:
+        self._complete[key] = time.monotonic()
+
+    def mark_all_complete(self) -> None:
+        """Mark every key complete after a scan over all entities."""
+        self._all_complete_at = time.monotonic()
+
+    def invalidate(self, key: K | None = None) -> None:
+        """Forget that the key (every key when None) is complete, known values are kept."""
+        if key is None:
+            self._complete.clear()
+            self._all_complete_at = None
+        else:
+            self._complete.pop(key, None)
+
+    def clear(self) -> None:
+        """Clear all items."""
+        self._items.clear()
+        self._complete.clear()
+        self._all_complete_at = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._items
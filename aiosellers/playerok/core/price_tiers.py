@@ -0,0 +1,61 @@
+"""Cache of item priority statuses by category and price tier."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..schemas.items import ItemPriorityStatus
+
+
+class PriceTierCache:
+    """
+    Remembers priority statuses offered for item prices.
+
+    Statuses come with the price range they apply to, so one lookup answers
+    every item of the same scope (category) priced within the same tier until
+    `ttl` seconds pass. Different scopes offer different statuses, their tiers
+    are kept apart.
+    """
+
+    def __init__(self, ttl: float | None = 300.0) -> None:
+        self._ttl = ttl
+        self._tiers: dict[str, list[tuple[int, int | None, float, list[ItemPriorityStatus]]]] = {}
+
+    def get(self, scope: str, price: int) -> list[ItemPriorityStatus] | None:
+        """Get statuses of the tier containing the price, None if unknown or expired."""
+        tiers = self._tiers.get(scope, [])
+        now = time.monotonic()
+        for low, high, stored_at, statuses in tiers:
+            if low <= price and (high is None or price <= high):
+                if self._ttl is not None and now - stored_at > self._ttl:
+                    self._tiers[scope] = [tier for tier in tiers if tier[2] != stored_at]
+                    return None
+                return statuses
+        return None
+
+    def put(self, scope: str, price: int, statuses: list[ItemPriorityStatus]) -> None:
+        """Remember statuses returned for the price."""
+        if not statuses:
+            return
+        # The tier is where the ranges of every returned status overlap.
+        lows = [s.price_range.min for s in statuses if s.price_range.min is not None]
+        highs = [s.price_range.max for s in statuses if s.price_range.max is not None]
+        low = max(lows, default=price)
+        high = min(highs, default=None)
+        if low > price or (high is not None and high < price):
+            # Ranges that don't contain the price can't be trusted for other prices.
+            low, high = price, price
+
+        # Drop tiers overlapping the new one.
+        tiers = [
+            tier
+            for tier in self._tiers.get(scope, [])
+            if (tier[1] is not None and tier[1] < low) or (high is not None and tier[0] > high)
+        ]
+        tiers.append((low, high, time.monotonic(), statuses))
+        self._tiers[scope] = tiers
+
+    def clear(self) -> None:
+        self._tiers.clear()
@@ -0,0 +1,54 @@
+"""Per-chat read state used to skip redundant markChatAsRead mutations."""
+
+from __future__ import annotations
+
+import time
+
+
+class ReadStateTracker:
+    """
+    Remembers which chats are known to be read.
+
+    A chat is considered read after it was marked as read by us or reported with
+    zero unread messages, and until an unread incoming message is observed or
+    `ttl` seconds pass (new messages may arrive without us seeing them).
+    """
+
+    def __init__(self, ttl: float | None = 30.0) -> None:
+        self._ttl = ttl
+        self._read_at: dict[str, float] = {}
+        self._deferred: set[str] = set()
+
+    def is_read(self, chat_id: str) -> bool:
+        """Check whether the chat is known to be read."""
+        read_at = self._read_at.get(chat_id)
+        if read_at is None:
+            return False
+        if self._ttl is not None and time.monotonic() - read_at > self._ttl:
+            del self._read_at[chat_id]
+            return False
+        return True
+
+    def mark_read(self, chat_id: str) -> None:
+        self._read_at[chat_id] = time.monotonic()
+        self._deferred.discard(chat_id)
+
+    def mark_unread(self, chat_id: str) -> None:
+        self._read_at.pop(chat_id, None)
+
+    def defer(self, chat_id: str) -> None:
+        """Remember that the chat should be marked as read on the next flush."""
+        self._deferred.add(chat_id)
+
+    def take_deferred(self) -> list[str]:
+        """Return and forget chats waiting to be marked as read."""
+        chat_ids = list(self._deferred)
+        self._deferred.clear()
+        return chat_ids
+
+    def clear(self) -> None:
+        self._read_at.clear()
+        self._deferred.clear()
+
+    def __len__(self) -> int:
+        return len(self._read_at)
@@ -0,0 +1,4 @@
+from io import BytesIO
+from pathlib import Path
+
+ImageInput = str | Path | bytes | BytesIO
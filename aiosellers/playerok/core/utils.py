@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+import io
+import mmap
+import os
+import sys
 from collections.abc import Iterable
 from io import BytesIO
 from pathlib import Path
@@ -18,6 +23,70 @@ def _dig(obj: dict[str, Any], path: Iterable[str]) -> Any:
     return cur
 
 
+def _check_include(include: str | Iterable[str], allowed: frozenset[str]) -> frozenset[str]:
+    """Validate `include=` argument of list/iter methods, a single name is accepted too."""
+    include = frozenset((include,) if isinstance(include, str) else include)
+    unknown = include - allowed
+    if unknown:
+        raise ValueError(
+            f"Unknown include: {', '.join(sorted(unknown))}. Allowed: {', '.join(sorted(allowed))}"
+        )
+    return include
+
+
+# Response keys whose values repeat across entities: usernames, avatars, enum values.
+_INTERNED_KEYS = frozenset(
+    {
+        "__typename",
+        "username",
+        "avatarURL",
+        "role",
+        "status",
+        "statusDescription",
+        "type",
+        "priority",
+        "sellerType",
+        "direction",
+        "event",
+    }
+)
+# Objects whose `id` repeats across entities: categories, obtaining types, games, users
+# (chat members come as `participants`, `owner` and `agent`).
+_INTERNED_ID_PARENTS = frozenset(
+    {
+        "category",
+        "obtainingType",
+        "game",
+        "user",
+        "participants",
+        "owner",
+        "agent",
+        "buyer",
+        "seller",
+        "eventByUser",
+    }
+)
+
+
+def _intern_strings(obj: Any, parent: str | None = None) -> None:
+    """Intern low-cardinality strings of a decoded response in place.
+
+    Pydantic keeps `str` instances as is, so entities decoded from the payload share
+    one copy of every repeated username, avatar URL, category id and status.
+    """
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if isinstance(value, str):
+                if key in _INTERNED_KEYS or (key == "id" and parent in _INTERNED_ID_PARENTS):
+                    obj[key] = sys.intern(value)
+            elif isinstance(value, dict | list):
+                _intern_strings(value, key)
+    elif isinstance(obj, list):
+        for value in obj:
+            if isinstance(value, dict | list):
+                _intern_strings(value, parent)
+
+
 def _raise_on_gql_errors(payload: dict[str, Any]) -> None:
     errors = payload.get("errors")
     if errors:
@@ -28,7 +97,79 @@ def _raise_on_gql_errors(payload: dict[str, Any]) -> None:
         raise GraphQLError(errors)
 
 
-async def prepare_image_file(image: ImageInput) -> tuple[Any, bool]:
+class _LocalFile(io.RawIOBase):
+    """Read-only raw stream over a file already loaded into memory or memory-mapped.
+
+    Wrapped into ``io.BufferedReader`` it looks like a regular ``open(path, "rb")`` handle,
+    so multipart encoders still pick up the file name and content type, but reading it
+    never touches the disk from the event loop.
+    """
+
+    def __init__(self, name: str, data: bytes | mmap.mmap) -> None:
+        super().__init__()
+        self.name = name
+        self.mode = "rb"
+        self._data = data
+        self._view = memoryview(data)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._pos : self._pos + len(buffer)]
+        size = len(chunk)
+        buffer[:size] = chunk
+        self._pos += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        self._pos = max(0, pos)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+            if isinstance(self._data, mmap.mmap):
+                self._data.close()
+        super().close()
+
+
+def _load_local_file(path: str, use_mmap: bool) -> io.BufferedReader:
+    # Runs in a worker thread: everything that may block on the disk happens here.
+    with open(path, "rb") as f:
+        if use_mmap and os.fstat(f.fileno()).st_size > 0:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(mmap, "MADV_WILLNEED"):
+                data.madvise(mmap.MADV_WILLNEED)
+        else:
+            data = f.read()
+    return io.BufferedReader(_LocalFile(path, data))
+
+
+async def prepare_image_file(image: ImageInput, *, use_mmap: bool = False) -> tuple[Any, bool]:
+    """Turn an image input into a file object suitable for multipart upload.
+
+    Local files are read in a worker thread (or memory-mapped when ``use_mmap`` is set),
+    so a slow disk never stalls the event loop.
+
+    Returns:
+        Tuple of (file object, whether the caller must close it).
+    """
     from tls_requests import AsyncClient
 
     if isinstance(image, BytesIO):
@@ -53,7 +194,7 @@ async def prepare_image_file(image: ImageInput) -> tuple[Any, bool]:
                     content = getattr(response, "text", "").encode()
                 return BytesIO(content), False
         else:
-            file_obj = open(image, "rb")
+            file_obj = await asyncio.to_thread(_load_local_file, image, use_mmap)
             return file_obj, True
 
     raise TypeError(f"Unsupported image type: {type(image)}")
@@ -37,6 +37,10 @@ class Chat:
     name: str | None = None
 
     _client: Playerok | None = field(default=None, repr=False, init=False, compare=False)
+    # Deal summaries received together with the chat, turned into `_deals` on first use.
+    _deal_schemas: list | None = field(default=None, repr=False, init=False, compare=False)
+    _deals: list[Deal] | None = field(default=None, repr=False, init=False, compare=False)
+    _deals_fetched_at: float = field(default=0.0, repr=False, init=False, compare=False)
 
     def _require_client(self) -> Playerok:
         if self._client is None:
@@ -62,6 +66,9 @@ class Chat:
     async def get_messages(self, limit: int = 50) -> list[ChatMessage]:
         return await self._require_client().chats.messages.list(self.id, limit=limit)
 
+    async def sync_messages(self) -> list[ChatMessage]:
+        return await self._require_client().chats.messages.sync(self.id)
+
     async def iter_messages(self) -> AsyncIterator[ChatMessage]:
         return await self._require_client().chats.messages.iter(self.id)
 
@@ -70,28 +77,14 @@ class Chat:
             return None
         return await self._require_client().account.get_user(self.user_id)
 
-    async def get_deals(self) -> list[Deal]:
-        from .deal import Deal
-
-        client = self._require_client()
-        schema = await client._raw.chats.get_chat(self.id)
-        if schema is None or not schema.deals:
-            return []
-
-        deals = []
-        for deal_schema in schema.deals:
-            deal = Deal(
-                id=deal_schema.id,
-                status=deal_schema.status,
-                user_id=deal_schema.user.id if deal_schema.user else None,
-                chat_id=self.id,
-            )
-            deal._client = client
-            if client._use_identity_map:
-                client._identity_maps.deals.set(deal_schema.id, deal)
-            deals.append(deal)
+    async def get_deals(self, *, max_age: float | None = None) -> list[Deal]:
+        """Get deals of this chat.
 
-        return deals
+        Deals received together with the chat are reused while they are younger than
+        `max_age` seconds (`PlayerokClientConfig.chat_deals_max_age` by default).
+        """
+        deals = await self._require_client().chats.get_deals_for([self], max_age=max_age)
+        return deals[self.id]
 
     async def refresh(self) -> Chat:
         return await self._require_client().chats.get(self.id, force_refresh=True)
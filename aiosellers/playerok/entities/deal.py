@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from datetime import datetime
 from typing import TYPE_CHECKING
 
 from ..schemas.enums import ItemDealStatuses
@@ -19,8 +20,12 @@ class Deal:
     user_id: str | None = None
     chat_id: str | None = None
     item_id: str | None = None
+    status_expiration_date: datetime | None = None
+    created_at: datetime | None = None
 
     _client: Playerok | None = field(default=None, repr=False, init=False, compare=False)
+    # Built from a mutation result, related ids may still be missing.
+    _partial: bool = field(default=False, repr=False, init=False, compare=False)
 
     def _require_client(self) -> Playerok:
         if self._client is None:
@@ -42,15 +47,22 @@ class Deal:
         """Mark SENT work as COMPLETED, ask for confirmation (for seller)"""
         return await self._require_client().deals.complete(self.id)
 
+    async def _loaded(self) -> Deal:
+        if self._partial:
+            return await self.refresh() or self
+        return self
+
     async def get_chat(self) -> Chat | None:
-        if not self.chat_id:
+        deal = await self._loaded()
+        if not deal.chat_id:
             return None
-        return await self._require_client().chats.get(self.chat_id)
+        return await self._require_client().chats.get(deal.chat_id)
 
     async def get_user(self) -> User | None:
-        if not self.user_id:
+        deal = await self._loaded()
+        if not deal.user_id:
             return None
-        return await self._require_client().account.get_user(self.user_id)
+        return await self._require_client().account.get_user(deal.user_id)
 
     async def get_item(self) -> Item | None:
         if not self.item_id:
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from ..schemas.enums import ItemStatuses, PriorityTypes
 
@@ -61,12 +62,7 @@ class Item:
         return await self._require_client().games.get(id=self.game_id)
 
     async def get_deals(self, limit: int = 24) -> list:
-        from .deal import Deal  # noqa: F401
-
-        return await self._require_client().deals.list(
-            limit=limit,
-            item_id=self.id,
-        )
+        return await self._require_client().deals.get_by_item(self.id, limit=limit)
 
     async def get_obtaining_fields(self) -> list:
         """Get OBTAINING_DATA fields for buying this item.
@@ -115,6 +111,10 @@ class Item:
         )
 
 
+# Fields sent by `MyItem.save()` when they differ from the last known server values.
+EDITABLE_FIELDS = ("name", "price", "description")
+
+
 @dataclass(slots=True)
 class MyItem(Item):
     prev_price: int | None = None
@@ -123,6 +123,55 @@ class MyItem(Item):
     is_editable: bool | None = None
     buyer: object | None = None  # UserProfile | None
 
+    # Last known server state: editable fields, option slug -> value, data field id -> value.
+    _saved: dict[str, Any] = field(default_factory=dict, repr=False, init=False, compare=False)
+    _saved_options: dict[str, str] = field(
+        default_factory=dict, repr=False, init=False, compare=False
+    )
+    _saved_data_fields: dict[str, str] = field(
+        default_factory=dict, repr=False, init=False, compare=False
+    )
+
+    def _mark_saved(self, names: Iterable[str] = EDITABLE_FIELDS) -> None:
+        for name in names:
+            if name in EDITABLE_FIELDS:
+                self._saved[name] = getattr(self, name)
+
+    def changes(self) -> dict[str, Any]:
+        """Editable fields changed locally since the listing was loaded or saved."""
+        changes = {}
+        for name in EDITABLE_FIELDS:
+            value = getattr(self, name)
+            if value is not None and value != self._saved.get(name):
+                changes[name] = value
+        return changes
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self.changes())
+
+    async def save(
+        self,
+        *,
+        options: dict[str, str] | list | None = None,
+        data_fields: dict[str, str] | list | None = None,
+    ) -> MyItem:
+        """Send local changes with one `updateItem`.
+
+        Only edited fields (name, price, description) and selections that differ
+        from the ones last saved for this listing are sent, nothing is sent when
+        nothing changed. Listing payloads carry no data field values, so the first
+        save of a listing in this process sends every passed data field.
+
+        Example:
+            item.price = 150
+            options[0].set_value("eu")
+            await item.save(options=options)
+        """
+        return await self._require_client().items.save(
+            self, options=options, data_fields=data_fields
+        )
+
     async def update(
         self,
         *,
@@ -52,8 +52,7 @@ class User:
         return await self._require_client().account.get_user(self.id, force_refresh=True)
 
     async def get_chat(self) -> Chat | None:
-        chats = await self._require_client().chats.list(user_id=self.id, limit=1)
-        return chats[0] if chats else None
+        return await self._require_client().chats.get_by_user(self.id)
 
     async def get_deals(self, limit: int = 24) -> list[Deal]:
         return await self._require_client().deals.list(user_id=self.id, limit=limit)
@@ -0,0 +1,40 @@
+"""Market analysis over category listings."""
+
+from .boost import BoostPlan, BoostResult, BoostScheduler
+from .diff import ChangeKind, ItemChange, MarketDiffer, content_hash
+from .repricing import (
+    Ceiling,
+    Floor,
+    PriceChange,
+    Repricer,
+    RepricingResult,
+    RepricingStrategy,
+    TargetRank,
+    Undercut,
+)
+from .scan import PriceWindow, ScanStats, ShardedScanner
+from .snapshot import MarketSnapshot, PriceStats, SnapshotBuilder
+
+__all__ = [
+    "BoostPlan",
+    "BoostResult",
+    "BoostScheduler",
+    "Ceiling",
+    "ChangeKind",
+    "Floor",
+    "ItemChange",
+    "MarketDiffer",
+    "MarketSnapshot",
+    "PriceChange",
+    "PriceStats",
+    "PriceWindow",
+    "Repricer",
+    "RepricingResult",
+    "RepricingStrategy",
+    "ScanStats",
+    "ShardedScanner",
+    "SnapshotBuilder",
+    "TargetRank",
+    "Undercut",
+    "content_hash",
+]
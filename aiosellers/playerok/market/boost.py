@@ -0,0 +1,187 @@
+"""Planned priority purchases for own listings."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from ..schemas.enums import ItemStatuses
+
+if TYPE_CHECKING:
+    from ..entities.item import MyItem
+    from ..playerok import Playerok
+    from ..schemas.items import ItemPriorityStatus
+
+
+@dataclass(slots=True)
+class BoostPlan:
+    """Priority purchase planned for a listing.
+
+    Attributes:
+        item_id: Item id
+        status: Priority status to buy
+        position: Position of the listing when the plan was made
+    """
+
+    item_id: str
+    status: ItemPriorityStatus
+    position: int | None = None
+
+    @property
+    def cost(self) -> int:
+        return self.status.price
+
+
+@dataclass(slots=True)
+class BoostResult:
+    """Outcome of executed boost plans.
+
+    Attributes:
+        boosted: Plans that were bought
+        failed: Errors of the plans that could not be bought, by item id
+        spent: Total cost of the bought plans
+    """
+
+    boosted: list[BoostPlan] = field(default_factory=list)
+    failed: dict[str, Exception] = field(default_factory=dict)
+    spent: int = 0
+
+
+class BoostScheduler:
+    """Plans and buys priority statuses for own listings.
+
+    Listings below `target_position` that have no active boost are boosted, the
+    ones furthest from the top first, while the cost fits into `budget`. Statuses
+    are looked up once per price tier (see `PlayerokClientConfig.priority_status_ttl`)
+    instead of once per listing, and purchases are sent in batches of `batch_size`
+    spaced by `interval` seconds.
+    """
+
+    def __init__(
+        self,
+        client: Playerok,
+        *,
+        budget: int,
+        target_position: int = 1,
+        premium: bool = True,
+        batch_size: int = 10,
+        interval: float = 0.0,
+        concurrency: int = 4,
+        period_unit: float | None = None,
+    ) -> None:
+        """Initialize scheduler.
+
+        Args:
+            client: Playerok client
+            budget: Maximum total cost of one plan
+            target_position: Listings at this position or higher are not boosted
+            premium: Buy the premium status instead of the normal one
+            batch_size: Purchases sent together
+            interval: Seconds between batches
+            concurrency: Maximum number of requests in flight
+            period_unit: Seconds in one unit of `ItemPriorityStatus.period`, used to
+                tell when a bought status runs out. None - a listing is boosted at
+                most once by this scheduler, budget is never spent on a listing
+                whose status may still be running
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self._client = client
+        self._budget = budget
+        self._target_position = target_position
+        self._premium = premium
+        self._batch_size = max(batch_size, 1)
+        self._interval = interval
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._period_unit = period_unit
+        # item id -> time.time() the bought status expires at
+        self._active_until: dict[str, float] = {}
+
+    def is_active(self, item_id: str) -> bool:
+        """Whether a status bought by this scheduler is still running for the item."""
+        return self._active_until.get(item_id, 0.0) > time.time()
+
+    def _needs_boost(self, item: MyItem) -> bool:
+        if item.price is None or self.is_active(item.id):
+            return False
+        if item.status is not None and item.status != ItemStatuses.APPROVED:
+            return False
+        return item.priority_position is None or item.priority_position > self._target_position
+
+    async def plan(self, items: Iterable[MyItem] | None = None) -> list[BoostPlan]:
+        """Choose listings to boost within the budget.
+
+        Args:
+            items: Listings to consider, all own listings by default
+        """
+        if items is None:
+            items = [item async for item in self._client.items.iter_self()]
+
+        candidates = [item for item in items if self._needs_boost(item)]
+        candidates.sort(key=lambda item: -(item.priority_position or 1 << 30))
+
+        # Statuses of a price tier are requested once, other prices of the tier
+        # are answered by the cache.
+        plans = []
+        spent = 0
+        for item in candidates:
+            statuses = await self._client.items._get_priority_statuses(
+                item.id, item.price, item.category_id
+            )
+            if not statuses:
+                continue
+            status = statuses[0] if self._premium else statuses[-1]
+            if spent + status.price > self._budget:
+                continue
+            spent += status.price
+            plans.append(BoostPlan(item.id, status, item.priority_position))
+        return plans
+
+    async def execute(
+        self, plans: Sequence[BoostPlan], *, start_at: datetime | None = None
+    ) -> BoostResult:
+        """Buy planned statuses in timed batches.
+
+        Args:
+            plans: Plans from `plan()`
+            start_at: Wait until this time before the first batch, e.g. peak hours
+        """
+        if start_at is not None:
+            delay = start_at.timestamp() - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        result = BoostResult()
+
+        async def buy(plan: BoostPlan) -> None:
+            async with self._semaphore:
+                try:
+                    await self._client.items._buy_priority(plan.item_id, plan.status)
+                except Exception as exc:
+                    result.failed[plan.item_id] = exc
+                    return
+            if self._period_unit is None:
+                self._active_until[plan.item_id] = math.inf
+            else:
+                expires_at = time.time() + plan.status.period * self._period_unit
+                self._active_until[plan.item_id] = expires_at
+            result.boosted.append(plan)
+            result.spent += plan.cost
+
+        for start in range(0, len(plans), self._batch_size):
+            if start and self._interval:
+                await asyncio.sleep(self._interval)
+            await asyncio.gather(*(buy(plan) for plan in plans[start : start + self._batch_size]))
+        return result
+
+    async def run(
+        self, items: Iterable[MyItem] | None = None, *, start_at: datetime | None = None
+    ) -> BoostResult:
+        """Plan and execute boosts in one go."""
+        return await self.execute(await self.plan(items), start_at=start_at)
@@ -0,0 +1,93 @@
+"""Change detection between successive scans of a category."""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..schemas.items import Item as ItemSchema
+
+
+class ChangeKind(StrEnum):
+    ADDED = "ADDED"
+    CHANGED = "CHANGED"
+    REMOVED = "REMOVED"
+
+
+@dataclass(slots=True)
+class ItemChange:
+    """Listing that appeared, changed or disappeared since the previous scan.
+
+    Attributes:
+        kind: Kind of the change
+        item_id: Item id
+        item: Current payload, None for removed listings
+    """
+
+    kind: ChangeKind
+    item_id: str
+    item: ItemSchema | None = None
+
+
+def content_hash(schema: ItemSchema) -> int:
+    """64-bit hash of the fields a repricing decision depends on.
+
+    Stable across processes, so fingerprints can be persisted between runs.
+    """
+    content = f"{schema.price}\x1f{schema.status}\x1f{schema.priority}\x1f{schema.name}"
+    return int.from_bytes(hashlib.blake2b(content.encode(), digest_size=8).digest())
+
+
+class MarketDiffer:
+    """Compares listings of a scan with the previous scan of the same query.
+
+    Only an `id -> content hash` mapping is kept between scans. Listings are fed
+    one by one while the scan runs, added and changed ones are reported immediately,
+    removed ones when the scan is finished.
+    """
+
+    def __init__(self, fingerprints: dict[str, int] | None = None) -> None:
+        """Initialize differ.
+
+        Args:
+            fingerprints: Fingerprints of the previous scan, see `fingerprints`.
+                Without them every listing of the first scan is reported as added.
+        """
+        self._previous: dict[str, int] = dict(fingerprints or {})
+        self._current: dict[str, int] = {}
+
+    @property
+    def fingerprints(self) -> dict[str, int]:
+        """`id -> content hash` of the last finished scan."""
+        return self._previous
+
+    def update(self, schema: ItemSchema) -> ItemChange | None:
+        """Feed a listing of the running scan, returns the change if there is one."""
+        if schema.id in self._current:
+            return None
+        fingerprint = content_hash(schema)
+        self._current[schema.id] = fingerprint
+
+        previous = self._previous.get(schema.id)
+        if previous is None:
+            return ItemChange(ChangeKind.ADDED, schema.id, schema)
+        if previous != fingerprint:
+            return ItemChange(ChangeKind.CHANGED, schema.id, schema)
+        return None
+
+    def finish(self) -> list[ItemChange]:
+        """End the running scan, returns listings that were not seen in it."""
+        removed = [
+            ItemChange(ChangeKind.REMOVED, item_id)
+            for item_id in self._previous
+            if item_id not in self._current
+        ]
+        self._previous, self._current = self._current, {}
+        return removed
+
+    def reset(self) -> None:
+        """Drop the running scan, e.g. after it failed half way."""
+        self._current = {}
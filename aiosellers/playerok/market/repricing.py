@@ -0,0 +1,278 @@
+"""Repricing of own listings against a market snapshot."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Protocol
+
+from ..schemas.enums import ItemStatuses
+from .snapshot import _numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from ..entities.item import Item
+    from ..playerok import Playerok
+    from .snapshot import MarketSnapshot
+
+
+class RepricingStrategy(Protocol):
+    def apply(
+        self, target: np.ndarray, current: np.ndarray, competitors: np.ndarray, item_ids: list[str]
+    ) -> np.ndarray:
+        """Return new target prices.
+
+        Args:
+            target: Target prices produced by the previous strategies
+            current: Current prices of the listings
+            competitors: Sorted prices of competing listings
+            item_ids: Ids of the listings, in the order of the arrays
+        """
+        ...
+
+
+def _per_item(value: int | dict[str, int], item_ids: list[str]) -> np.ndarray:
+    np = _numpy()
+    if isinstance(value, dict):
+        return np.array([value.get(item_id, np.nan) for item_id in item_ids], dtype=np.float64)
+    return np.full(len(item_ids), float(value))
+
+
+def _floors(floor: int | dict[str, int] | None, item_ids: list[str]) -> np.ndarray:
+    # Listings without a floor get -inf, so every competitor counts for them.
+    np = _numpy()
+    if floor is None:
+        return np.full(len(item_ids), -np.inf)
+    floors = _per_item(floor, item_ids)
+    floors[np.isnan(floors)] = -np.inf
+    return floors
+
+
+@dataclass(slots=True)
+class Undercut:
+    """Price below the cheapest competitor the listing can afford to beat.
+
+    Competitors cheaper than the floor of a listing are ignored for it, so listings
+    with different floors follow different competitors, and no listing is priced
+    below its floor. Listings without a competitor at or above their floor keep
+    their target.
+
+    Attributes:
+        amount: Amount subtracted from the competitor price
+        percent: Percent of the competitor price subtracted before `amount`
+        floor: Lowest price, one for every listing or per item id (None - no floor)
+    """
+
+    amount: int = 1
+    percent: float = 0.0
+    floor: int | dict[str, int] | None = None
+
+    def apply(
+        self, target: np.ndarray, current: np.ndarray, competitors: np.ndarray, item_ids: list[str]
+    ) -> np.ndarray:
+        np = _numpy()
+        floors = _floors(self.floor, item_ids)
+        rows = np.searchsorted(competitors, floors)
+        found = rows < len(competitors)
+        if not found.any():
+            return target
+        price = np.floor(competitors[rows[found]] * (1 - self.percent / 100)) - self.amount
+        target = target.copy()
+        target[found] = np.fmax(price, floors[found])
+        return target
+
+
+@dataclass(slots=True)
+class TargetRank:
+    """Price to take the given place by price among competitors.
+
+    Places are counted among competitors at or above the floor of a listing, and
+    no listing is priced below its floor. Listings with fewer such competitors than
+    the desired place keep their target, any price keeps that place.
+
+    Attributes:
+        rank: Desired 1-based place, 1 is the cheapest
+        gap: Distance below the competitor currently holding that place
+        floor: Lowest price, one for every listing or per item id (None - no floor)
+    """
+
+    rank: int = 1
+    gap: int = 1
+    floor: int | dict[str, int] | None = None
+
+    def apply(
+        self, target: np.ndarray, current: np.ndarray, competitors: np.ndarray, item_ids: list[str]
+    ) -> np.ndarray:
+        np = _numpy()
+        floors = _floors(self.floor, item_ids)
+        rows = np.searchsorted(competitors, floors) + self.rank - 1
+        found = rows < len(competitors)
+        if not found.any():
+            return target
+        target = target.copy()
+        target[found] = np.fmax(competitors[rows[found]] - self.gap, floors[found])
+        return target
+
+
+@dataclass(slots=True)
+class Floor:
+    """Lowest allowed price, one for every listing or per item id."""
+
+    price: int | dict[str, int]
+
+    def apply(
+        self, target: np.ndarray, current: np.ndarray, competitors: np.ndarray, item_ids: list[str]
+    ) -> np.ndarray:
+        return _numpy().fmax(target, _per_item(self.price, item_ids))
+
+
+@dataclass(slots=True)
+class Ceiling:
+    """Highest allowed price, one for every listing or per item id."""
+
+    price: int | dict[str, int]
+
+    def apply(
+        self, target: np.ndarray, current: np.ndarray, competitors: np.ndarray, item_ids: list[str]
+    ) -> np.ndarray:
+        return _numpy().fmin(target, _per_item(self.price, item_ids))
+
+
+@dataclass(slots=True)
+class PriceChange:
+    item_id: str
+    old_price: int
+    new_price: int
+
+
+@dataclass(slots=True)
+class RepricingResult:
+    """Outcome of a repricing run.
+
+    Attributes:
+        planned: Price changes the strategies asked for
+        applied: Changes that were sent successfully
+        skipped: Changes dropped because of `max_updates`
+        failed: Errors of the changes that could not be sent, by item id
+    """
+
+    planned: list[PriceChange] = field(default_factory=list)
+    applied: list[PriceChange] = field(default_factory=list)
+    skipped: list[PriceChange] = field(default_factory=list)
+    failed: dict[str, Exception] = field(default_factory=dict)
+
+
+class Repricer:
+    """Keeps own listings priced against the market.
+
+    Strategies are applied in order to the prices of all listings of a category
+    at once, e.g. `[Undercut(1, floor=100), Ceiling(500)]`. Only listings whose
+    price moves by at least `min_change` are updated, at most `concurrency` updates
+    run at a time and at most `max_updates` per run, the biggest moves first.
+    """
+
+    def __init__(
+        self,
+        client: Playerok,
+        strategies: Sequence[RepricingStrategy],
+        *,
+        min_change: int = 1,
+        concurrency: int = 4,
+        max_updates: int | None = None,
+        competitor_statuses: Iterable[ItemStatuses] = (ItemStatuses.APPROVED,),
+    ) -> None:
+        """Initialize repricer.
+
+        Args:
+            client: Playerok client
+            strategies: Strategies applied in order
+            min_change: Smallest price difference worth an update
+            concurrency: Maximum number of updates in flight
+            max_updates: Maximum number of updates per run, None for unlimited
+            competitor_statuses: Statuses of listings that count as competitors
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self._client = client
+        self._strategies = list(strategies)
+        self._min_change = max(min_change, 1)
+        self._concurrency = concurrency
+        self._max_updates = max_updates
+        self._competitor_statuses = list(competitor_statuses)
+
+    def plan(self, items: Sequence[Item], snapshot: MarketSnapshot) -> list[PriceChange]:
+        """Compute price changes of listings of one category against its snapshot."""
+        np = _numpy()
+        items = [item for item in items if item.price is not None]
+        if not items:
+            return []
+
+        item_ids = [item.id for item in items]
+        mask = snapshot.mask(status=self._competitor_statuses)
+        if self._client._me_id is not None:
+            mask &= snapshot.user_ids != self._client._me_id
+        mask &= ~np.isin(snapshot.ids, item_ids)
+        competitors = snapshot.price[mask]
+        competitors = np.sort(competitors[~np.isnan(competitors)])
+
+        current = np.array([item.price for item in items], dtype=np.float64)
+        target = current.copy()
+        for strategy in self._strategies:
+            target = strategy.apply(target, current, competitors, item_ids)
+        target = np.maximum(np.floor(target), 1)
+
+        rows = np.flatnonzero(np.abs(target - current) >= self._min_change)
+        return [PriceChange(item_ids[row], int(current[row]), int(target[row])) for row in rows]
+
+    async def apply(self, changes: Sequence[PriceChange]) -> RepricingResult:
+        """Send price updates, the biggest moves first when `max_updates` is set."""
+        result = RepricingResult(planned=list(changes))
+        changes = sorted(changes, key=lambda c: abs(c.new_price - c.old_price), reverse=True)
+        if self._max_updates is not None:
+            result.skipped = changes[self._max_updates :]
+            changes = changes[: self._max_updates]
+
+        # A fixed pool of workers, so a large plan doesn't create a task per change.
+        pending = iter(changes)
+
+        async def worker() -> None:
+            for change in pending:
+                try:
+                    await self._client.items.update(change.item_id, price=change.new_price)
+                except Exception as exc:
+                    result.failed[change.item_id] = exc
+                else:
+                    result.applied.append(change)
+
+        await asyncio.gather(*(worker() for _ in range(min(self._concurrency, len(changes)))))
+        return result
+
+    async def run(
+        self, items: Iterable[Item] | None = None, **snapshot_options: Any
+    ) -> RepricingResult:
+        """Reprice listings, one market snapshot per category, taken one at a time.
+
+        Args:
+            items: Listings to reprice, all own listings by default
+            **snapshot_options: Passed to `client.market.snapshot()`, e.g. `concurrency`
+        """
+        if items is None:
+            items = [item async for item in self._client.items.iter_self()]
+
+        by_category: dict[str, list[Item]] = {}
+        for item in items:
+            if item.category_id is not None:
+                by_category.setdefault(item.category_id, []).append(item)
+
+        # Categories are scanned one after another, each snapshot already sends
+        # `concurrency` requests at once.
+        changes = []
+        for category_id, category_items in by_category.items():
+            snapshot = await self._client.market.snapshot(
+                category_id=category_id, **snapshot_options
+            )
+            changes += self.plan(category_items, snapshot)
+        return await self.apply(changes)
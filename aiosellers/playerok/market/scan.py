@@ -0,0 +1,214 @@
+"""Concurrent catalog scan over price windows."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from ..schemas.enums import ItemsSortOptions
+
+if TYPE_CHECKING:
+    from ..playerok import Playerok
+    from ..schemas.items import Item as ItemSchema
+
+# Page size used by `ItemAPI.iter()`.
+_PAGE_SIZE = 24
+
+
+@dataclass(slots=True)
+class PriceWindow:
+    """Inclusive price range of a shard and the number of listings in it."""
+
+    low: int
+    high: int
+    total: int = 0
+
+
+@dataclass(slots=True)
+class ScanStats:
+    """Counters of a finished or running scan.
+
+    Attributes:
+        shards: Price windows walked
+        requests: `get_items` requests made, probes included
+        items: Unique listings yielded
+        duplicates: Listings seen in more than one shard and skipped
+    """
+
+    shards: int = 0
+    requests: int = 0
+    items: int = 0
+    duplicates: int = 0
+
+
+class ShardedScanner:
+    """Walks a category by price windows in parallel instead of one cursor.
+
+    The price range is split into windows that hold about `shard_size` listings:
+    windows are probed with single-item requests (the response carries the total
+    count), windows above the target are split in half and adjacent sparse windows
+    are merged. The windows are then walked concurrently, at most `concurrency`
+    requests at a time. Listings that move between windows while the scan runs are
+    yielded once.
+    """
+
+    def __init__(
+        self,
+        client: Playerok,
+        *,
+        concurrency: int = 4,
+        shard_size: int = 10 * _PAGE_SIZE,
+        initial_shards: int = 8,
+        **filters: Any,
+    ) -> None:
+        """Initialize scanner.
+
+        Args:
+            client: Playerok client
+            concurrency: Maximum number of requests in flight
+            shard_size: Target number of listings per window
+            initial_shards: Number of equal windows the price range starts with
+            **filters: `get_items` filters (category_id, game_id, minimal_price,
+                maximal_price, attributes, search, ...)
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self._client = client
+        self._low = filters.pop("minimal_price", None)
+        self._high = filters.pop("maximal_price", None)
+        self._shard_size = max(shard_size, _PAGE_SIZE)
+        self._initial_shards = max(initial_shards, 1)
+        self._filters = filters
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.stats = ScanStats()
+
+    async def _get_items(self, **kwargs: Any):
+        async with self._semaphore:
+            self.stats.requests += 1
+            return await self._client._raw.items.get_items(**self._filters, **kwargs)
+
+    async def _probe(self, window: PriceWindow) -> PriceWindow:
+        response = await self._get_items(
+            count=1, minimal_price=window.low, maximal_price=window.high
+        )
+        window.total = response.total_count if response is not None else 0
+        return window
+
+    async def _bounds(self) -> tuple[int, int] | None:
+        low, high = self._low, self._high
+        if low is not None and high is not None:
+            return low, high
+
+        cheapest, priciest = await asyncio.gather(
+            self._get_items(
+                count=1, sort=ItemsSortOptions.PRICE_ASC, minimal_price=low, maximal_price=high
+            ),
+            self._get_items(
+                count=1, sort=ItemsSortOptions.PRICE_DESC, minimal_price=low, maximal_price=high
+            ),
+        )
+        if not cheapest or not cheapest.items or not priciest or not priciest.items:
+            return None
+        return (
+            low if low is not None else cheapest.items[0].price or 0,
+            high if high is not None else priciest.items[0].price or 0,
+        )
+
+    async def plan(self) -> list[PriceWindow]:
+        """Split the price range into windows of about `shard_size` listings."""
+        bounds = await self._bounds()
+        if bounds is None:
+            return []
+        low, high = bounds
+
+        step = max((high - low + 1) // self._initial_shards, 1)
+        windows = [
+            PriceWindow(start, min(start + step - 1, high)) for start in range(low, high + 1, step)
+        ]
+        windows = list(await asyncio.gather(*(self._probe(w) for w in windows)))
+
+        # Split hot windows until they fit or can't be split further.
+        while True:
+            hot = [w for w in windows if w.total > self._shard_size and w.high > w.low]
+            if not hot:
+                break
+            halves = []
+            for window in hot:
+                middle = (window.low + window.high) // 2
+                halves += [PriceWindow(window.low, middle), PriceWindow(middle + 1, window.high)]
+            await asyncio.gather(*(self._probe(w) for w in halves))
+            split = {id(w) for w in hot}
+            windows = [w for w in windows if id(w) not in split] + halves
+            windows.sort(key=lambda w: w.low)
+
+        # Merge adjacent sparse windows.
+        merged: list[PriceWindow] = []
+        for window in windows:
+            if not window.total:
+                continue
+            last = merged[-1] if merged else None
+            if last is not None and last.total + window.total <= self._shard_size:
+                last.high = window.high
+                last.total += window.total
+            else:
+                merged.append(window)
+        return merged
+
+    async def _walk(self, window: PriceWindow, queue: asyncio.Queue) -> None:
+        try:
+            await self._walk_pages(window, queue)
+        except Exception as exc:
+            await queue.put(exc)
+        else:
+            await queue.put(None)
+
+    async def _walk_pages(self, window: PriceWindow, queue: asyncio.Queue) -> None:
+        cursor = None
+        while True:
+            response = await self._get_items(
+                count=_PAGE_SIZE,
+                cursor=cursor,
+                minimal_price=window.low,
+                maximal_price=window.high,
+            )
+            if response is None or not response.items:
+                return
+            for schema in response.items:
+                await queue.put(schema)
+            if not response.page_info.has_next_page:
+                return
+            cursor = response.page_info.end_cursor
+
+    async def scan(self) -> AsyncIterator[ItemSchema]:
+        """Yield listings of every window as they arrive, each id once."""
+        windows = await self.plan()
+        self.stats.shards = len(windows)
+        if not windows:
+            return
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=len(windows) * _PAGE_SIZE)
+        walkers = [asyncio.create_task(self._walk(window, queue)) for window in windows]
+
+        seen: set[str] = set()
+        running = len(walkers)
+        try:
+            while running:
+                schema = await queue.get()
+                if schema is None:  # a window is done
+                    running -= 1
+                    continue
+                if isinstance(schema, Exception):
+                    raise schema
+                if schema.id in seen:
+                    self.stats.duplicates += 1
+                    continue
+                seen.add(schema.id)
+                self.stats.items += 1
+                yield schema
+        finally:
+            for walker in walkers:
+                walker.cancel()
+            await asyncio.gather(*walkers, return_exceptions=True)
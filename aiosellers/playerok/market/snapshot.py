@@ -0,0 +1,312 @@
+"""Category listings captured into NumPy arrays."""
+
+from __future__ import annotations
+
+import time
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from ..schemas.enums import ItemStatuses, PriorityTypes
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from ..schemas.items import Item as ItemSchema
+
+_STATUSES = tuple(ItemStatuses)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+_PRIORITIES = tuple(PriorityTypes)
+_PRIORITY_CODES = {priority: code for code, priority in enumerate(_PRIORITIES)}
+_UNKNOWN = 255
+_NAN = float("nan")
+
+
+def _numpy() -> Any:
+    # Lazy import so the client works without the optional `market` extra installed.
+    try:
+        import numpy
+    except ImportError as exc:  # pragma: no cover
+        raise ImportError(
+            "Market snapshots require NumPy, install it with `pip install aiosellers[market]`."
+        ) from exc
+    return numpy
+
+
+def _float(value: float | int | None) -> float:
+    return _NAN if value is None else float(value)
+
+
+@dataclass(slots=True)
+class PriceStats:
+    """Price statistics of a set of listings.
+
+    Attributes:
+        count: Number of listings with a price
+        min: Lowest price
+        max: Highest price
+        mean: Average price
+        median: Median price
+        p10: 10th percentile
+        p25: 25th percentile
+        p75: 75th percentile
+        p90: 90th percentile
+    """
+
+    count: int
+    min: float | None
+    max: float | None
+    mean: float | None
+    median: float | None
+    p10: float | None
+    p25: float | None
+    p75: float | None
+    p90: float | None
+
+
+class SnapshotBuilder:
+    """Collects item payloads column by column and turns them into a `MarketSnapshot`."""
+
+    def __init__(self) -> None:
+        self._ids: list[str] = []
+        self._seen: set[str] = set()
+        self._user_ids: list[str | None] = []
+        self._price = array("d")
+        self._raw_price = array("d")
+        self._rating = array("d")
+        self._views = array("d")
+        self._priority_position = array("d")
+        self._priority = array("B")
+        self._status = array("B")
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._seen
+
+    def add(self, schema: ItemSchema) -> bool:
+        """Add a listing, returns False if a listing with the same id was already added."""
+        if schema.id in self._seen:
+            return False
+        self._seen.add(schema.id)
+        self._ids.append(schema.id)
+        self._user_ids.append(schema.user.id if schema.user else None)
+        self._price.append(_float(schema.price))
+        self._raw_price.append(_float(schema.raw_price))
+        self._rating.append(_float(schema.user.rating if schema.user else None))
+        self._views.append(_float(schema.views_counter))
+        self._priority_position.append(_float(schema.priority_position))
+        self._priority.append(_PRIORITY_CODES.get(schema.priority, _UNKNOWN))
+        self._status.append(_STATUS_CODES.get(schema.status, _UNKNOWN))
+        return True
+
+    def extend(self, schemas: Iterable[ItemSchema]) -> None:
+        for schema in schemas:
+            self.add(schema)
+
+    def build(self, *, taken_at: float | None = None) -> MarketSnapshot:
+        np = _numpy()
+        return MarketSnapshot(
+            ids=np.array(self._ids, dtype=object),
+            user_ids=np.array(self._user_ids, dtype=object),
+            price=np.frombuffer(self._price, dtype=np.float64).copy(),
+            raw_price=np.frombuffer(self._raw_price, dtype=np.float64).copy(),
+            rating=np.frombuffer(self._rating, dtype=np.float64).copy(),
+            views=np.frombuffer(self._views, dtype=np.float64).copy(),
+            priority_position=np.frombuffer(self._priority_position, dtype=np.float64).copy(),
+            priority=np.frombuffer(self._priority, dtype=np.uint8).copy(),
+            status=np.frombuffer(self._status, dtype=np.uint8).copy(),
+            taken_at=time.time() if taken_at is None else taken_at,
+        )
+
+
+class MarketSnapshot:
+    """Listings of a category at one moment, stored as NumPy arrays.
+
+    Numeric columns are float64 with NaN for missing values, statuses and priorities
+    are uint8 codes. Statistics, filters and ranks are computed on the arrays, so they
+    take milliseconds even for tens of thousands of listings.
+
+    Use `client.market.snapshot()` to capture one.
+    """
+
+    __slots__ = (
+        "ids",
+        "user_ids",
+        "price",
+        "raw_price",
+        "rating",
+        "views",
+        "priority_position",
+        "priority",
+        "status",
+        "taken_at",
+        "_positions",
+    )
+
+    def __init__(
+        self,
+        *,
+        ids: np.ndarray,
+        user_ids: np.ndarray,
+        price: np.ndarray,
+        raw_price: np.ndarray,
+        rating: np.ndarray,
+        views: np.ndarray,
+        priority_position: np.ndarray,
+        priority: np.ndarray,
+        status: np.ndarray,
+        taken_at: float,
+    ) -> None:
+        self.ids = ids
+        self.user_ids = user_ids
+        self.price = price
+        self.raw_price = raw_price
+        self.rating = rating
+        self.views = views
+        self.priority_position = priority_position
+        self.priority = priority
+        self.status = status
+        self.taken_at = taken_at
+        self._positions: dict[str, int] | None = None
+
+    @classmethod
+    def from_items(cls, schemas: Iterable[ItemSchema]) -> MarketSnapshot:
+        """Build a snapshot from item payloads."""
+        builder = SnapshotBuilder()
+        builder.extend(schemas)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._index()
+
+    def _index(self) -> dict[str, int]:
+        if self._positions is None:
+            self._positions = {item_id: row for row, item_id in enumerate(self.ids)}
+        return self._positions
+
+    def position(self, item_id: str) -> int | None:
+        """Row of the listing in the arrays, None if it is not in the snapshot."""
+        return self._index().get(item_id)
+
+    def mask(
+        self,
+        *,
+        status: ItemStatuses | Iterable[ItemStatuses] | None = None,
+        priority: PriorityTypes | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        min_rating: float | None = None,
+        user_id: str | None = None,
+        exclude_user_id: str | None = None,
+    ) -> np.ndarray:
+        """Boolean mask of listings matching every given condition."""
+        np = _numpy()
+        result = np.ones(len(self), dtype=bool)
+        if status is not None:
+            statuses = [status] if isinstance(status, ItemStatuses) else list(status)
+            codes = [_STATUS_CODES[s] for s in statuses]
+            result &= np.isin(self.status, codes)
+        if priority is not None:
+            result &= self.priority == _PRIORITY_CODES[priority]
+        if min_price is not None:
+            result &= self.price >= min_price
+        if max_price is not None:
+            result &= self.price <= max_price
+        if min_rating is not None:
+            result &= self.rating >= min_rating
+        if user_id is not None:
+            result &= self.user_ids == user_id
+        if exclude_user_id is not None:
+            result &= self.user_ids != exclude_user_id
+        return result
+
+    def filter(self, mask: np.ndarray | None = None, **conditions: Any) -> MarketSnapshot:
+        """Snapshot of the matching listings, see `mask()` for `conditions`."""
+        if mask is None:
+            mask = self.mask(**conditions)
+        elif conditions:
+            mask = mask & self.mask(**conditions)
+        return MarketSnapshot(
+            ids=self.ids[mask],
+            user_ids=self.user_ids[mask],
+            price=self.price[mask],
+            raw_price=self.raw_price[mask],
+            rating=self.rating[mask],
+            views=self.views[mask],
+            priority_position=self.priority_position[mask],
+            priority=self.priority[mask],
+            status=self.status[mask],
+            taken_at=self.taken_at,
+        )
+
+    def percentiles(self, q: Iterable[float], mask: np.ndarray | None = None) -> list[float | None]:
+        """Price percentiles (0-100) of the matching listings, ignoring missing prices."""
+        np = _numpy()
+        prices = self.price if mask is None else self.price[mask]
+        prices = prices[~np.isnan(prices)]
+        q = list(q)
+        if not len(prices):
+            return [None] * len(q)
+        return [float(value) for value in np.percentile(prices, q)]
+
+    def stats(self, mask: np.ndarray | None = None, **conditions: Any) -> PriceStats:
+        """Price statistics of the matching listings, see `mask()` for `conditions`."""
+        np = _numpy()
+        if conditions:
+            mask = self.mask(**conditions) if mask is None else mask & self.mask(**conditions)
+        prices = self.price if mask is None else self.price[mask]
+        prices = prices[~np.isnan(prices)]
+        if not len(prices):
+            return PriceStats(0, None, None, None, None, None, None, None, None)
+
+        p10, p25, median, p75, p90 = (float(v) for v in np.percentile(prices, [10, 25, 50, 75, 90]))
+        return PriceStats(
+            count=len(prices),
+            min=float(prices.min()),
+            max=float(prices.max()),
+            mean=float(prices.mean()),
+            median=median,
+            p10=p10,
+            p25=p25,
+            p75=p75,
+            p90=p90,
+        )
+
+    def rank(self, item_id: str, mask: np.ndarray | None = None, **conditions: Any) -> int | None:
+        """1-based position of the listing by ascending price among the matching listings.
+
+        Listings with the same price share a rank. The listing itself doesn't have to
+        match the conditions, e.g. `rank(my_item_id, status=ItemStatuses.APPROVED)`.
+        """
+        row = self.position(item_id)
+        if row is None:
+            return None
+        return self.rank_of_price(float(self.price[row]), mask, **conditions)
+
+    def rank_of_price(self, price: float, mask: np.ndarray | None = None, **conditions: Any) -> int:
+        """Rank a listing with the given price would have among the matching listings."""
+        if conditions:
+            mask = self.mask(**conditions) if mask is None else mask & self.mask(**conditions)
+        prices = self.price if mask is None else self.price[mask]
+        return int((prices < price).sum()) + 1
+
+    def cheapest(self, n: int = 10, mask: np.ndarray | None = None, **conditions: Any) -> list[str]:
+        """Ids of the `n` cheapest matching listings, cheapest first."""
+        np = _numpy()
+        if conditions:
+            mask = self.mask(**conditions) if mask is None else mask & self.mask(**conditions)
+        rows = np.arange(len(self)) if mask is None else np.flatnonzero(mask)
+        prices = self.price[rows]
+        rows = rows[~np.isnan(prices)]
+        prices = self.price[rows]
+        if n < len(rows):
+            part = np.argpartition(prices, n)[:n]
+            rows, prices = rows[part], prices[part]
+        order = np.argsort(prices, kind="stable")
+        return [str(item_id) for item_id in self.ids[rows[order]]]
@@ -1,17 +1,29 @@
 from __future__ import annotations
 
+from contextlib import AsyncExitStack
 from dataclasses import dataclass
 
-from .api import AccountAPI, ChatAPI, DealAPI, GameAPI, ItemAPI
+from .api import (
+    AccountAPI,
+    ChatAPI,
+    DealAPI,
+    GameAPI,
+    InventoryAPI,
+    ItemAPI,
+    MarketAPI,
+    SearchAPI,
+)
 from .client_config import PlayerokClientConfig
 from .core.config import PlayerokConfig
 from .core.identity_map import IdentityMap
+from .core.indexes import SecondaryIndex
 from .entities.chat import Chat
 from .entities.deal import Deal
 from .entities.game import Game
 from .entities.item import Item, MyItem
 from .entities.user import User
 from .raw import RawAPI
+from .storage import InMemoryDealCheckpointStore, InMemoryMessageStore
 from .transport import PlayerokTransport
 
 
@@ -24,6 +36,13 @@ class _IdentityMaps:
     items: IdentityMap[str, Item | MyItem]
 
 
+@dataclass(slots=True)
+class _Indexes:
+    chats_by_user: SecondaryIndex[str, str]
+    deals_by_item: SecondaryIndex[str, str]
+    deals_by_chat: SecondaryIndex[str, str]
+
+
 class Playerok:
     """High-level Playerok client with modular API."""
 
@@ -46,6 +65,9 @@ class Playerok:
         self._raw: RawAPI | None = None
         self._use_identity_map = config.use_identity_map
         self._me_id: str | None = None
+        self._message_store = config.message_store or InMemoryMessageStore()
+        self._deal_checkpoint_store = config.deal_checkpoint_store or InMemoryDealCheckpointStore()
+        self._search_index = config.search_index
 
         if self._use_identity_map:
             self._identity_maps = _IdentityMaps(
@@ -55,12 +77,20 @@ class Playerok:
                 games=IdentityMap(),
                 items=IdentityMap(),
             )
+        self._indexes = _Indexes(
+            chats_by_user=SecondaryIndex(config.index_ttl),
+            deals_by_item=SecondaryIndex(config.index_ttl),
+            deals_by_chat=SecondaryIndex(config.index_ttl),
+        )
 
         self.account = AccountAPI(self)
         self.chats = ChatAPI(self)
         self.deals = DealAPI(self)
         self.games = GameAPI(self)
         self.items = ItemAPI(self)
+        self.market = MarketAPI(self)
+        self.inventory = InventoryAPI(self)
+        self.search = SearchAPI(self)
 
         self.users = self.account
 
@@ -82,25 +112,48 @@ class Playerok:
                 user_agent=self._config.user_agent,
                 request_timeout=self._config.request_timeout,
                 base_url=self._config.base_url,
+                mmap_attachments=self._config.mmap_attachments,
+                intern_strings=self._config.intern_strings,
             ),
         )
-        self._raw = RawAPI(self._transport)
+        self._raw = RawAPI(self._transport, self._config.outbox)
 
         me = await self._raw.account.get_me()
         self._me_id = me.id
+        await self._raw.replay_outbox()
 
     async def close(self) -> None:
         """Close the client."""
         if self._transport is None:
             return
 
-        await self._transport.close()
-        self._transport = None
-        self._raw = None
-
-        if self._use_identity_map:
-            self._identity_maps.users.clear()
-            self._identity_maps.chats.clear()
-            self._identity_maps.deals.clear()
-            self._identity_maps.games.clear()
-            self._identity_maps.items.clear()
+        # Every resource is released and the client reset even when a flush or
+        # another close fails, the error is raised afterwards.
+        try:
+            async with AsyncExitStack() as stack:
+                stack.push_async_callback(self._transport.close)
+                if self._config.outbox is not None:
+                    stack.push_async_callback(self._config.outbox.close)
+                if self._search_index is not None:
+                    stack.push_async_callback(self._search_index.close)
+                stack.push_async_callback(self._deal_checkpoint_store.close)
+                stack.push_async_callback(self._message_store.close)
+                await self.chats.queue.close()
+                await self.chats.flush_read_marks()
+        finally:
+            self._transport = None
+            self._raw = None
+
+            if self._use_identity_map:
+                self._identity_maps.users.clear()
+                self._identity_maps.chats.clear()
+                self._identity_maps.deals.clear()
+                self._identity_maps.games.clear()
+                self._identity_maps.items.clear()
+
+            self._indexes.chats_by_user.clear()
+            self._indexes.deals_by_item.clear()
+            self._indexes.deals_by_chat.clear()
+            self.chats._read_state.clear()
+            self.items._priority_tiers.clear()
+            self.inventory.clear()
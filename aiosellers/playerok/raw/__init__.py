@@ -1,3 +1,4 @@
+from ..storage.outbox import Outbox, OutboxEntry, replay
 from ..transport import PlayerokTransport
 from .account import RawAccountService
 from .chats import RawChatService
@@ -10,14 +11,22 @@ from .transactions import RawTransactionService
 class RawAPI:
     """Low-level API access."""
 
-    def __init__(self, transport: PlayerokTransport):
+    def __init__(self, transport: PlayerokTransport, outbox: Outbox | None = None):
+        self._outbox = outbox
         self.account = RawAccountService(transport)
-        self.chats = RawChatService(transport)
-        self.deals = RawDealsService(transport)
+        self.chats = RawChatService(transport, outbox)
+        self.deals = RawDealsService(transport, outbox)
         self.games = RawGamesService(transport)
-        self.items = RawItemsService(transport)
+        self.items = RawItemsService(transport, outbox)
         self.transactions = RawTransactionService(transport)
 
+    async def replay_outbox(self) -> list[OutboxEntry]:
+        """Send mutations left pending in the outbox by a previous run."""
+        if self._outbox is None:
+            return []
+        services = {"chats": self.chats, "deals": self.deals, "items": self.items}
+        return await replay(services, self._outbox)
+
 
 __all__ = [
     "RawAPI",
@@ -13,7 +13,7 @@ class RawAccountService:
 
     async def get_me(self) -> Account:
         response = await self._transport.request("post", "graphql", GQL.get_me())
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "viewer"))
@@ -25,7 +25,7 @@ class RawAccountService:
         if username is None:
             raise ValueError("Can't get account with no username")
         response = await self._transport.request("post", "graphql", GQL.get_user(username=username))
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "user"))
@@ -43,7 +43,7 @@ class RawAccountService:
         response = await self._transport.request(
             "post", "graphql", GQL.get_user(username=username, id=id)
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "user"))
@@ -4,12 +4,16 @@ from ..core.types import ImageInput
 from ..core.utils import _dig, _raise_on_gql_errors, prepare_image_file
 from ..graphql import GraphQLQuery as GQL
 from ..schemas import Chat, ChatList, ChatMessage, ChatMessageList, ChatStatuses, ChatTypes
+from ..storage.outbox import Outbox, durable
 from ..transport import PlayerokTransport
 
 
 class RawChatService:
-    def __init__(self, transport: PlayerokTransport):
+    _outbox_name = "chats"
+
+    def __init__(self, transport: PlayerokTransport, outbox: Outbox | None = None):
         self._transport = transport
+        self._outbox = outbox
 
     async def get_chats(
         self,
@@ -24,7 +28,7 @@ class RawChatService:
             "graphql",
             GQL.get_chats(user_id=user_id, count=count, type=type, status=status, cursor=cursor),
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "chats"))
@@ -34,7 +38,7 @@ class RawChatService:
 
     async def get_chat(self, chat_id: str) -> Chat | None:
         response = await self._transport.request("post", "graphql", GQL.get_chat(chat_id=chat_id))
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "chat"))
@@ -42,11 +46,12 @@ class RawChatService:
             return None
         return Chat(**data)
 
+    @durable
     async def mark_chat_as_read(self, chat_id: str) -> Chat | None:
         response = await self._transport.request(
             "post", "graphql", GQL.mark_chat_as_read(chat_id=chat_id)
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "markChatAsRead"))
@@ -62,7 +67,7 @@ class RawChatService:
             "graphql",
             GQL.get_chat_messages(chat_id=chat_id, count=count, after_cursor=after_cursor),
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "chatMessages"))
@@ -88,7 +93,9 @@ class RawChatService:
 
         if photo:
             payload = GQL.create_chat_message_with_photo(chat_id=chat_id, text=text)
-            file_obj, should_close = await prepare_image_file(photo)
+            file_obj, should_close = await prepare_image_file(
+                photo, use_mmap=self._transport.config.mmap_attachments
+            )
             try:
                 files = {"1": file_obj}
                 response = await self._transport.request("post", "graphql", payload, files=files)
@@ -99,7 +106,7 @@ class RawChatService:
             payload = GQL.create_chat_message(chat_id=chat_id, text=text)
             response = await self._transport.request("post", "graphql", payload)
 
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "createChatMessage"))
@@ -12,12 +12,16 @@ from ..schemas import (
     TransactionPaymentMethodIds,
     TransactionProviderIds,
 )
+from ..storage.outbox import Outbox
 from ..transport import PlayerokTransport
 
 
 class RawDealsService:
-    def __init__(self, transport: PlayerokTransport):
+    _outbox_name = "deals"
+
+    def __init__(self, transport: PlayerokTransport, outbox: Outbox | None = None):
         self._transport = transport
+        self._outbox = outbox
 
     async def get_deals(
         self,
@@ -38,7 +42,7 @@ class RawDealsService:
                 after_cursor=after_cursor,
             ),
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "deals"))
@@ -48,7 +52,7 @@ class RawDealsService:
 
     async def get_deal(self, deal_id: str) -> ItemDeal | None:
         response = await self._transport.request("post", "graphql", GQL.get_deal(deal_id=deal_id))
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "deal"))
@@ -60,7 +64,7 @@ class RawDealsService:
         response = await self._transport.request(
             "post", "graphql", GQL.update_deal(deal_id=deal_id, new_status=new_status)
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "updateDeal"))
@@ -97,7 +101,7 @@ class RawDealsService:
                 payment_method_id=payment_method_id.name if payment_method_id else None,
             ),
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "createDeal"))
@@ -35,7 +35,7 @@ class RawGamesService:
         response = await self._transport.request(
             "post", "graphql", GQL.get_games(count=count, type=type, cursor=cursor, name=search)
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "games"))
@@ -48,7 +48,7 @@ class RawGamesService:
             raise ValueError("Can't get game without id or slug")
 
         response = await self._transport.request("post", "graphql", GQL.get_game(id=id, slug=slug))
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "game"))
@@ -65,7 +65,7 @@ class RawGamesService:
         response = await self._transport.request(
             "post", "graphql", GQL.get_game_category(game_id=game_id, slug=slug, id=id)
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "gameCategory"))
@@ -95,7 +95,7 @@ class RawGamesService:
                 cursor=cursor,
             ),
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "gameCategoryAgreements"))
@@ -111,7 +111,7 @@ class RawGamesService:
             "graphql",
             GQL.accept_game_category_agreement(agreement_id=agreement_id, user_id=user_id),
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "acceptGameCategoryAgreement"))
@@ -137,7 +137,7 @@ class RawGamesService:
                 cursor=cursor,
             ),
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "gameCategoryObtainingTypes"))
@@ -169,7 +169,7 @@ class RawGamesService:
                 cursor=cursor,
             ),
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "gameCategoryInstructions"))
@@ -201,7 +201,7 @@ class RawGamesService:
                 cursor=cursor,
             ),
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "gameCategoryDataFields"))
@@ -220,7 +220,7 @@ class RawGamesService:
                 game_category_id=game_category_id,
             ),
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "gameCategory"))
@@ -13,12 +13,16 @@ from ..schemas import (
     TransactionPaymentMethodIds,
     TransactionProviderIds,
 )
+from ..storage.outbox import Outbox, durable
 from ..transport import PlayerokTransport
 
 
 class RawItemsService:
-    def __init__(self, transport: PlayerokTransport):
+    _outbox_name = "items"
+
+    def __init__(self, transport: PlayerokTransport, outbox: Outbox | None = None):
         self._transport = transport
+        self._outbox = outbox
 
     async def get_items(
         self,
@@ -56,7 +60,7 @@ class RawItemsService:
                 sort=sort,
             ),
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "items"))
@@ -69,7 +73,7 @@ class RawItemsService:
             raise ValueError("Can't get item without id or slug")
 
         response = await self._transport.request("post", "graphql", GQL.get_item(id=id, slug=slug))
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "item"))
@@ -105,7 +109,9 @@ class RawItemsService:
         file_handles = []
         try:
             for i, attachment in enumerate(attachments):
-                file_obj, should_close = await prepare_image_file(attachment)
+                file_obj, should_close = await prepare_image_file(
+                    attachment, use_mmap=self._transport.config.mmap_attachments
+                )
                 files[str(i + 1)] = file_obj
                 if should_close:
                     file_handles.append(file_obj)
@@ -115,7 +121,7 @@ class RawItemsService:
             for f in file_handles:
                 f.close()
 
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "createItem"))
@@ -123,6 +129,7 @@ class RawItemsService:
             return None
         return MyItem(**data)
 
+    @durable
     async def update_item(
         self,
         id: str,
@@ -157,7 +164,9 @@ class RawItemsService:
             files = {}
             try:
                 for i, attachment in enumerate(add_attachments):
-                    file_obj, should_close = await prepare_image_file(attachment)
+                    file_obj, should_close = await prepare_image_file(
+                        attachment, use_mmap=self._transport.config.mmap_attachments
+                    )
                     files[str(i + 1)] = file_obj
                     if should_close:
                         file_handles.append(file_obj)
@@ -172,7 +181,7 @@ class RawItemsService:
             for f in file_handles:
                 f.close()
 
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "updateItem"))
@@ -180,9 +189,10 @@ class RawItemsService:
             return None
         return MyItem(**data)
 
+    @durable
     async def remove_item(self, id: str) -> bool:
         response = await self._transport.request("post", "graphql", GQL.remove_item(id=id))
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
         return True
 
@@ -205,7 +215,7 @@ class RawItemsService:
                 transaction_provider_id=transaction_provider_id.name,
             ),
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "publishItem"))
@@ -219,7 +229,7 @@ class RawItemsService:
         response = await self._transport.request(
             "post", "graphql", GQL.get_item_priority_statuses(item_id=item_id, price=price)
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "itemPriorityStatuses")) or []
@@ -246,7 +256,7 @@ class RawItemsService:
                 transaction_provider_id=transaction_provider_id.name,
             ),
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "increaseItemPriorityStatus"))
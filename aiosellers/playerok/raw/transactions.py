@@ -29,7 +29,7 @@ class RawTransactionService:
         response = await self._transport.request(
             "post", "graphql", GQL.get_transaction_providers(direction)
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "transactionProviders")) or []
@@ -60,7 +60,7 @@ class RawTransactionService:
                 after_cursor=after_cursor,
             ),
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "transactions"))
@@ -68,7 +68,7 @@ class RawTransactionService:
 
     async def get_sbp_bank_members(self) -> list[SBPBankMember]:
         response = await self._transport.request("post", "graphql", GQL.get_sbp_bank_members())
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "sbpBankMembers")) or []
@@ -83,7 +83,7 @@ class RawTransactionService:
         response = await self._transport.request(
             "post", "graphql", GQL.get_verified_cards(count, after_cursor, direction)
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "verifiedCards"))
@@ -91,7 +91,7 @@ class RawTransactionService:
 
     async def delete_card(self, card_id: str) -> bool:
         response = await self._transport.request("post", "graphql", GQL.delete_card(card_id))
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         return _dig(raw, ("data", "deleteCard"))
@@ -113,7 +113,7 @@ class RawTransactionService:
             "graphql",
             GQL.request_withdrawal(provider, account, value, payment_method_id, sbp_bank_member_id),
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "requestWithdrawal"))
@@ -123,7 +123,7 @@ class RawTransactionService:
         response = await self._transport.request(
             "post", "graphql", GQL.remove_transaction(transaction_id)
         )
-        raw = response.json()
+        raw = self._transport.decode(response)
         _raise_on_gql_errors(raw)
 
         data = _dig(raw, ("data", "removeTransaction"))
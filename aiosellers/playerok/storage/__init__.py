@@ -0,0 +1,42 @@
+"""Local persistence for data synced from PlayerOK."""
+
+from .checkpoints import (
+    DealCheckpoint,
+    DealCheckpointStore,
+    InMemoryDealCheckpointStore,
+    SQLiteDealCheckpointStore,
+)
+from .history import MessageHistory
+from .messages import InMemoryMessageStore, MessageStore, SQLiteMessageStore
+from .outbox import Outbox, OutboxEntry, SQLiteOutbox
+from .search import (
+    DocumentKind,
+    InMemorySearchIndex,
+    SearchHit,
+    SearchIndex,
+    SQLiteSearchIndex,
+)
+from .timers import InMemoryTimerStore, SQLiteTimerStore, StoredTimer, TimerStore
+
+__all__ = [
+    "DealCheckpoint",
+    "DealCheckpointStore",
+    "DocumentKind",
+    "InMemoryDealCheckpointStore",
+    "SQLiteDealCheckpointStore",
+    "InMemoryMessageStore",
+    "InMemorySearchIndex",
+    "InMemoryTimerStore",
+    "MessageHistory",
+    "MessageStore",
+    "Outbox",
+    "OutboxEntry",
+    "SQLiteMessageStore",
+    "SQLiteOutbox",
+    "SQLiteSearchIndex",
+    "SQLiteTimerStore",
+    "SearchHit",
+    "SearchIndex",
+    "StoredTimer",
+    "TimerStore",
+]
@@ -0,0 +1,103 @@
+"""Checkpoint stores used by `DealAPI.sync()`."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from ..schemas.enums import ItemDealStatuses
+from .sqlite import SQLiteStore
+
+
+@dataclass(slots=True)
+class DealCheckpoint:
+    """State of the previous deal sync.
+
+    Attributes:
+        watermark: Creation date of the newest deal seen so far
+        last_deal_id: ID of the newest deal seen so far
+        open_deals: Statuses of deals that were not finished yet, by deal id
+    """
+
+    watermark: datetime | None = None
+    last_deal_id: str | None = None
+    open_deals: dict[str, ItemDealStatuses] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "watermark": self.watermark.isoformat() if self.watermark else None,
+                "last_deal_id": self.last_deal_id,
+                "open_deals": {k: v.value for k, v in self.open_deals.items()},
+            }
+        )
+
+    @classmethod
+    def from_json(cls, data: str) -> DealCheckpoint:
+        raw = json.loads(data)
+        return cls(
+            watermark=datetime.fromisoformat(raw["watermark"]) if raw.get("watermark") else None,
+            last_deal_id=raw.get("last_deal_id"),
+            open_deals={k: ItemDealStatuses(v) for k, v in (raw.get("open_deals") or {}).items()},
+        )
+
+
+class DealCheckpointStore(ABC):
+    """Base class for deal sync checkpoint stores."""
+
+    @abstractmethod
+    async def load(self, key: str) -> DealCheckpoint | None:
+        """Return the checkpoint saved under `key`, if any."""
+
+    @abstractmethod
+    async def save(self, key: str, checkpoint: DealCheckpoint) -> None:
+        """Save the checkpoint under `key`."""
+
+    async def close(self) -> None:
+        """Release resources held by the store."""
+
+
+class InMemoryDealCheckpointStore(DealCheckpointStore):
+    """Checkpoint store that lives as long as the process does."""
+
+    def __init__(self) -> None:
+        self._checkpoints: dict[str, str] = {}
+
+    async def load(self, key: str) -> DealCheckpoint | None:
+        data = self._checkpoints.get(key)
+        return DealCheckpoint.from_json(data) if data else None
+
+    async def save(self, key: str, checkpoint: DealCheckpoint) -> None:
+        self._checkpoints[key] = checkpoint.to_json()
+
+
+class SQLiteDealCheckpointStore(SQLiteStore, DealCheckpointStore):
+    """Checkpoint store persisted in a SQLite database."""
+
+    _schema = (
+        "CREATE TABLE IF NOT EXISTS deal_checkpoints (key TEXT PRIMARY KEY, data TEXT NOT NULL)",
+    )
+
+    async def load(self, key: str) -> DealCheckpoint | None:
+        def query(connection: sqlite3.Connection) -> str | None:
+            row = connection.execute(
+                "SELECT data FROM deal_checkpoints WHERE key = ?", (key,)
+            ).fetchone()
+            return row[0] if row else None
+
+        data = await self._run(query)
+        return DealCheckpoint.from_json(data) if data else None
+
+    async def save(self, key: str, checkpoint: DealCheckpoint) -> None:
+        data = checkpoint.to_json()
+
+        def query(connection: sqlite3.Connection) -> None:
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO deal_checkpoints VALUES (?, ?)", (key, data)
+                )
+
+        await self._run(query)
@@ -0,0 +1,367 @@
+"""Compact columnar container for chat message history."""
+
+from __future__ import annotations
+
+import uuid
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+
+from ..entities.chat import ChatMessage
+from ..entities.file import File
+from ..schemas import ChatMessageDirection
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+_DIRECTIONS = tuple(ChatMessageDirection)
+_DIRECTION_CODES = {direction: code for code, direction in enumerate(_DIRECTIONS)}
+
+# Bits of the `flags` column.
+_READ = 1
+_HAS_TEXT = 2
+_UUID_ID = 4
+
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _encode_id(message_id: str) -> tuple[bytes, bool]:
+    """Encode message id, canonical UUIDs take 16 bytes instead of 36."""
+    if len(message_id) == 36:
+        try:
+            value = uuid.UUID(message_id)
+        except ValueError:
+            pass
+        else:
+            if str(value) == message_id:
+                return value.bytes, True
+    return message_id.encode(), False
+
+
+def _id_hash(message_id: str) -> int:
+    return hash(message_id) & 0xFFFFFFFF
+
+
+class MessageHistory:
+    """Message history of a chat stored column by column.
+
+    Every message takes a few dozen bytes in flat arrays instead of a `ChatMessage`
+    with its `datetime`, strings and enum: send time is kept as int64 microseconds,
+    direction and flags as uint8, senders as indexes into a list of unique user ids,
+    and ids (16 bytes for UUIDs) and texts as slices of shared byte buffers.
+    `ChatMessage` objects are only built when a message is read, and without the
+    `User` entity.
+
+    Messages are kept sorted by send time, oldest first. Adding a message that is
+    already stored replaces it. Ids are looked up through a dict of id hash -> send
+    time, which stays valid when rows shift, and a binary search on send time.
+    """
+
+    __slots__ = (
+        "chat_id",
+        "_times",
+        "_garbage",
+        "_id_start",
+        "_id_len",
+        "_id_buffer",
+        "_text_start",
+        "_text_len",
+        "_text_buffer",
+        "_sent_at",
+        "_direction",
+        "_flags",
+        "_user",
+        "_users",
+        "_user_codes",
+        "_files",
+    )
+
+    def __init__(self, chat_id: str | None = None, messages: Iterable[ChatMessage] = ()) -> None:
+        self.chat_id = chat_id
+        # Id hash -> send time, a tuple of send times when hashes collide.
+        self._times: dict[int, int | tuple[int, ...]] = {}
+        # Buffer bytes no row points at anymore.
+        self._garbage = 0
+        self._id_start = array("I")
+        self._id_len = array("H")
+        self._id_buffer = bytearray()
+        self._text_start = array("I")
+        self._text_len = array("I")
+        self._text_buffer = bytearray()
+        self._sent_at = array("q")
+        self._direction = array("B")
+        self._flags = array("B")
+        self._user = array("i")
+        self._users: list[str] = []
+        self._user_codes: dict[str, int] = {}
+        # Attachments are rare, so they are kept aside by message id.
+        self._files: dict[str, File] = {}
+        self.extend(messages)
+
+    def __len__(self) -> int:
+        return len(self._sent_at)
+
+    def __contains__(self, message_id: object) -> bool:
+        return isinstance(message_id, str) and self.index_of(message_id) is not None
+
+    def __getitem__(self, index: int) -> ChatMessage:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("message index out of range")
+        return self._view(index)
+
+    def __iter__(self) -> Iterator[ChatMessage]:
+        """Iterate over messages, oldest first."""
+        for row in range(len(self)):
+            yield self._view(row)
+
+    def __reversed__(self) -> Iterator[ChatMessage]:
+        """Iterate over messages, newest first."""
+        for row in range(len(self) - 1, -1, -1):
+            yield self._view(row)
+
+    @property
+    def last_id(self) -> str | None:
+        """Id of the newest message."""
+        return self._id(len(self) - 1) if len(self) else None
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate number of bytes held by the columns and buffers."""
+        columns = (
+            self._id_start,
+            self._id_len,
+            self._text_start,
+            self._text_len,
+            self._sent_at,
+            self._direction,
+            self._flags,
+            self._user,
+        )
+        return (
+            sum(column.itemsize * len(column) for column in columns)
+            + len(self._id_buffer)
+            + len(self._text_buffer)
+            + sum(len(user_id) for user_id in self._users)
+        )
+
+    def index_of(self, message_id: str) -> int | None:
+        """Position of the message, None if it is not stored."""
+        times = self._times.get(_id_hash(message_id))
+        if times is None:
+            return None
+        encoded, is_uuid = _encode_id(message_id)
+        for sent_at in times if isinstance(times, tuple) else (times,):
+            row = bisect_left(self._sent_at, sent_at)
+            while row < len(self) and self._sent_at[row] == sent_at:
+                if self._id_bytes(row) == encoded and bool(self._flags[row] & _UUID_ID) == is_uuid:
+                    return row
+                row += 1
+        return None
+
+    def add(self, message: ChatMessage) -> None:
+        """Add a message, replacing the stored one with the same id."""
+        sent_at = _to_micros(message.sent_at)
+        row = self.index_of(message.id)
+        if row is not None and self._sent_at[row] != sent_at:
+            self._delete(row, message.id)
+            row = None
+
+        if row is None:
+            row = bisect_right(self._sent_at, sent_at)
+            self._insert(row, message, sent_at)
+        else:
+            self._store_text(row, message.text)
+            self._direction[row] = _DIRECTION_CODES[message.direction]
+            self._flags[row] = self._flags_of(message) | (self._flags[row] & _UUID_ID)
+            self._user[row] = self._user_code(message.user_id)
+
+        if message.file is not None:
+            self._files[message.id] = message.file
+        else:
+            self._files.pop(message.id, None)
+
+        if self._garbage > 4096 and self._garbage * 2 > len(self._id_buffer) + len(
+            self._text_buffer
+        ):
+            self._compact()
+
+    def extend(self, messages: Iterable[ChatMessage]) -> None:
+        """Add several messages in any order."""
+        for message in messages:
+            self.add(message)
+
+    def newest(self, limit: int | None = None) -> list[ChatMessage]:
+        """Newest messages, newest first."""
+        stop = len(self) if limit is None else min(limit, len(self))
+        return [self._view(len(self) - 1 - offset) for offset in range(stop)]
+
+    def filter(
+        self,
+        *,
+        direction: ChatMessageDirection | None = None,
+        user_id: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        is_read: bool | None = None,
+        text: str | None = None,
+    ) -> Iterator[ChatMessage]:
+        """Iterate over matching messages, oldest first.
+
+        Conditions are checked on the columns, only matching messages are built.
+
+        Args:
+            direction: Message direction
+            user_id: Sender id
+            since: Sent at or after this time
+            until: Sent before this time
+            is_read: Read state
+            text: Substring of the message text, case-sensitive
+        """
+        start = bisect_left(self._sent_at, _to_micros(since)) if since is not None else 0
+        stop = bisect_left(self._sent_at, _to_micros(until)) if until is not None else len(self)
+
+        direction_code = _DIRECTION_CODES[direction] if direction is not None else None
+        if user_id is not None:
+            user_code = self._user_codes.get(user_id)
+            if user_code is None:
+                return
+        encoded_text = text.encode() if text is not None else None
+
+        for row in range(start, stop):
+            if direction_code is not None and self._direction[row] != direction_code:
+                continue
+            if user_id is not None and self._user[row] != user_code:
+                continue
+            if is_read is not None and bool(self._flags[row] & _READ) != is_read:
+                continue
+            if encoded_text is not None and (
+                not self._flags[row] & _HAS_TEXT or encoded_text not in self._text_bytes(row)
+            ):
+                continue
+            yield self._view(row)
+
+    def count(self, *, direction: ChatMessageDirection | None = None) -> int:
+        """Number of messages, optionally of one direction."""
+        if direction is None:
+            return len(self)
+        return self._direction.count(_DIRECTION_CODES[direction])
+
+    def _insert(self, row: int, message: ChatMessage, sent_at: int) -> None:
+        encoded_id, is_uuid = _encode_id(message.id)
+        id_hash = _id_hash(message.id)
+        times = self._times.get(id_hash)
+        if times is None:
+            self._times[id_hash] = sent_at
+        else:
+            self._times[id_hash] = (*(times if isinstance(times, tuple) else (times,)), sent_at)
+        self._id_start.insert(row, len(self._id_buffer))
+        self._id_len.insert(row, len(encoded_id))
+        self._id_buffer += encoded_id
+        self._text_start.insert(row, 0)
+        self._text_len.insert(row, 0)
+        self._store_text(row, message.text)
+        self._sent_at.insert(row, sent_at)
+        self._direction.insert(row, _DIRECTION_CODES[message.direction])
+        self._flags.insert(row, self._flags_of(message) | (_UUID_ID if is_uuid else 0))
+        self._user.insert(row, self._user_code(message.user_id))
+
+    def _delete(self, row: int, message_id: str) -> None:
+        id_hash = _id_hash(message_id)
+        times = self._times.pop(id_hash)
+        if isinstance(times, tuple):
+            rest = list(times)
+            rest.remove(self._sent_at[row])
+            self._times[id_hash] = rest[0] if len(rest) == 1 else tuple(rest)
+        # Buffer bytes of the removed message are reclaimed by `_compact()`.
+        self._garbage += self._id_len[row] + self._text_len[row]
+        for column in (
+            self._id_start,
+            self._id_len,
+            self._text_start,
+            self._text_len,
+            self._sent_at,
+            self._direction,
+            self._flags,
+            self._user,
+        ):
+            del column[row]
+
+    def _store_text(self, row: int, text: str | None) -> None:
+        encoded = text.encode() if text else b""
+        if encoded and self._text_bytes(row) == encoded:
+            return
+        self._garbage += self._text_len[row]
+        self._text_start[row] = len(self._text_buffer)
+        self._text_len[row] = len(encoded)
+        self._text_buffer += encoded
+
+    def _compact(self) -> None:
+        """Copy the bytes rows point at into fresh buffers."""
+        id_buffer = bytearray()
+        text_buffer = bytearray()
+        for row in range(len(self)):
+            id_bytes = self._id_bytes(row)
+            self._id_start[row] = len(id_buffer)
+            id_buffer += id_bytes
+            text_bytes = self._text_bytes(row)
+            self._text_start[row] = len(text_buffer)
+            text_buffer += text_bytes
+        self._id_buffer = id_buffer
+        self._text_buffer = text_buffer
+        self._garbage = 0
+
+    @staticmethod
+    def _flags_of(message: ChatMessage) -> int:
+        flags = 0
+        if message.is_read:
+            flags |= _READ
+        if message.text is not None:
+            flags |= _HAS_TEXT
+        return flags
+
+    def _user_code(self, user_id: str | None) -> int:
+        if user_id is None:
+            return -1
+        code = self._user_codes.get(user_id)
+        if code is None:
+            code = self._user_codes[user_id] = len(self._users)
+            self._users.append(user_id)
+        return code
+
+    def _id_bytes(self, row: int) -> bytes:
+        start = self._id_start[row]
+        return bytes(self._id_buffer[start : start + self._id_len[row]])
+
+    def _id(self, row: int) -> str:
+        if self._flags[row] & _UUID_ID:
+            return str(uuid.UUID(bytes=self._id_bytes(row)))
+        return self._id_bytes(row).decode()
+
+    def _text_bytes(self, row: int) -> bytes:
+        start = self._text_start[row]
+        return bytes(self._text_buffer[start : start + self._text_len[row]])
+
+    def _view(self, row: int) -> ChatMessage:
+        message_id = self._id(row)
+        flags = self._flags[row]
+        user_code = self._user[row]
+        return ChatMessage(
+            id=message_id,
+            sent_at=_from_micros(self._sent_at[row]),
+            is_read=bool(flags & _READ),
+            text=self._text_bytes(row).decode() if flags & _HAS_TEXT else None,
+            file=self._files.get(message_id),
+            user_id=self._users[user_code] if user_code >= 0 else None,
+            chat_id=self.chat_id,
+            direction=_DIRECTIONS[self._direction[row]],
+        )
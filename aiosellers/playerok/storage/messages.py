@@ -0,0 +1,184 @@
+"""Local chat message stores used by `ChatMessagesAPI.sync()`."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from datetime import datetime
+
+from ..entities.chat import ChatMessage
+from ..entities.file import File
+from ..schemas import ChatMessageDirection
+from .history import MessageHistory
+from .sqlite import SQLiteStore
+
+
+class MessageStore(ABC):
+    """Base class for chat message stores.
+
+    Implement it to keep synced messages somewhere else (Redis, Postgres, ...)
+    and pass the instance as `PlayerokClientConfig.message_store`.
+    """
+
+    @abstractmethod
+    async def get_last_message_id(self, chat_id: str) -> str | None:
+        """Return the id of the newest stored message of the chat."""
+
+    @abstractmethod
+    async def filter_known(self, chat_id: str, message_ids: Iterable[str]) -> set[str]:
+        """Return the subset of `message_ids` that is already stored."""
+
+    @abstractmethod
+    async def add_messages(self, chat_id: str, messages: list[ChatMessage]) -> None:
+        """Store messages, already stored ones are replaced."""
+
+    @abstractmethod
+    async def get_messages(self, chat_id: str, *, limit: int | None = None) -> list[ChatMessage]:
+        """Return stored messages of the chat, newest first."""
+
+    async def close(self) -> None:
+        """Release resources held by the store."""
+
+
+class InMemoryMessageStore(MessageStore):
+    """Message store that lives as long as the process does.
+
+    Messages are kept in a compact `MessageHistory` per chat, so they are returned
+    without the `User` entity, only `user_id` is kept.
+    """
+
+    def __init__(self) -> None:
+        self._chats: dict[str, MessageHistory] = {}
+
+    def history(self, chat_id: str) -> MessageHistory:
+        """Stored history of the chat, for filtering without copying the messages."""
+        history = self._chats.get(chat_id)
+        if history is None:
+            history = self._chats[chat_id] = MessageHistory(chat_id)
+        return history
+
+    async def get_last_message_id(self, chat_id: str) -> str | None:
+        history = self._chats.get(chat_id)
+        return history.last_id if history is not None else None
+
+    async def filter_known(self, chat_id: str, message_ids: Iterable[str]) -> set[str]:
+        history = self._chats.get(chat_id)
+        if history is None:
+            return set()
+        return {message_id for message_id in message_ids if message_id in history}
+
+    async def add_messages(self, chat_id: str, messages: list[ChatMessage]) -> None:
+        self.history(chat_id).extend(messages)
+
+    async def get_messages(self, chat_id: str, *, limit: int | None = None) -> list[ChatMessage]:
+        history = self._chats.get(chat_id)
+        return history.newest(limit) if history is not None else []
+
+
+class SQLiteMessageStore(SQLiteStore, MessageStore):
+    """Message store persisted in a SQLite database.
+
+    Database calls run in a worker thread, so they never block the event loop.
+    Messages are stored without the `User` entity, only `user_id` is kept.
+    """
+
+    _schema = (
+        "CREATE TABLE IF NOT EXISTS chat_messages ("
+        " chat_id TEXT NOT NULL,"
+        " id TEXT NOT NULL,"
+        " sent_at TEXT NOT NULL,"
+        " is_read INTEGER NOT NULL,"
+        " text TEXT,"
+        " file TEXT,"
+        " user_id TEXT,"
+        " direction TEXT NOT NULL,"
+        " PRIMARY KEY (chat_id, id))",
+        "CREATE INDEX IF NOT EXISTS chat_messages_sent_at ON chat_messages (chat_id, sent_at)",
+    )
+
+    @staticmethod
+    def _to_row(chat_id: str, message: ChatMessage) -> tuple:
+        file = None
+        if message.file is not None:
+            file = json.dumps(
+                {
+                    "id": message.file.id,
+                    "url": message.file.url,
+                    "filename": message.file.filename,
+                    "mime": message.file.mime,
+                }
+            )
+        return (
+            chat_id,
+            message.id,
+            message.sent_at.isoformat(),
+            int(message.is_read),
+            message.text,
+            file,
+            message.user_id,
+            message.direction.value,
+        )
+
+    @staticmethod
+    def _from_row(row: tuple) -> ChatMessage:
+        chat_id, id, sent_at, is_read, text, file, user_id, direction = row
+        return ChatMessage(
+            id=id,
+            sent_at=datetime.fromisoformat(sent_at),
+            is_read=bool(is_read),
+            text=text,
+            file=File(**json.loads(file)) if file else None,
+            user_id=user_id,
+            chat_id=chat_id,
+            direction=ChatMessageDirection(direction),
+        )
+
+    async def get_last_message_id(self, chat_id: str) -> str | None:
+        def query(connection: sqlite3.Connection) -> str | None:
+            row = connection.execute(
+                "SELECT id FROM chat_messages WHERE chat_id = ? ORDER BY sent_at DESC LIMIT 1",
+                (chat_id,),
+            ).fetchone()
+            return row[0] if row else None
+
+        return await self._run(query)
+
+    async def filter_known(self, chat_id: str, message_ids: Iterable[str]) -> set[str]:
+        message_ids = list(message_ids)
+        if not message_ids:
+            return set()
+
+        def query(connection: sqlite3.Connection) -> set[str]:
+            placeholders = ",".join("?" * len(message_ids))
+            rows = connection.execute(
+                f"SELECT id FROM chat_messages WHERE chat_id = ? AND id IN ({placeholders})",
+                (chat_id, *message_ids),
+            ).fetchall()
+            return {row[0] for row in rows}
+
+        return await self._run(query)
+
+    async def add_messages(self, chat_id: str, messages: list[ChatMessage]) -> None:
+        if not messages:
+            return
+        rows = [self._to_row(chat_id, message) for message in messages]
+
+        def query(connection: sqlite3.Connection) -> None:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO chat_messages VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+
+        await self._run(query)
+
+    async def get_messages(self, chat_id: str, *, limit: int | None = None) -> list[ChatMessage]:
+        def query(connection: sqlite3.Connection) -> list[ChatMessage]:
+            rows = connection.execute(
+                "SELECT * FROM chat_messages WHERE chat_id = ? ORDER BY sent_at DESC LIMIT ?",
+                (chat_id, -1 if limit is None else limit),
+            ).fetchall()
+            return [self._from_row(row) for row in rows]
+
+        return await self._run(query)
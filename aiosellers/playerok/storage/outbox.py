@@ -0,0 +1,286 @@
+"""Durable log of mutations, replayed after a crash."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, TypeVar
+
+from ..schemas import enums
+from .sqlite import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# Set while a durable call or a replay runs, mutations it makes belong to that
+# entry and are not recorded again.
+_recording: contextvars.ContextVar[bool] = contextvars.ContextVar("_recording", default=False)
+
+_ENUMS = {
+    name: value
+    for name, value in vars(enums).items()
+    if isinstance(value, type) and issubclass(value, Enum)
+}
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, Enum) and type(value).__name__ in _ENUMS:
+        return {"__enum__": type(value).__name__, "name": value.name}
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, dict):
+        return {str(k): _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"{type(value).__name__} can't be recorded in the outbox")
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "__enum__" in value:
+            return _ENUMS[value["__enum__"]][value["name"]]
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+@dataclass(slots=True)
+class OutboxEntry:
+    """Mutation that was recorded but not marked complete.
+
+    Attributes:
+        id: Entry id
+        service: Raw service name, e.g. "items"
+        method: Method of the service, e.g. "update_item"
+        arguments: Keyword arguments of the call
+        created_at: Unix time the call was recorded
+    """
+
+    id: str
+    service: str
+    method: str
+    arguments: dict[str, Any]
+    created_at: float
+
+
+class Outbox(ABC):
+    """Base class for mutation outboxes.
+
+    Pass the instance as `PlayerokClientConfig.outbox`. Raw mutations are recorded
+    before they are sent and marked complete once the server answered (or failed),
+    entries left over by a crash are sent again by `Playerok.start()`. A crash after
+    the server answered but before the completion was written replays the call once
+    more, so delivery is at least once. That's why only mutations that are safe to
+    repeat are recorded (listing edits and removals, read marks), never ones that
+    create deals, listings or messages, spend balance, or move a deal to another
+    status (replayed after the deal moved on, that would be a wrong transition).
+
+    Attributes:
+        max_age: Entries older than this many seconds are dropped instead of
+            replayed, None replays every entry
+    """
+
+    max_age: float | None = None
+
+    @abstractmethod
+    async def record(self, service: str, method: str, arguments: dict[str, Any]) -> str:
+        """Durably record a call, returns the entry id."""
+
+    @abstractmethod
+    def complete(self, entry_id: str) -> None:
+        """Mark an entry complete, may be written lazily."""
+
+    @abstractmethod
+    async def pending(self) -> list[OutboxEntry]:
+        """Entries not marked complete, oldest first."""
+
+    async def close(self) -> None:
+        """Write buffered completions and release resources."""
+
+
+class SQLiteOutbox(SQLiteStore, Outbox):
+    """Outbox persisted in a SQLite database in WAL mode.
+
+    Records issued while a write is in flight are committed together in the next
+    transaction (group commit), so concurrent mutations share one fsync. Completions
+    are not awaited, they ride along with the next write.
+    """
+
+    _schema = (
+        "CREATE TABLE IF NOT EXISTS outbox ("
+        " id TEXT PRIMARY KEY,"
+        " service TEXT NOT NULL,"
+        " method TEXT NOT NULL,"
+        " arguments TEXT NOT NULL,"
+        " created_at REAL NOT NULL)",
+    )
+
+    def __init__(self, path: str | Path, *, max_age: float | None = 3600.0) -> None:
+        """Initialize outbox.
+
+        Args:
+            path: Database file
+            max_age: Seconds after which a pending entry is too stale to replay
+        """
+        super().__init__(path)
+        self.max_age = max_age
+        self._records: list[tuple[tuple, asyncio.Future]] = []
+        self._completed: list[str] = []
+        self._flush_task: asyncio.Task | None = None
+        self.commits = 0
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        try:
+            while self._records or self._completed:
+                records, self._records = self._records, []
+                completed, self._completed = self._completed, []
+                rows = [row for row, _ in records]
+
+                def write(connection: sqlite3.Connection) -> None:
+                    with connection:
+                        connection.executemany("INSERT INTO outbox VALUES (?, ?, ?, ?, ?)", rows)
+                        connection.executemany(
+                            "DELETE FROM outbox WHERE id = ?", [(i,) for i in completed]
+                        )
+
+                try:
+                    await self._run(write)
+                except Exception as exc:
+                    # Kept for the next write, otherwise finished calls get replayed.
+                    self._completed[:0] = completed
+                    for _, future in records:
+                        if not future.done():
+                            future.set_exception(exc)
+                    if not self._records:
+                        break
+                    continue
+                self.commits += 1
+                for _, future in records:
+                    if not future.done():
+                        future.set_result(None)
+        finally:
+            self._flush_task = None
+
+    async def record(self, service: str, method: str, arguments: dict[str, Any]) -> str:
+        entry_id = uuid.uuid4().hex
+        row = (entry_id, service, method, json.dumps(arguments), time.time())
+        future = asyncio.get_running_loop().create_future()
+        self._records.append((row, future))
+        self._schedule_flush()
+        await future
+        return entry_id
+
+    def complete(self, entry_id: str) -> None:
+        self._completed.append(entry_id)
+        self._schedule_flush()
+
+    async def pending(self) -> list[OutboxEntry]:
+        def query(connection: sqlite3.Connection) -> list[OutboxEntry]:
+            rows = connection.execute(
+                "SELECT id, service, method, arguments, created_at FROM outbox ORDER BY created_at"
+            ).fetchall()
+            return [
+                OutboxEntry(id, service, method, _decode(json.loads(arguments)), created_at)
+                for id, service, method, arguments, created_at in rows
+            ]
+
+        return await self._run(query)
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            await self._flush_task
+        await self._flush()
+        await super().close()
+
+
+def durable(method: F) -> F:
+    """Record calls of a raw service mutation in the service's outbox, if it has one.
+
+    Only for mutations that are safe to send twice, see `Outbox`. Calls with
+    arguments that can't be stored are sent without recording.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        outbox: Outbox | None = self._outbox
+        if outbox is None or _recording.get():
+            return await method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        arguments = dict(bound.arguments)
+        del arguments["self"]
+        try:
+            encoded = _encode(arguments)
+        except TypeError:
+            return await method(self, *args, **kwargs)
+
+        entry_id = await outbox.record(self._outbox_name, method.__name__, encoded)
+        token = _recording.set(True)
+        try:
+            result = await method(self, *args, **kwargs)
+        except asyncio.CancelledError:
+            # Left pending like a crash mid-call, the entry is replayed on the next start.
+            raise
+        except Exception:
+            outbox.complete(entry_id)
+            raise
+        finally:
+            _recording.reset(token)
+        outbox.complete(entry_id)
+        return result
+
+    wrapper._durable = True
+    return wrapper  # type: ignore[return-value]
+
+
+async def replay(services: dict[str, Any], outbox: Outbox) -> list[OutboxEntry]:
+    """Send pending entries again, oldest first, returns the replayed entries.
+
+    Every entry is marked complete after its call, also when the call fails, so a
+    mutation the server rejects is not retried forever. Entries older than
+    `outbox.max_age`, or of methods that are no longer `durable`, are marked
+    complete without being sent.
+    """
+    entries = []
+    now = time.time()
+    for entry in await outbox.pending():
+        func = getattr(services.get(entry.service), entry.method, None)
+        if not getattr(func, "_durable", False):
+            logger.warning("Dropped outbox entry of %s.%s", entry.service, entry.method)
+            outbox.complete(entry.id)
+            continue
+        if outbox.max_age is not None and now - entry.created_at > outbox.max_age:
+            logger.warning("Dropped stale outbox entry %s.%s", entry.service, entry.method)
+            outbox.complete(entry.id)
+            continue
+        entries.append(entry)
+        token = _recording.set(True)
+        try:
+            await func(**entry.arguments)
+        except Exception:
+            logger.exception("Replay of %s.%s failed", entry.service, entry.method)
+        finally:
+            _recording.reset(token)
+        outbox.complete(entry.id)
+    return entries
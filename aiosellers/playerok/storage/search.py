@@ -0,0 +1,319 @@
+"""Local full-text indexes over own listings and chat messages."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import re
+import sqlite3
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+
+from .sqlite import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.casefold())
+
+
+class DocumentKind(StrEnum):
+    ITEM = "ITEM"
+    MESSAGE = "MESSAGE"
+
+
+@dataclass(slots=True)
+class SearchHit:
+    """Document matching a search query.
+
+    Attributes:
+        kind: Kind of the document
+        id: Item or message id
+        score: Relevance, higher is better
+        text: Indexed text
+        chat_id: Chat of the message, None for items
+    """
+
+    kind: DocumentKind
+    id: str
+    score: float
+    text: str
+    chat_id: str | None = None
+
+
+class SearchIndex(ABC):
+    """Base class for full-text indexes.
+
+    Documents are added while payloads are decoded, so adding is synchronous and
+    must be cheap, implementations may buffer documents until `flush()`.
+    Pass the instance as `PlayerokClientConfig.search_index`.
+    """
+
+    @abstractmethod
+    def add_item(self, item_id: str, name: str | None, description: str | None) -> None:
+        """Index a listing, a listing with the same id is replaced."""
+
+    @abstractmethod
+    def add_message(self, message_id: str, chat_id: str, text: str) -> None:
+        """Index a chat message, a message with the same id is replaced."""
+
+    @abstractmethod
+    def remove(self, kind: DocumentKind, doc_id: str) -> None:
+        """Remove a document from the index."""
+
+    @abstractmethod
+    async def search(
+        self,
+        query: str,
+        *,
+        kind: DocumentKind | None = None,
+        chat_id: str | None = None,
+        limit: int = 20,
+    ) -> list[SearchHit]:
+        """Documents containing every word of the query, most relevant first."""
+
+    async def flush(self) -> None:
+        """Write buffered documents."""
+
+    async def close(self) -> None:
+        """Release resources held by the index."""
+
+
+def _item_text(name: str | None, description: str | None) -> str:
+    return "\n".join(part for part in (name, description) if part)
+
+
+class InMemorySearchIndex(SearchIndex):
+    """Inverted index that lives as long as the process does, ranked with BM25."""
+
+    def __init__(self, *, k1: float = 1.2, b: float = 0.75) -> None:
+        self._k1 = k1
+        self._b = b
+        # token -> document -> term frequency
+        self._postings: dict[str, dict[tuple[DocumentKind, str], int]] = {}
+        # document -> (text, chat_id, token count)
+        self._documents: dict[tuple[DocumentKind, str], tuple[str, str | None, int]] = {}
+        self._total_tokens = 0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _add(self, key: tuple[DocumentKind, str], text: str, chat_id: str | None) -> None:
+        previous = self._documents.get(key)
+        if previous is not None and previous[0] == text:
+            return
+        self._remove(key)
+
+        tokens = _tokenize(text)
+        if not tokens:
+            return
+        frequencies: dict[str, int] = {}
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0) + 1
+        for token, frequency in frequencies.items():
+            self._postings.setdefault(token, {})[key] = frequency
+        self._documents[key] = (text, chat_id, len(tokens))
+        self._total_tokens += len(tokens)
+
+    def _remove(self, key: tuple[DocumentKind, str]) -> None:
+        document = self._documents.pop(key, None)
+        if document is None:
+            return
+        self._total_tokens -= document[2]
+        for token in set(_tokenize(document[0])):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[token]
+
+    def add_item(self, item_id: str, name: str | None, description: str | None) -> None:
+        self._add((DocumentKind.ITEM, item_id), _item_text(name, description), None)
+
+    def add_message(self, message_id: str, chat_id: str, text: str) -> None:
+        self._add((DocumentKind.MESSAGE, message_id), text, chat_id)
+
+    def remove(self, kind: DocumentKind, doc_id: str) -> None:
+        self._remove((kind, doc_id))
+
+    async def search(
+        self,
+        query: str,
+        *,
+        kind: DocumentKind | None = None,
+        chat_id: str | None = None,
+        limit: int = 20,
+    ) -> list[SearchHit]:
+        tokens = list(dict.fromkeys(_tokenize(query)))
+        if not tokens or not self._documents:
+            return []
+        postings = [self._postings.get(token) for token in tokens]
+        if not all(postings):
+            return []
+
+        # Walk the rarest token's documents, the others are dict lookups.
+        postings.sort(key=len)
+        count = len(self._documents)
+        average = self._total_tokens / count
+        hits = []
+        for key in postings[0]:
+            if kind is not None and key[0] != kind:
+                continue
+            text, doc_chat_id, length = self._documents[key]
+            if chat_id is not None and doc_chat_id != chat_id:
+                continue
+            score = 0.0
+            for token_postings in postings:
+                frequency = token_postings.get(key)
+                if frequency is None:
+                    break
+                idf = math.log(
+                    1 + (count - len(token_postings) + 0.5) / (len(token_postings) + 0.5)
+                )
+                norm = self._k1 * (1 - self._b + self._b * length / average)
+                score += idf * frequency * (self._k1 + 1) / (frequency + norm)
+            else:
+                hits.append(SearchHit(key[0], key[1], score, text, doc_chat_id))
+
+        hits.sort(key=lambda hit: hit.score, reverse=True)
+        return hits[:limit]
+
+
+class SQLiteSearchIndex(SQLiteStore, SearchIndex):
+    """Full-text index persisted in a SQLite FTS5 table.
+
+    Added documents are buffered and written in one transaction when `flush()` is
+    called, before every search, or once `batch_size` documents are pending.
+    Database calls run in a worker thread, so they never block the event loop.
+    Documents of a failed write stay buffered for the next flush.
+    """
+
+    _schema = (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents USING fts5("
+        " kind UNINDEXED, id UNINDEXED, chat_id UNINDEXED, text,"
+        " tokenize = 'unicode61 remove_diacritics 2')",
+        # FTS5 can't look rows up by unindexed columns, keys map to rowids instead.
+        "CREATE TABLE IF NOT EXISTS search_keys ("
+        " doc INTEGER PRIMARY KEY, kind TEXT NOT NULL, id TEXT NOT NULL,"
+        " UNIQUE (kind, id))",
+    )
+
+    def __init__(self, path: str | Path, *, batch_size: int = 500) -> None:
+        super().__init__(path)
+        self._batch_size = batch_size
+        # (kind, id) -> (chat_id, text), None text removes the document
+        self._pending: dict[tuple[str, str], tuple[str | None, str | None]] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    def _queue(
+        self, kind: DocumentKind, doc_id: str, chat_id: str | None, text: str | None
+    ) -> None:
+        self._pending[(kind.value, doc_id)] = (chat_id, text)
+        if len(self._pending) >= self._batch_size and self._flush_task is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            self._flush_task = loop.create_task(self.flush())
+            self._flush_task.add_done_callback(self._flushed)
+
+    def _flushed(self, task: asyncio.Task) -> None:
+        self._flush_task = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Search index flush failed", exc_info=task.exception())
+
+    def add_item(self, item_id: str, name: str | None, description: str | None) -> None:
+        self._queue(DocumentKind.ITEM, item_id, None, _item_text(name, description))
+
+    def add_message(self, message_id: str, chat_id: str, text: str) -> None:
+        self._queue(DocumentKind.MESSAGE, message_id, chat_id, text)
+
+    def remove(self, kind: DocumentKind, doc_id: str) -> None:
+        self._queue(kind, doc_id, None, None)
+
+    async def flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        def query(connection: sqlite3.Connection) -> None:
+            with connection:
+                for (kind, doc_id), (chat_id, text) in pending.items():
+                    row = connection.execute(
+                        "SELECT doc FROM search_keys WHERE kind = ? AND id = ?", (kind, doc_id)
+                    ).fetchone()
+                    if row is not None:
+                        connection.execute("DELETE FROM search_documents WHERE rowid = ?", row)
+                    if not text:
+                        if row is not None:
+                            connection.execute("DELETE FROM search_keys WHERE doc = ?", row)
+                        continue
+                    if row is None:
+                        row = (
+                            connection.execute(
+                                "INSERT INTO search_keys (kind, id) VALUES (?, ?)", (kind, doc_id)
+                            ).lastrowid,
+                        )
+                    connection.execute(
+                        "INSERT INTO search_documents (rowid, kind, id, chat_id, text)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (row[0], kind, doc_id, chat_id, text),
+                    )
+
+        try:
+            await self._run(query)
+        except BaseException:
+            # Documents queued since are newer and win.
+            for key, value in pending.items():
+                self._pending.setdefault(key, value)
+            raise
+
+    async def search(
+        self,
+        query: str,
+        *,
+        kind: DocumentKind | None = None,
+        chat_id: str | None = None,
+        limit: int = 20,
+    ) -> list[SearchHit]:
+        tokens = list(dict.fromkeys(_tokenize(query)))
+        if not tokens:
+            return []
+        await self.flush()
+
+        # Quoted tokens keep FTS5 operators in user input from being interpreted.
+        match = " AND ".join(f'"{token}"' for token in tokens)
+        sql = (
+            "SELECT kind, id, -bm25(search_documents), text, chat_id FROM search_documents"
+            " WHERE search_documents MATCH ?"
+        )
+        params: list = [match]
+        if kind is not None:
+            sql += " AND kind = ?"
+            params.append(kind.value)
+        if chat_id is not None:
+            sql += " AND chat_id = ?"
+            params.append(chat_id)
+        sql += " ORDER BY bm25(search_documents) LIMIT ?"
+        params.append(limit)
+
+        def run(connection: sqlite3.Connection) -> list[SearchHit]:
+            rows = connection.execute(sql, params).fetchall()
+            return [
+                SearchHit(DocumentKind(kind), doc_id, score, text, chat_id)
+                for kind, doc_id, score, text, chat_id in rows
+            ]
+
+        return await self._run(run)
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        await self.flush()
+        await super().close()
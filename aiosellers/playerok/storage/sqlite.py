@@ -0,0 +1,49 @@
+"""Shared plumbing of the SQLite-backed stores."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SQLiteStore:
+    """Lazily opened SQLite connection in WAL mode, used from worker threads.
+
+    Subclasses list their DDL in `_schema`. The connection is opened and the schema
+    created on first use, inside the worker thread like every query, so nothing
+    touches the disk on the event loop. Queries run one at a time.
+    """
+
+    _schema: tuple[str, ...] = ()
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = str(path)
+        self._connection: sqlite3.Connection | None = None
+        self._lock = asyncio.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self._path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            for statement in self._schema:
+                connection.execute(statement)
+            self._connection = connection
+        return self._connection
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        def call() -> T:
+            return func(self._connect(), *args)
+
+        async with self._lock:
+            return await asyncio.to_thread(call)
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
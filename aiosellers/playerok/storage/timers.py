@@ -0,0 +1,85 @@
+"""Timer stores used by `DeadlineScheduler`."""
+
+from __future__ import annotations
+
+import sqlite3
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from .sqlite import SQLiteStore
+
+
+@dataclass(slots=True)
+class StoredTimer:
+    """Pending timer.
+
+    Attributes:
+        key: Unique timer key
+        due: Unix time the timer fires at
+        action: Name of the registered action to run
+        payload: Argument passed to the action, e.g. a deal id
+    """
+
+    key: str
+    due: float
+    action: str
+    payload: str | None = None
+
+
+class TimerStore(ABC):
+    """Base class for timer stores."""
+
+    @abstractmethod
+    async def load(self) -> list[StoredTimer]:
+        """Return every saved timer."""
+
+    @abstractmethod
+    async def save(self, timers: list[StoredTimer], removed: list[str]) -> None:
+        """Save timers, replacing ones with the same key, and delete `removed` keys."""
+
+    async def close(self) -> None:
+        """Release resources held by the store."""
+
+
+class InMemoryTimerStore(TimerStore):
+    """Timer store that lives as long as the process does."""
+
+    def __init__(self) -> None:
+        self._timers: dict[str, StoredTimer] = {}
+
+    async def load(self) -> list[StoredTimer]:
+        return list(self._timers.values())
+
+    async def save(self, timers: list[StoredTimer], removed: list[str]) -> None:
+        for key in removed:
+            self._timers.pop(key, None)
+        for timer in timers:
+            self._timers[timer.key] = timer
+
+
+class SQLiteTimerStore(SQLiteStore, TimerStore):
+    """Timer store persisted in a SQLite database."""
+
+    _schema = (
+        "CREATE TABLE IF NOT EXISTS timers ("
+        " key TEXT PRIMARY KEY, due REAL NOT NULL, action TEXT NOT NULL, payload TEXT)",
+    )
+
+    async def load(self) -> list[StoredTimer]:
+        def query(connection: sqlite3.Connection) -> list[StoredTimer]:
+            rows = connection.execute("SELECT key, due, action, payload FROM timers").fetchall()
+            return [StoredTimer(*row) for row in rows]
+
+        return await self._run(query)
+
+    async def save(self, timers: list[StoredTimer], removed: list[str]) -> None:
+        if not timers and not removed:
+            return
+        rows = [(timer.key, timer.due, timer.action, timer.payload) for timer in timers]
+
+        def query(connection: sqlite3.Connection) -> None:
+            with connection:
+                connection.executemany("DELETE FROM timers WHERE key = ?", [(k,) for k in removed])
+                connection.executemany("INSERT OR REPLACE INTO timers VALUES (?, ?, ?, ?)", rows)
+
+        await self._run(query)
@@ -4,6 +4,7 @@ from typing import Any, Literal
 from ..core.config import PlayerokConfig
 from ..core.constants import CLOUDFLARE_SIGNATURES
 from ..core.exceptions import CloudflareDetected
+from ..core.utils import _intern_strings
 
 
 class PlayerokTransport:
@@ -77,5 +78,12 @@ class PlayerokTransport:
         self._raise_if_cloudflare(response)
         return response
 
+    def decode(self, response: Any) -> Any:
+        """Decode JSON body of the response."""
+        data = response.json()
+        if self._config.intern_strings:
+            _intern_strings(data)
+        return data
+
     async def close(self) -> None:
         await self._client.aclose()
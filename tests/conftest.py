@@ -0,0 +1,14 @@
+from types import SimpleNamespace
+
+import pytest
+
+from aiosellers.playerok import Playerok
+
+
+@pytest.fixture
+def client() -> Playerok:
+    """Client that never touches the network, tests replace `client._raw` services."""
+    client = Playerok("token")
+    client._me_id = "me"
+    client._raw = SimpleNamespace()
+    return client
@@ -0,0 +1,52 @@
+import asyncio
+from types import SimpleNamespace
+
+from aiosellers.playerok.schemas import UserProfile
+
+
+def _profile(**fields) -> UserProfile:
+    return UserProfile.model_validate({"id": "u1", "username": "seller", **fields})
+
+
+def test_hydrate_user_shares_one_instance(client):
+    first = client.account._hydrate_user(_profile())
+    second = client.account._hydrate_user(_profile())
+
+    assert first is second
+    assert client.account._get_cached("u1") is first
+
+
+def test_hydrate_user_keeps_fields_missing_from_partial_payload(client):
+    user = client.account._hydrate_user(
+        _profile(avatarURL="https://cdn/a.png", rating=4.5, testimonialCounter=10)
+    )
+
+    # A smaller payload (e.g. a chat participant) without avatar and rating.
+    client.account._hydrate_user(_profile(username="renamed", isOnline=True))
+
+    assert user.username == "renamed"
+    assert user.is_online is True
+    assert user.avatar_url == "https://cdn/a.png"
+    assert user.rating == 4.5
+    assert user.reviews_count == 10
+
+
+def test_hydrate_user_ignores_explicit_nulls(client):
+    user = client.account._hydrate_user(_profile(rating=4.5))
+
+    client.account._hydrate_user(_profile(rating=None))
+
+    assert user.rating == 4.5
+
+
+def test_refreshed_profile_updates_the_shared_instance(client):
+    held = client.account._hydrate_user(_profile(rating=4.5))
+
+    async def get_user(id=None, username=None):
+        return _profile(username="renamed", rating=4.9)
+
+    client._raw.account = SimpleNamespace(get_user=get_user)
+    refreshed = asyncio.run(client.account.get_user("u1", force_refresh=True))
+
+    assert refreshed is held
+    assert (held.username, held.rating) == ("renamed", 4.9)
@@ -0,0 +1,124 @@
+import asyncio
+from types import SimpleNamespace
+
+from aiosellers.playerok.core.price_tiers import PriceTierCache
+from aiosellers.playerok.market import BoostScheduler
+from aiosellers.playerok.schemas.enums import ItemStatuses, PriorityTypes
+
+
+def _status(id, price, low=None, high=None, period=24):
+    return SimpleNamespace(
+        id=id,
+        price=price,
+        type=PriorityTypes.PREMIUM,
+        period=period,
+        price_range=SimpleNamespace(min=low, max=high),
+    )
+
+
+def _listing(id, position, price=100, category_id="c1"):
+    return SimpleNamespace(
+        id=id,
+        price=price,
+        status=ItemStatuses.APPROVED,
+        priority_position=position,
+        category_id=category_id,
+    )
+
+
+def test_cache_answers_prices_of_the_same_tier_and_scope():
+    cache = PriceTierCache()
+    statuses = [_status("premium", 50, 100, 499), _status("normal", 10, 0, 999)]
+    cache.put("c1", 150, statuses)
+
+    assert cache.get("c1", 100) is statuses
+    assert cache.get("c1", 499) is statuses
+    assert cache.get("c1", 500) is None
+    assert cache.get("c2", 150) is None
+
+
+def test_cache_keeps_only_the_price_when_ranges_miss_it():
+    cache = PriceTierCache()
+    cache.put("c1", 50, [_status("premium", 50, 100, 499)])
+
+    assert cache.get("c1", 50) is not None
+    assert cache.get("c1", 51) is None
+
+
+def test_cache_replaces_overlapping_tiers_and_expires_them():
+    cache = PriceTierCache()
+    cache.put("c1", 150, [_status("old", 50, 100, 199)])
+    fresh = [_status("new", 60, 150, 299)]
+    cache.put("c1", 200, fresh)
+
+    assert cache.get("c1", 120) is None
+    assert cache.get("c1", 160) is fresh
+
+    expired = PriceTierCache(ttl=0)
+    expired.put("c1", 150, fresh)
+    expired._tiers["c1"] = [(low, high, 0.0, s) for low, high, _, s in expired._tiers["c1"]]
+    assert expired.get("c1", 150) is None
+
+
+def _fake_priority(client, statuses):
+    requested, bought = [], []
+
+    async def get_item_priority_statuses(item_id, price):
+        requested.append((item_id, price))
+        return statuses
+
+    async def increase_item_priority_status(*, item_id, priority_status_id):
+        bought.append((item_id, priority_status_id))
+
+    client._raw.items = SimpleNamespace(
+        get_item_priority_statuses=get_item_priority_statuses,
+        increase_item_priority_status=increase_item_priority_status,
+    )
+    return requested, bought
+
+
+def test_plan_boosts_the_lowest_listings_within_the_budget(client):
+    requested, _ = _fake_priority(
+        client, [_status("premium", 40, 0, 999), _status("normal", 10, 0, 999)]
+    )
+    items = [_listing("top", 1), _listing("mid", 5), _listing("low", 20), _listing("far", 50)]
+
+    plans = asyncio.run(BoostScheduler(client, budget=100).plan(items))
+
+    assert [plan.item_id for plan in plans] == ["far", "low"]
+    assert sum(plan.cost for plan in plans) == 80
+    # One request for the price tier, the other listings are answered by the cache.
+    assert requested == [("far", 100)]
+
+
+def test_boosted_listing_is_not_boosted_again(client):
+    _, bought = _fake_priority(client, [_status("premium", 40, 0, 999)])
+    items = [_listing("1", 10), _listing("2", 10)]
+
+    async def main():
+        scheduler = BoostScheduler(client, budget=1000, batch_size=1)
+        first = await scheduler.run(items)
+        second = await scheduler.run(items)
+        return scheduler, first, second
+
+    scheduler, first, second = asyncio.run(main())
+
+    assert bought == [("1", "premium"), ("2", "premium")]
+    assert first.spent == 80
+    assert first.failed == {}
+    assert second.boosted == []
+    assert scheduler.is_active("1")
+
+
+def test_bought_status_expires_after_its_period(client):
+    _fake_priority(client, [_status("premium", 40, 0, 999, period=0)])
+
+    async def main():
+        scheduler = BoostScheduler(client, budget=1000, period_unit=3600)
+        result = await scheduler.run([_listing("1", 10)])
+        return scheduler, result
+
+    scheduler, result = asyncio.run(main())
+
+    assert [plan.item_id for plan in result.boosted] == ["1"]
+    assert not scheduler.is_active("1")
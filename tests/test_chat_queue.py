@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+
+def _fake_chats(client, *, fail=()):
+    calls = []
+    gate = asyncio.Event()
+
+    async def mark_as_read(chat_id):
+        calls.append(("mark", chat_id))
+
+    async def send_message(chat_id, *, text=None, photo=None):
+        calls.append((chat_id, text))
+        if text == "wait":
+            await gate.wait()
+        if text in fail:
+            raise ConnectionError(text)
+        return text
+
+    client.chats.mark_as_read = mark_as_read
+    client.chats.send_message = send_message
+    return calls, gate
+
+
+def test_read_marks_of_a_batch_are_coalesced(client):
+    async def main():
+        calls, gate = _fake_chats(client)
+        queue = client.chats.queue
+        first = await queue.put("c1", text="wait")
+        await asyncio.sleep(0)
+        # Queued while the first message is being sent, so they form one batch.
+        rest = [await queue.put("c1", text=text, mark_as_read=True) for text in "abc"]
+        gate.set()
+        await queue.join()
+        return calls, [await future for future in (first, *rest)], queue.stats()
+
+    calls, sent, stats = asyncio.run(main())
+
+    assert calls == [("c1", "wait"), ("mark", "c1"), ("c1", "a"), ("c1", "b"), ("c1", "c")]
+    assert sent == ["wait", "a", "b", "c"]
+    assert (stats.sent, stats.read_marks_coalesced, stats.pending) == (4, 2, 0)
+
+
+def test_failed_message_fails_only_its_own_future(client):
+    async def main():
+        calls, _ = _fake_chats(client, fail={"b"})
+        queue = client.chats.queue
+        futures = [await queue.put("c1", text=text) for text in "abc"]
+        other = await queue.send("c2", text="d")
+        await queue.join()
+        return calls, futures, other, queue.stats()
+
+    calls, futures, other, stats = asyncio.run(main())
+
+    assert [call for call in calls if call[0] == "c1"] == [("c1", "a"), ("c1", "b"), ("c1", "c")]
+    assert futures[0].result() == "a"
+    assert isinstance(futures[1].exception(), ConnectionError)
+    assert futures[2].result() == "c"
+    assert other == "d"
+    assert (stats.sent, stats.failed, stats.active_chats) == (3, 1, 0)
+
+
+def test_cancelled_close_cancels_waiting_callers(client):
+    async def main():
+        _fake_chats(client)
+        queue = client.chats.queue
+        futures = [await queue.put("c1", text=text) for text in ("wait", "a")]
+        await asyncio.sleep(0)
+        await queue.close(cancel=True)
+        return futures, queue.stats()
+
+    futures, stats = asyncio.run(main())
+
+    for future in futures:
+        with pytest.raises(asyncio.CancelledError):
+            future.result()
+    assert (stats.pending, stats.in_flight, stats.active_chats) == (0, 0, 0)
@@ -0,0 +1,103 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from aiosellers.playerok.schemas.enums import ChatTypes, ItemDealStatuses
+
+
+def _fail_for(client, failing):
+    marked = []
+
+    async def mark_chat_as_read(chat_id):
+        if chat_id in failing:
+            raise ConnectionError(chat_id)
+        marked.append(chat_id)
+
+    client._raw.chats = SimpleNamespace(mark_chat_as_read=mark_chat_as_read)
+    return marked
+
+
+def test_failed_read_marks_stay_deferred(client):
+    marked = _fail_for(client, {"bad"})
+
+    async def main():
+        for chat_id in ("a", "bad", "b"):
+            await client.chats.mark_as_read(chat_id, defer=True)
+        with pytest.raises(ConnectionError):
+            await client.chats.flush_read_marks()
+
+    asyncio.run(main())
+
+    assert sorted(marked) == ["a", "b"]
+    assert client.chats._read_state.take_deferred() == ["bad"]
+
+
+def test_close_releases_resources_when_the_flush_fails(client):
+    _fail_for(client, {"bad"})
+    closed = []
+
+    async def close_transport():
+        closed.append("transport")
+
+    async def close_store():
+        closed.append("store")
+
+    client._transport = SimpleNamespace(close=close_transport)
+    client._message_store.close = close_store
+
+    async def main():
+        await client.chats.mark_as_read("bad", defer=True)
+        with pytest.raises(ConnectionError):
+            await client.close()
+
+    asyncio.run(main())
+
+    assert closed == ["store", "transport"]
+    assert client._transport is None
+
+
+def _chat_schema(*deal_ids):
+    return SimpleNamespace(
+        id="c1",
+        type=ChatTypes.PM,
+        unread_messages_counter=0,
+        users=[],
+        deals=[
+            SimpleNamespace(
+                id=deal_id,
+                status=ItemDealStatuses.PAID,
+                status_expiration_date=None,
+                created_at=None,
+                user=None,
+                chat=None,
+                item=None,
+            )
+            for deal_id in deal_ids
+        ],
+    )
+
+
+def test_chat_deals_come_from_the_chat_payload_until_stale(client):
+    fetched = []
+
+    async def get_chat(chat_id):
+        fetched.append(chat_id)
+        return _chat_schema("d1", "d2")
+
+    client._raw.chats = SimpleNamespace(get_chat=get_chat)
+    chat = client.chats._create_chat(_chat_schema("d1"))
+
+    async def main():
+        reused = await chat.get_deals()
+        await asyncio.sleep(0.01)
+        refreshed = await chat.get_deals(max_age=0)
+        return reused, refreshed
+
+    reused, refreshed = asyncio.run(main())
+
+    assert [deal.id for deal in reused] == ["d1"]
+    assert reused[0].chat_id == "c1"
+    assert [deal.id for deal in refreshed] == ["d1", "d2"]
+    assert refreshed[0] is reused[0]
+    assert fetched == ["c1"]
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from aiosellers.playerok.core.dataloader import DataLoader
+
+
+def _loader(calls, **kwargs):
+    async def batch_fn(keys):
+        calls.append(list(keys))
+        await asyncio.sleep(0)
+        return {key: ValueError(key) if key.startswith("bad") else key.upper() for key in keys}
+
+    return DataLoader(batch_fn, **kwargs)
+
+
+def test_loads_in_one_tick_share_a_batch():
+    calls = []
+
+    async def main():
+        loader = _loader(calls, max_batch_size=2)
+        return await asyncio.gather(loader.load("a"), loader.load("b"), loader.load("c"))
+
+    assert asyncio.run(main()) == ["A", "B", "C"]
+    assert calls == [["a", "b"], ["c"]]
+
+
+def test_duplicate_and_cached_keys_are_not_requested_again():
+    calls = []
+
+    async def main():
+        loader = _loader(calls, cache_lookup={"cached": "hit"}.get)
+        return await loader.load_many(["a", "a", "cached"])
+
+    assert asyncio.run(main()) == ["A", "A", "hit"]
+    assert calls == [["a"]]
+
+
+def test_failed_key_fails_only_its_callers():
+    async def main():
+        loader = _loader([])
+        return await asyncio.gather(loader.load("a"), loader.load("bad"), return_exceptions=True)
+
+    good, bad = asyncio.run(main())
+
+    assert good == "A"
+    assert isinstance(bad, ValueError)
+
+
+def test_cancelled_caller_does_not_cancel_other_callers():
+    async def main():
+        loader = _loader([])
+        first = asyncio.create_task(loader.load("a"))
+        second = asyncio.create_task(loader.load("a"))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "A"
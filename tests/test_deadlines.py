@@ -0,0 +1,30 @@
+import asyncio
+import time
+
+from aiosellers.playerok.automation import DeadlineScheduler
+from aiosellers.playerok.storage import InMemoryTimerStore, StoredTimer
+
+
+def test_timer_waits_for_its_action_to_be_registered():
+    store = InMemoryTimerStore()
+    fired = []
+
+    async def main():
+        await store.save([StoredTimer("remind:1", time.time() - 1, "remind", "1")], [])
+        scheduler = DeadlineScheduler(resolution=0.01, store=store)
+        await scheduler.start()
+        await asyncio.sleep(0.05)
+        assert [timer.key for timer in await store.load()] == ["remind:1"]
+        assert "remind:1" in scheduler
+
+        async def remind(payload):
+            fired.append(payload)
+
+        scheduler.register("remind", remind)
+        await scheduler.close()
+        return await store.load()
+
+    remaining = asyncio.run(main())
+
+    assert fired == ["1"]
+    assert remaining == []
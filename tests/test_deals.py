@@ -0,0 +1,205 @@
+import asyncio
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+
+from aiosellers.playerok.schemas import UserProfile
+from aiosellers.playerok.schemas.enums import ItemDealStatuses
+
+
+def test_get_fetches_a_deal_built_from_a_mutation(client):
+    fetched = []
+
+    async def create_deal(**kwargs):
+        return SimpleNamespace(props={"dealId": "d1"})
+
+    async def get_deal(deal_id):
+        fetched.append(deal_id)
+        return SimpleNamespace(
+            id=deal_id,
+            status=ItemDealStatuses.PAID,
+            status_expiration_date=None,
+            created_at=None,
+            user=SimpleNamespace(id="seller"),
+            chat=SimpleNamespace(id="c1"),
+            item=SimpleNamespace(id="i1"),
+        )
+
+    client._raw.deals = SimpleNamespace(create_deal=create_deal, get_deal=get_deal)
+
+    async def main():
+        created = await client.deals.create("i1")
+        assert created.chat_id is None
+        deal = await client.deals.get("d1")
+        again = await client.deals.get("d1")
+        return created, deal, again
+
+    created, deal, again = asyncio.run(main())
+
+    assert deal is created is again
+    assert fetched == ["d1"]
+    assert (deal.chat_id, deal.user_id, deal.item_id) == ("c1", "seller", "i1")
+    assert client._indexes.deals_by_chat.get("c1") == ["d1"]
+
+
+def test_failed_get_does_not_fail_concurrent_gets(client):
+    async def get_deal(deal_id):
+        if deal_id == "missing":
+            raise LookupError(deal_id)
+        return SimpleNamespace(
+            id=deal_id,
+            status=ItemDealStatuses.PAID,
+            status_expiration_date=None,
+            created_at=None,
+            user=None,
+            chat=None,
+            item=None,
+        )
+
+    client._raw.deals = SimpleNamespace(get_deal=get_deal)
+
+    async def main():
+        return await asyncio.gather(
+            client.deals.get("d1"), client.deals.get("missing"), return_exceptions=True
+        )
+
+    deal, error = asyncio.run(main())
+
+    assert deal.id == "d1"
+    assert isinstance(error, LookupError)
+
+
+def _deal_schema(deal_id, day, item_id="i1"):
+    return SimpleNamespace(
+        id=deal_id,
+        status=ItemDealStatuses.CONFIRMED,
+        status_expiration_date=None,
+        created_at=datetime(2026, 1, day, tzinfo=UTC),
+        user=None,
+        chat=None,
+        item=SimpleNamespace(id=item_id),
+    )
+
+
+def test_get_by_item_serves_a_complete_index_newest_first(client):
+    for deal_id, day in (("old", 1), ("new", 3), ("mid", 2)):
+        client.deals._create_deal(_deal_schema(deal_id, day))
+    client._indexes.deals_by_item.mark_complete("i1")
+
+    deals = asyncio.run(client.deals.get_by_item("i1", limit=2))
+
+    assert [deal.id for deal in deals] == ["new", "mid"]
+
+
+def test_get_by_item_scans_while_the_index_is_incomplete(client):
+    for deal_id, day in (("old", 1), ("mid", 2)):
+        client.deals._create_deal(_deal_schema(deal_id, day))
+    pages = []
+
+    async def get_deals(**kwargs):
+        pages.append(kwargs["after_cursor"])
+        return SimpleNamespace(
+            deals=[_deal_schema("new", 3), _deal_schema("mid", 2), _deal_schema("old", 1)],
+            page_info=SimpleNamespace(has_next_page=False, end_cursor=None),
+        )
+
+    client._raw.deals = SimpleNamespace(get_deals=get_deals)
+
+    deals = asyncio.run(client.deals.get_by_item("i1", limit=2))
+
+    assert pages == [None]
+    assert [deal.id for deal in deals] == ["new", "mid"]
+
+
+class _DealServer:
+    """Deals list served newest first, optionally filtered by status."""
+
+    def __init__(self, client, deals):
+        self.deals = deals
+        self.in_flight = 0
+        self.max_in_flight = 0
+        client._raw.deals = SimpleNamespace(get_deals=self.get_deals, get_deal=self.get_deal)
+
+    async def get_deals(self, user_id, after_cursor=None, direction=None, statuses=None):
+        deals = [deal for deal in self.deals if statuses is None or deal.status in statuses]
+        return SimpleNamespace(
+            deals=deals, page_info=SimpleNamespace(has_next_page=False, end_cursor=None)
+        )
+
+    async def get_deal(self, deal_id):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        return next(deal for deal in self.deals if deal.id == deal_id)
+
+
+def _with_status(schema, status):
+    schema.status = status
+    return schema
+
+
+def test_sync_round_trips_the_checkpoint_and_advances_the_watermark(client):
+    paid = _with_status(_deal_schema("d2", 2), ItemDealStatuses.PAID)
+    server = _DealServer(client, [paid, _deal_schema("d1", 1)])
+
+    async def main():
+        first = await client.deals.sync()
+        server.deals.insert(0, _with_status(_deal_schema("d3", 3), ItemDealStatuses.PAID))
+        paid.status = ItemDealStatuses.CONFIRMED
+        second = await client.deals.sync()
+        third = await client.deals.sync()
+        return first, second, third, await client._deal_checkpoint_store.load("ALL")
+
+    first, second, third, checkpoint = asyncio.run(main())
+
+    assert [deal.id for deal in first.new] == ["d2", "d1"]
+    assert [deal.id for deal in second.new] == ["d3"]
+    assert [(deal.id, deal.status) for deal in second.changed] == [
+        ("d2", ItemDealStatuses.CONFIRMED)
+    ]
+    assert (third.new, third.changed) == ([], [])
+    assert checkpoint.last_deal_id == "d3"
+    assert checkpoint.watermark == datetime(2026, 1, 3, tzinfo=UTC)
+    assert checkpoint.open_deals == {"d3": ItemDealStatuses.PAID}
+
+
+def test_sync_fetches_finished_deals_a_batch_at_a_time(client):
+    deals = [_with_status(_deal_schema(f"d{i}", 1), ItemDealStatuses.PAID) for i in range(40)]
+    server = _DealServer(client, deals)
+
+    async def main():
+        await client.deals.sync()
+        for deal in deals:
+            deal.status = ItemDealStatuses.CONFIRMED
+        return await client.deals.sync()
+
+    result = asyncio.run(main())
+
+    assert len(result.changed) == 40
+    assert 1 < server.max_in_flight <= client._config.loader_batch_size
+
+
+def test_list_includes_a_single_related_entity_by_name(client):
+    schema = _deal_schema("d1", 1)
+    schema.user = UserProfile.model_validate({"id": "buyer", "username": "buyer"})
+
+    async def get_deals(**kwargs):
+        return SimpleNamespace(
+            deals=[schema], page_info=SimpleNamespace(has_next_page=False, end_cursor=None)
+        )
+
+    client._raw.deals = SimpleNamespace(get_deals=get_deals)
+
+    async def main():
+        with pytest.raises(ValueError, match="Unknown include: u"):
+            await client.deals.list(include=["u"])
+        deals = await client.deals.list(include="user")
+        # Served from the identity map, `client._raw.account` doesn't exist.
+        return deals, await deals[0].get_user()
+
+    deals, user = asyncio.run(main())
+
+    assert [deal.id for deal in deals] == ["d1"]
+    assert user.username == "buyer"
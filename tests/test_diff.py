@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+from aiosellers.playerok.market import ChangeKind, MarketDiffer
+from aiosellers.playerok.schemas.enums import ItemStatuses, PriorityTypes
+
+
+def _item(id, price=100, views=0):
+    return SimpleNamespace(
+        id=id,
+        price=price,
+        status=ItemStatuses.APPROVED,
+        priority=PriorityTypes.DEFAULT,
+        name="Item",
+        views_counter=views,
+    )
+
+
+def _scan(differ, items):
+    changes = [differ.update(item) for item in items]
+    changes = [change for change in changes if change is not None]
+    return [(change.kind, change.item_id) for change in changes + differ.finish()]
+
+
+def test_changes_between_scans_are_reported():
+    differ = MarketDiffer()
+
+    assert _scan(differ, [_item("1"), _item("2"), _item("3")]) == [
+        (ChangeKind.ADDED, "1"),
+        (ChangeKind.ADDED, "2"),
+        (ChangeKind.ADDED, "3"),
+    ]
+    # Views aren't part of the content hash.
+    assert _scan(differ, [_item("1", views=10), _item("2", price=90), _item("4")]) == [
+        (ChangeKind.CHANGED, "2"),
+        (ChangeKind.ADDED, "4"),
+        (ChangeKind.REMOVED, "3"),
+    ]
+
+
+def test_listing_seen_twice_in_a_scan_is_reported_once():
+    differ = MarketDiffer()
+
+    assert _scan(differ, [_item("1"), _item("1", price=90)]) == [(ChangeKind.ADDED, "1")]
+
+
+def test_fingerprints_resume_a_differ():
+    differ = MarketDiffer()
+    _scan(differ, [_item("1"), _item("2")])
+
+    resumed = MarketDiffer(differ.fingerprints)
+
+    assert _scan(resumed, [_item("1")]) == [(ChangeKind.REMOVED, "2")]
+
+
+def test_reset_keeps_the_previous_scan():
+    differ = MarketDiffer()
+    _scan(differ, [_item("1")])
+
+    differ.update(_item("2"))
+    differ.reset()
+
+    assert _scan(differ, [_item("1")]) == []
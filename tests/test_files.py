@@ -0,0 +1,45 @@
+import asyncio
+import io
+
+import pytest
+
+from aiosellers.playerok.core.utils import prepare_image_file
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_local_file_is_read_like_an_open_file(tmp_path, use_mmap):
+    path = tmp_path / "photo.png"
+    path.write_bytes(b"0123456789")
+
+    async def main():
+        return await prepare_image_file(path, use_mmap=use_mmap)
+
+    file, owned = asyncio.run(main())
+
+    with file:
+        assert owned
+        assert file.name == str(path)
+        assert file.read(4) == b"0123"
+        file.seek(-2, io.SEEK_END)
+        assert file.read() == b"89"
+        file.seek(0)
+        assert file.read() == b"0123456789"
+    assert file.closed
+
+
+def test_empty_local_file_is_not_mapped(tmp_path):
+    path = tmp_path / "empty.png"
+    path.write_bytes(b"")
+
+    file, _ = asyncio.run(prepare_image_file(str(path), use_mmap=True))
+
+    with file:
+        assert file.read() == b""
+
+
+def test_in_memory_images_are_not_owned():
+    buffer = io.BytesIO(b"data")
+
+    assert asyncio.run(prepare_image_file(buffer)) == (buffer, False)
+    file, owned = asyncio.run(prepare_image_file(b"data"))
+    assert (file.read(), owned) == (b"data", False)
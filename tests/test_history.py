@@ -0,0 +1,56 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from aiosellers.playerok.entities.chat import ChatMessage
+from aiosellers.playerok.storage import MessageHistory
+from aiosellers.playerok.storage import history as history_module
+
+_START = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _message(message_id, minute, text="hi"):
+    return ChatMessage(
+        id=message_id, sent_at=_START + timedelta(minutes=minute), is_read=False, text=text
+    )
+
+
+def test_messages_are_ordered_and_found_by_id():
+    history = MessageHistory("c1", [_message("b", 2), _message("a", 1), _message("c", 3)])
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+    history.extend(_message(message_id, 0) for message_id in ids)
+
+    assert [message.id for message in history][3:] == ["a", "b", "c"]
+    assert history.index_of("b") == 4
+    assert all(message_id in history for message_id in ids)
+    assert "missing" not in history
+
+
+def test_adding_a_stored_id_replaces_the_message():
+    history = MessageHistory("c1", [_message("a", 1), _message("b", 2)])
+    history.add(_message("a", 1, text="edited"))
+    history.add(_message("b", 0, text="moved"))
+
+    assert len(history) == 2
+    assert [(message.id, message.text) for message in history] == [
+        ("b", "moved"),
+        ("a", "edited"),
+    ]
+
+
+def test_colliding_id_hashes_are_told_apart(monkeypatch):
+    monkeypatch.setattr(history_module, "_id_hash", lambda message_id: 1)
+    history = MessageHistory("c1", [_message("a", 1), _message("b", 1), _message("c", 2)])
+    history.add(_message("b", 3, text="moved"))
+
+    assert [history.index_of(message_id) for message_id in ("a", "c", "b")] == [0, 1, 2]
+    assert history[2].text == "moved"
+    assert "d" not in history
+
+
+def test_replaced_bytes_are_reclaimed():
+    history = MessageHistory("c1")
+    for revision in range(50):
+        history.add(_message("a", 1, text=f"{revision:04d}" * 100))
+
+    assert history[0].text == "0049" * 100
+    assert len(history._text_buffer) < 4096 * 2
@@ -0,0 +1,43 @@
+import json
+
+from aiosellers.playerok.core.utils import _intern_strings
+
+
+def _decode(payload):
+    # A fresh decode, so equal strings are distinct objects until interned.
+    return json.loads(json.dumps(payload))
+
+
+def _chat(id, text):
+    return {
+        "id": id,
+        "type": "PM",
+        "participants": [{"id": "seller-id", "username": "seller"}],
+        "lastMessage": {"text": text, "user": {"id": "seller-id", "avatarURL": "https://cdn/a"}},
+    }
+
+
+def test_repeated_strings_share_one_object():
+    first, second = _decode(_chat("c1", "hello")), _decode(_chat("c2", "hello"))
+
+    _intern_strings(first)
+    _intern_strings(second)
+
+    assert first["type"] is second["type"]
+    assert first["participants"][0]["id"] is second["participants"][0]["id"]
+    assert first["participants"][0]["username"] is second["participants"][0]["username"]
+    user, other = first["lastMessage"]["user"], second["lastMessage"]["user"]
+    assert user["id"] is other["id"]
+    assert user["avatarURL"] is other["avatarURL"]
+
+
+def test_unique_strings_are_left_alone():
+    first, second = _decode(_chat("c1", "hello world")), _decode(_chat("c1", "hello world"))
+
+    _intern_strings(first)
+    _intern_strings(second)
+
+    # Entity ids and free text are unique per entity, interning them would only leak.
+    assert first["id"] is not second["id"]
+    assert first["lastMessage"]["text"] is not second["lastMessage"]["text"]
+    assert first == _chat("c1", "hello world")
@@ -0,0 +1,123 @@
+import asyncio
+from types import SimpleNamespace
+
+from aiosellers.playerok.schemas.items import ItemList
+
+
+def _page(items, total_count, has_next=False):
+    return ItemList.model_validate(
+        {
+            "items": items,
+            "pageInfo": {"hasNextPage": has_next, "endCursor": "c" if has_next else None},
+            "totalCount": total_count,
+        }
+    )
+
+
+def _item(item_id, price, **fields):
+    return {"id": item_id, "name": item_id, "price": price, "rawPrice": price + 1, **fields}
+
+
+def _serve(client, pages):
+    calls = []
+
+    async def get_items(count, cursor, user_id):
+        calls.append(cursor)
+        return pages[cursor]
+
+    client._raw.items = SimpleNamespace(get_items=get_items)
+    return calls
+
+
+def test_refresh_stops_at_unchanged_page(client):
+    pages = {
+        None: _page([_item("a", 10)], 2, has_next=True),
+        "c": _page([_item("b", 20)], 2),
+    }
+    calls = _serve(client, pages)
+    asyncio.run(client.inventory.load())
+
+    client.inventory._full_refresh_interval = None
+    calls.clear()
+    result = asyncio.run(client.inventory.refresh())
+
+    assert calls == [None]
+    assert not result.full
+
+
+def test_refresh_walks_every_page_once_interval_passed(client):
+    pages = {
+        None: _page([_item("a", 10)], 2, has_next=True),
+        "c": _page([_item("b", 20)], 2),
+    }
+    calls = _serve(client, pages)
+    asyncio.run(client.inventory.load())
+
+    # An edit behind the unchanged first page.
+    pages["c"] = _page([_item("b", 25)], 2)
+    client.inventory._full_refresh_interval = 0
+    calls.clear()
+    result = asyncio.run(client.inventory.refresh())
+
+    assert calls == [None, "c"]
+    assert result.changed == ["b"]
+    assert client.inventory.get("b").price == 25
+
+
+def test_prev_price_is_not_taken_from_raw_price(client):
+    _serve(client, {None: _page([_item("a", 10)], 1)})
+    asyncio.run(client.inventory.load())
+
+    assert client.inventory.get("a").prev_price is None
+
+
+def test_refresh_keeps_unsaved_local_edits(client):
+    pages = {None: _page([_item("a", 10)], 1)}
+    _serve(client, pages)
+    asyncio.run(client.inventory.load())
+    item = client.inventory.get("a")
+    item.price = 15
+
+    pages[None] = _page([_item("a", 12)], 1)
+    asyncio.run(client.inventory.refresh())
+
+    assert item.price == 15
+    assert item.changes() == {"price": 15}
+
+
+def test_save_sends_only_changes(client):
+    _serve(client, {None: _page([_item("a", 10)], 1)})
+    asyncio.run(client.inventory.load())
+    updates = []
+
+    async def update_item(id, options=None, data_fields=None, **changes):
+        updates.append((changes, options))
+        return None
+
+    client._raw.items.update_item = update_item
+    item = client.inventory.get("a")
+
+    asyncio.run(item.save())
+    item.price = 10
+    asyncio.run(item.save())
+    assert updates == []
+
+    item.price = 15
+    asyncio.run(item.save(options={"region": "eu"}))
+    asyncio.run(item.save(options={"region": "eu"}))
+
+    assert updates == [({"price": 15}, {"region": "eu"})]
+    assert not item.is_dirty
+
+
+def test_list_self_merges_into_cached_listings(client):
+    pages = {None: _page([_item("a", 10)], 1)}
+    _serve(client, pages)
+    first = asyncio.run(client.items.list_self())[0]
+
+    pages[None] = _page([_item("a", 12)], 1)
+    second = asyncio.run(client.items.list_self())[0]
+
+    assert second is first
+    assert first.price == 12
+    assert not first.is_dirty
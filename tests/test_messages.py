@@ -0,0 +1,101 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+from aiosellers.playerok.storage import SQLiteMessageStore
+
+_START = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _fake_chat(client):
+    """Chat whose messages are returned newest first, like `get_chat_messages`."""
+    messages = []
+    requests = []
+
+    def post(*texts):
+        for text in texts:
+            messages.insert(
+                0,
+                SimpleNamespace(
+                    id=str(len(messages)),
+                    created_at=_START + timedelta(minutes=len(messages)),
+                    is_read=True,
+                    text=text,
+                    file=None,
+                    user=None,
+                ),
+            )
+
+    async def get_chat_messages(*, chat_id, count=24, after_cursor=None):
+        requests.append(count)
+        start = int(after_cursor or 0)
+        return SimpleNamespace(
+            messages=messages[start : start + count],
+            page_info=SimpleNamespace(
+                has_next_page=start + count < len(messages), end_cursor=str(start + count)
+            ),
+        )
+
+    client._raw.chats = SimpleNamespace(get_chat_messages=get_chat_messages)
+    return post, requests
+
+
+def test_sync_returns_only_new_messages(client):
+    post, requests = _fake_chat(client)
+    post(*(f"m{index}" for index in range(30)))
+
+    async def main():
+        first = await client.chats.messages.sync("c1", initial_limit=20)
+        requests.clear()
+        idle = await client.chats.messages.sync("c1", page_size=5)
+        idle_requests = list(requests)
+        post("new 1", "new 2")
+        new = await client.chats.messages.sync("c1", page_size=5)
+        return first, idle, idle_requests, new, await client.chats.messages.history("c1")
+
+    first, idle, idle_requests, new, history = asyncio.run(main())
+
+    assert [message.text for message in first] == [f"m{index}" for index in range(29, 9, -1)]
+    assert idle == []
+    assert idle_requests == [5]
+    assert [message.text for message in new] == ["new 2", "new 1"]
+    assert [message.text for message in history[:3]] == ["new 2", "new 1", "m29"]
+    assert len(history) == 22
+
+
+def test_sync_pages_until_the_last_synced_message(client):
+    post, requests = _fake_chat(client)
+    post("old")
+
+    async def main():
+        await client.chats.messages.sync("c1")
+        post(*(f"m{index}" for index in range(12)))
+        requests.clear()
+        return await client.chats.messages.sync("c1", page_size=5)
+
+    new = asyncio.run(main())
+
+    assert [message.text for message in new] == [f"m{index}" for index in range(11, -1, -1)]
+    assert requests == [5, 50]
+
+
+def test_synced_messages_survive_a_restart(client, tmp_path):
+    post, requests = _fake_chat(client)
+    post("a", "b")
+
+    async def main():
+        client._message_store = SQLiteMessageStore(tmp_path / "messages.db")
+        await client.chats.messages.sync("c1")
+        await client._message_store.close()
+
+        client._message_store = SQLiteMessageStore(tmp_path / "messages.db")
+        post("c")
+        new = await client.chats.messages.sync("c1")
+        history = await client.chats.messages.history("c1")
+        await client._message_store.close()
+        return new, history
+
+    new, history = asyncio.run(main())
+
+    assert [message.text for message in new] == ["c"]
+    assert [message.text for message in history] == ["c", "b", "a"]
@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+from aiosellers.playerok.schemas.enums import ItemStatuses
+from aiosellers.playerok.storage import SQLiteOutbox
+from aiosellers.playerok.storage.outbox import durable, replay
+
+
+class _Service:
+    _outbox_name = "items"
+
+    def __init__(self, outbox):
+        self._outbox = outbox
+        self.calls = []
+        self.block: asyncio.Event | None = None
+        self.fail = False
+
+    @durable
+    async def update_item(self, id, status):
+        self.calls.append((id, status))
+        if self.block is not None:
+            await self.block.wait()
+        if self.fail:
+            raise RuntimeError("rejected")
+
+    async def publish_item(self, id):
+        self.calls.append(id)
+
+
+def test_finished_and_failed_calls_are_completed(tmp_path):
+    async def main():
+        outbox = SQLiteOutbox(tmp_path / "outbox.db")
+        service = _Service(outbox)
+        await service.update_item("1", ItemStatuses.APPROVED)
+        service.fail = True
+        try:
+            await service.update_item("2", ItemStatuses.APPROVED)
+        except RuntimeError:
+            pass
+        await outbox.close()
+        return await outbox.pending()
+
+    assert asyncio.run(main()) == []
+
+
+def test_cancelled_call_is_replayed(tmp_path):
+    async def main():
+        outbox = SQLiteOutbox(tmp_path / "outbox.db")
+        service = _Service(outbox)
+        service.block = asyncio.Event()
+        task = asyncio.create_task(service.update_item("1", ItemStatuses.APPROVED))
+        while not service.calls:
+            await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await outbox.close()
+
+        restarted = SQLiteOutbox(tmp_path / "outbox.db")
+        service = _Service(restarted)
+        entries = await replay({"items": service}, restarted)
+        await restarted.close()
+        return service.calls, entries, await restarted.pending()
+
+    calls, entries, pending = asyncio.run(main())
+
+    assert calls == [("1", ItemStatuses.APPROVED)]
+    assert [entry.method for entry in entries] == ["update_item"]
+    assert pending == []
+
+
+def test_stale_and_non_durable_entries_are_dropped(tmp_path):
+    async def main():
+        outbox = SQLiteOutbox(tmp_path / "outbox.db", max_age=60)
+        await outbox.record("items", "publish_item", {"id": "1"})
+        await outbox.record("items", "update_item", {"id": "1", "status": None})
+        await outbox._run(lambda connection: connection.execute("UPDATE outbox SET created_at = 0"))
+        await outbox.record("items", "update_item", {"id": "2", "status": None})
+
+        service = _Service(outbox)
+        entries = await replay({"items": service}, outbox)
+        await outbox.close()
+        return service.calls, entries, await outbox.pending()
+
+    calls, entries, pending = asyncio.run(main())
+
+    assert calls == [("2", None)]
+    assert len(entries) == 1
+    assert pending == []
+
+
+def test_completions_survive_a_failed_write(tmp_path):
+    async def main():
+        outbox = SQLiteOutbox(tmp_path / "outbox.db")
+        entry_id = await outbox.record("items", "update_item", {"id": "1"})
+        run = outbox._run
+
+        async def failing(func, *args):
+            outbox._run = run
+            raise OSError("disk full")
+
+        outbox._run = failing
+        outbox.complete(entry_id)
+        await outbox._flush_task
+        assert outbox._completed == [entry_id]
+        await outbox.close()
+        return await outbox.pending()
+
+    assert asyncio.run(main()) == []
+
+
+def test_entries_are_recorded_with_their_arguments(tmp_path):
+    async def main():
+        outbox = SQLiteOutbox(tmp_path / "outbox.db")
+        await outbox.record("items", "update_item", {"id": "1"})
+        started = time.time()
+        pending = await outbox.pending()
+        await outbox.close()
+        return started, pending
+
+    started, pending = asyncio.run(main())
+
+    assert [(entry.service, entry.method, entry.arguments) for entry in pending] == [
+        ("items", "update_item", {"id": "1"})
+    ]
+    assert pending[0].created_at <= started
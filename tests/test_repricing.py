@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from aiosellers.playerok.market import (
+    Ceiling,
+    MarketSnapshot,
+    PriceChange,
+    Repricer,
+    TargetRank,
+    Undercut,
+)
+from aiosellers.playerok.schemas.enums import ItemStatuses, PriorityTypes
+
+pytest.importorskip("numpy")
+
+
+def _listing(id, price, user_id="seller", status=ItemStatuses.APPROVED):
+    return SimpleNamespace(
+        id=id,
+        price=price,
+        raw_price=price,
+        user=SimpleNamespace(id=user_id, rating=5.0),
+        views_counter=0,
+        priority_position=None,
+        priority=PriorityTypes.DEFAULT,
+        status=status,
+    )
+
+
+def _snapshot(*listings):
+    return MarketSnapshot.from_items(listings)
+
+
+def _plan(client, strategies, items, snapshot):
+    changes = Repricer(client, strategies).plan(items, snapshot)
+    return {change.item_id: change.new_price for change in changes}
+
+
+def test_undercut_follows_the_cheapest_competitor_above_each_floor(client):
+    snapshot = _snapshot(
+        _listing("a", 50),
+        _listing("b", 120),
+        _listing("c", 300),
+        _listing("mine-1", 200, user_id="me"),
+    )
+    items = [SimpleNamespace(id="cheap", price=200), SimpleNamespace(id="premium", price=400)]
+
+    prices = _plan(client, [Undercut(1, floor={"cheap": 100, "premium": 250})], items, snapshot)
+
+    # Own listings and competitors below the floor don't count.
+    assert prices == {"cheap": 119, "premium": 299}
+
+
+def test_undercut_keeps_listings_without_a_competitor_above_the_floor(client):
+    snapshot = _snapshot(_listing("a", 50))
+    items = [SimpleNamespace(id="1", price=200), SimpleNamespace(id="2", price=200)]
+
+    assert _plan(client, [Undercut(1, floor={"1": 100})], items, snapshot) == {"2": 49}
+
+
+def test_undercut_is_never_below_the_floor(client):
+    snapshot = _snapshot(_listing("a", 100))
+    items = [SimpleNamespace(id="1", price=200)]
+
+    assert _plan(client, [Undercut(5, floor=98)], items, snapshot) == {"1": 98}
+
+
+def test_target_rank_counts_competitors_above_the_floor(client):
+    snapshot = _snapshot(_listing("a", 10), _listing("b", 100), _listing("c", 150))
+    items = [SimpleNamespace(id="1", price=300), SimpleNamespace(id="2", price=300)]
+
+    prices = _plan(client, [TargetRank(rank=2, floor={"1": 50})], items, snapshot)
+
+    assert prices == {"1": 149, "2": 99}
+
+
+def test_strategies_are_applied_in_order(client):
+    snapshot = _snapshot(_listing("a", 1000))
+    items = [SimpleNamespace(id="1", price=200)]
+
+    assert _plan(client, [Undercut(1), Ceiling(500)], items, snapshot) == {"1": 500}
+
+
+def test_apply_sends_the_biggest_moves_first(client):
+    updated = []
+
+    async def update(item_id, *, price):
+        updated.append((item_id, price))
+
+    client.items.update = update
+    changes = [PriceChange("1", 100, 99), PriceChange("2", 100, 50), PriceChange("3", 100, 80)]
+
+    async def main():
+        return await Repricer(client, [], concurrency=1, max_updates=2).apply(changes)
+
+    result = asyncio.run(main())
+
+    assert updated == [("2", 50), ("3", 80)]
+    assert [change.item_id for change in result.skipped] == ["1"]
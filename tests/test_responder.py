@@ -0,0 +1,79 @@
+from aiosellers.playerok.automation import ReplyRule, RuleSet
+from aiosellers.playerok.automation.responder import _required_literal
+
+
+def test_pattern_priority_beats_leftmost_match():
+    rules = RuleSet(
+        [
+            ReplyRule("high", pattern=r"order\s+#\d+", priority=10),
+            ReplyRule("low", pattern="my order"),
+        ]
+    )
+
+    assert rules.match("where is my order #123").reply == "high"
+    assert rules.match("where is my order").reply == "low"
+
+
+def test_declaration_order_breaks_priority_ties():
+    rules = RuleSet([ReplyRule("first", pattern="price"), ReplyRule("second", keywords=["price"])])
+
+    assert rules.match("what's the price?").reply == "first"
+
+
+def test_keyword_and_pattern_rules_are_ranked_together():
+    rules = RuleSet(
+        [
+            ReplyRule("keyword", keywords=["refund"], priority=1),
+            ReplyRule("pattern", pattern=r"refund\s+now", priority=5),
+        ]
+    )
+
+    assert rules.match("refund now please").reply == "pattern"
+    assert rules.match("refund later").reply == "keyword"
+
+
+def test_patterns_with_their_own_groups():
+    rules = RuleSet(
+        [
+            ReplyRule("named", pattern=r"(?P<word>\w+) (?P=word)"),
+            ReplyRule("numbered", pattern=r"(a)(b)\2"),
+            ReplyRule("plain", pattern="hello"),
+        ]
+    )
+
+    assert rules.match("hey hey").reply == "named"
+    assert rules.match("xabbx").reply == "numbered"
+    assert rules.match("hello").reply == "plain"
+    assert rules.match("nothing here") is None
+
+
+def test_whole_word_keywords():
+    rules = RuleSet([ReplyRule("hi", keywords=["hi"])])
+
+    assert rules.match("Hi there").reply == "hi"
+    assert rules.match("this") is None
+
+
+def test_prefiltered_patterns_are_ranked_by_priority():
+    rules = RuleSet(
+        [
+            ReplyRule("low", pattern=r"\bhello\b"),
+            ReplyRule("high", pattern=r"(when|where) .*ship", priority=5),
+            ReplyRule("backref", pattern=r"(\w)\1{3}", priority=1),
+        ]
+    )
+
+    assert rules._unfiltered == [1]
+    assert rules.match("hello, where do you ship?").reply == "high"
+    assert rules.match("hello aaaa").reply == "backref"
+    assert rules.match("HELLO").reply == "low"
+    assert rules.match("shipping when?") is None
+
+
+def test_required_literal():
+    assert _required_literal(r"order\s+#\d+") == "order"
+    assert _required_literal(r"colou?r please") == "r please"
+    assert _required_literal(r"x{2,3}abc\x41") == "abc"
+    assert _required_literal(r"(when|where) .*ship") == "ship"
+    assert _required_literal("refund|return") is None
+    assert _required_literal(r"[abc]+\d") is None
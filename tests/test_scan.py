@@ -0,0 +1,70 @@
+import asyncio
+from types import SimpleNamespace
+
+from aiosellers.playerok.market import ShardedScanner
+from aiosellers.playerok.schemas.enums import ItemsSortOptions
+
+
+def _fake_items(client, prices):
+    """`get_items` over listings with the given prices, ids are their indexes."""
+    listings = [SimpleNamespace(id=str(index), price=price) for index, price in enumerate(prices)]
+
+    async def get_items(
+        count=24, cursor=None, sort=None, minimal_price=None, maximal_price=None, **filters
+    ):
+        matching = [
+            listing
+            for listing in listings
+            if (minimal_price is None or listing.price >= minimal_price)
+            and (maximal_price is None or listing.price <= maximal_price)
+        ]
+        if sort == ItemsSortOptions.PRICE_DESC:
+            matching.sort(key=lambda listing: -listing.price)
+        else:
+            matching.sort(key=lambda listing: listing.price)
+        start = int(cursor or 0)
+        page = matching[start : start + count]
+        return SimpleNamespace(
+            items=page,
+            total_count=len(matching),
+            page_info=SimpleNamespace(
+                has_next_page=start + count < len(matching), end_cursor=str(start + count)
+            ),
+        )
+
+    client._raw.items = SimpleNamespace(get_items=get_items)
+
+
+def test_plan_splits_hot_windows_and_merges_sparse_ones(client):
+    # 60 listings at 100 and a thin tail up to 1000.
+    _fake_items(client, [100] * 30 + [101] * 30 + [500, 900, 1000])
+
+    windows = asyncio.run(ShardedScanner(client, shard_size=24, initial_shards=4).plan())
+
+    # Windows of one price can't be split further, the thin tail becomes one window.
+    assert [(window.low, window.high, window.total) for window in windows] == [
+        (100, 100, 30),
+        (101, 101, 30),
+        (325, 1000, 3),
+    ]
+
+
+def test_plan_of_an_empty_category_is_empty(client):
+    _fake_items(client, [])
+
+    assert asyncio.run(ShardedScanner(client).plan()) == []
+
+
+def test_scan_yields_every_listing_once(client):
+    _fake_items(client, list(range(1, 201)))
+
+    async def main():
+        scanner = ShardedScanner(client, shard_size=24, concurrency=2)
+        ids = [schema.id async for schema in scanner.scan()]
+        return scanner, ids
+
+    scanner, ids = asyncio.run(main())
+
+    assert sorted(ids, key=int) == [str(index) for index in range(200)]
+    assert scanner.stats.items == 200
+    assert scanner.stats.shards > 1
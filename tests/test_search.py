@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from aiosellers.playerok.storage import InMemorySearchIndex, SQLiteSearchIndex
+from aiosellers.playerok.storage.search import DocumentKind
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_index(request, tmp_path):
+    def make(**kwargs):
+        if request.param == "memory":
+            return InMemorySearchIndex()
+        return SQLiteSearchIndex(tmp_path / "search.db", **kwargs)
+
+    return make
+
+
+def _ids(hits):
+    return [hit.id for hit in hits]
+
+
+def test_tokens_are_matched_case_insensitively_and_all_required(make_index):
+    async def main():
+        index = make_index()
+        index.add_item("a", "Steam Key", "Region: EU, instant delivery")
+        index.add_item("b", "steam account", None)
+        index.add_message("m", "c1", "Is the KEY still available?")
+        results = (
+            await index.search("STEAM"),
+            await index.search("steam, key!"),
+            await index.search("key", kind=DocumentKind.MESSAGE),
+            await index.search("key", chat_id="c2"),
+            await index.search("missing"),
+        )
+        await index.close()
+        return results
+
+    steam, steam_key, messages, other_chat, missing = asyncio.run(main())
+
+    assert sorted(_ids(steam)) == ["a", "b"]
+    assert _ids(steam_key) == ["a"]
+    assert [(hit.id, hit.chat_id) for hit in messages] == [("m", "c1")]
+    assert other_chat == []
+    assert missing == []
+
+
+def test_denser_matches_rank_first(make_index):
+    async def main():
+        index = make_index()
+        index.add_item("long", "gold", "gold for sale in a long description of many other words")
+        index.add_item("short", "gold gold", None)
+        index.add_item("other", "silver", None)
+        hits = await index.search("gold")
+        await index.close()
+        return hits
+
+    hits = asyncio.run(main())
+
+    assert _ids(hits) == ["short", "long"]
+    assert hits[0].score > hits[1].score
+
+
+def test_documents_are_replaced_and_removed(make_index):
+    async def main():
+        index = make_index()
+        index.add_item("a", "old name", None)
+        index.add_item("b", "old stock", None)
+        await index.search("old")
+        index.add_item("a", "new name", None)
+        index.remove(DocumentKind.ITEM, "b")
+        results = await index.search("old"), await index.search("new")
+        await index.close()
+        return results
+
+    old, new = asyncio.run(main())
+
+    assert old == []
+    assert [(hit.id, hit.text) for hit in new] == [("a", "new name")]
+
+
+def test_failed_auto_flush_keeps_documents(tmp_path, caplog):
+    async def main():
+        index = SQLiteSearchIndex(tmp_path / "search.db", batch_size=1)
+        run = index._run
+
+        async def failing(func, *args):
+            index._run = run
+            raise OSError("disk full")
+
+        index._run = failing
+        index.add_item("a", "gold", None)
+        await asyncio.sleep(0.01)
+        hits = await index.search("gold")
+        await index.close()
+        return hits
+
+    hits = asyncio.run(main())
+
+    assert _ids(hits) == ["a"]
+    assert "Search index flush failed" in caplog.text
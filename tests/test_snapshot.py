@@ -0,0 +1,84 @@
+import asyncio
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from aiosellers.playerok.market import MarketSnapshot
+from aiosellers.playerok.schemas.enums import ItemStatuses, PriorityTypes
+
+pytest.importorskip("numpy")
+
+
+def _listing(id, price, user_id="seller", status=ItemStatuses.APPROVED):
+    return SimpleNamespace(
+        id=id,
+        price=price,
+        raw_price=price,
+        user=SimpleNamespace(id=user_id, rating=5.0),
+        views_counter=0,
+        priority_position=None,
+        priority=PriorityTypes.DEFAULT,
+        status=status,
+    )
+
+
+def _snapshot():
+    return MarketSnapshot.from_items(
+        [
+            _listing("a", 300),
+            _listing("b", 100),
+            _listing("c", 200),
+            _listing("d", 100),
+            _listing("e", None),
+            _listing("f", 50, status=ItemStatuses.SOLD),
+            _listing("mine", 150, user_id="me"),
+        ]
+    )
+
+
+def test_stats_ignore_missing_prices_and_apply_conditions():
+    stats = _snapshot().stats(status=ItemStatuses.APPROVED, exclude_user_id="me")
+
+    assert (stats.count, stats.min, stats.max, stats.median) == (4, 100.0, 300.0, 150.0)
+    assert stats.mean == 175.0
+
+
+def test_rank_and_cheapest_among_competitors():
+    snapshot = _snapshot()
+    competitors = snapshot.mask(status=ItemStatuses.APPROVED, exclude_user_id="me")
+
+    assert snapshot.rank("mine", competitors) == 3
+    assert snapshot.rank("b", competitors) == 1
+    assert snapshot.rank("missing", competitors) is None
+    assert snapshot.cheapest(2, competitors) == ["b", "d"]
+    assert snapshot.cheapest(10) == ["f", "b", "d", "mine", "c", "a"]
+
+
+def test_filter_keeps_rows_aligned():
+    snapshot = _snapshot()
+    filtered = snapshot.filter(min_price=150)
+
+    assert list(filtered.ids) == ["a", "c", "mine"]
+    assert list(filtered.price) == [300.0, 200.0, 150.0]
+    assert filtered.position("mine") == 2
+    assert math.isnan(snapshot.price[snapshot.position("e")])
+
+
+def test_snapshot_stops_at_the_limit(client):
+    pages = []
+
+    async def get_items(cursor=None, **filters):
+        pages.append(cursor)
+        start = int(cursor or 0)
+        return SimpleNamespace(
+            items=[_listing(str(index), index) for index in range(start, start + 24)],
+            page_info=SimpleNamespace(has_next_page=True, end_cursor=str(start + 24)),
+        )
+
+    client._raw.items = SimpleNamespace(get_items=get_items)
+
+    snapshot = asyncio.run(client.market.snapshot(category_id="c1", limit=30))
+
+    assert len(snapshot) == 30
+    assert pages == [None, "24"]
@@ -0,0 +1,117 @@
+import asyncio
+from types import SimpleNamespace
+
+from aiosellers.playerok.api.deals import DealSyncResult
+from aiosellers.playerok.automation import DealWorkflow
+from aiosellers.playerok.schemas.enums import ItemDealStatuses
+from aiosellers.playerok.storage.checkpoints import DealCheckpoint
+
+
+def _fake_sync(client, deals):
+    """`DealAPI.sync()` returning the deals whose status differs from the saved checkpoint."""
+    store = client._deal_checkpoint_store
+
+    async def sync(*, direction=None, key=None, save=True):
+        checkpoint = await store.load(key) or DealCheckpoint()
+        changed = [deal for deal in deals if checkpoint.open_deals.get(deal.id) != deal.status]
+        checkpoint.open_deals = {deal.id: deal.status for deal in deals}
+        result = DealSyncResult(new=[], changed=changed, key=key, checkpoint=checkpoint)
+        if save:
+            await store.save(key, checkpoint)
+        return result
+
+    client.deals.sync = sync
+
+
+def test_unhandled_deals_are_returned_again_after_restart(client):
+    deals = [
+        SimpleNamespace(id="1", status=ItemDealStatuses.PAID),
+        SimpleNamespace(id="2", status=ItemDealStatuses.PAID),
+    ]
+    _fake_sync(client, deals)
+    handled = []
+
+    async def main():
+        workflow = DealWorkflow(client)
+        first_done = asyncio.Event()
+
+        @workflow.on(ItemDealStatuses.PAID)
+        async def stuck(deal):
+            if deal.id == "2":
+                await asyncio.Event().wait()
+            handled.append(deal.id)
+            first_done.set()
+
+        await workflow.poll()
+        await first_done.wait()
+        if workflow._save_task is not None:
+            await workflow._save_task
+        # The process dies while deal 2 is still being handled.
+        for worker in list(workflow._workers.values()):
+            worker.cancel()
+        await asyncio.sleep(0)
+
+        restarted = DealWorkflow(client)
+        restarted.on(ItemDealStatuses.PAID)(_record(handled))
+        assert await restarted.poll() == 1
+        await restarted.join()
+
+    asyncio.run(main())
+
+    assert handled == ["1", "2"]
+
+
+def test_retry_resumes_after_succeeded_handlers(client):
+    calls = []
+
+    async def main():
+        workflow = DealWorkflow(client, max_attempts=2, retry_delay=0)
+
+        @workflow.on(ItemDealStatuses.PAID)
+        async def notify(deal):
+            calls.append("notify")
+
+        @workflow.on(ItemDealStatuses.PAID)
+        async def deliver(deal):
+            calls.append("deliver")
+            if calls.count("deliver") == 1:
+                raise RuntimeError("temporary")
+
+        await workflow.submit([SimpleNamespace(id="1", status=ItemDealStatuses.PAID)])
+        await workflow.join()
+        return workflow.stats
+
+    stats = asyncio.run(main())
+
+    assert calls == ["notify", "deliver", "deliver"]
+    assert stats.handled == 1
+
+
+def test_progress_of_finished_deals_is_pruned(client):
+    deals = [
+        SimpleNamespace(id="1", status=ItemDealStatuses.CONFIRMED),
+        SimpleNamespace(id="2", status=ItemDealStatuses.PAID),
+    ]
+    _fake_sync(client, deals)
+
+    async def main():
+        workflow = DealWorkflow(client)
+        workflow.on(ItemDealStatuses.CONFIRMED)(_record([]))
+        workflow.on(ItemDealStatuses.PAID)(_record([]))
+
+        assert await workflow.poll() == 2
+        await workflow.join()
+        assert await workflow.poll() == 0
+        await workflow.join()
+        return await client._deal_checkpoint_store.load(workflow._progress_key)
+
+    progress = asyncio.run(main())
+
+    assert progress.open_deals == {"2": ItemDealStatuses.PAID}
+
+
+def _record(handled):
+    async def handler(deal):
+        handled.append(deal.id)
+
+    return handler